@@ -0,0 +1,18 @@
+"""
+Gunicorn settings for the Docker image (run from /app, next to this file).
+
+With preload_app the master imports main.wsgi, which sets Django up and warms
+it (main.startup), before forking the workers. Each worker then starts with
+the settings, apps, URL resolvers and search index already loaded instead of
+building them during its first requests, and shares the memory they use with
+the master until it writes to it. GUNICORN_PRELOAD=False loads the app in
+each worker as before, e.g. to pick up code changes with --reload.
+
+The number of workers is read by gunicorn itself from WEB_CONCURRENCY.
+"""
+
+import os
+
+wsgi_app = "main.wsgi:application"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
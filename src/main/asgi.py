@@ -1,7 +1,10 @@
 """
 ASGI config for main project.
 
-It exposes the ASGI callable as a module-level variable named ``application``.
+It exposes the ASGI callable as a module-level variable named ``application``,
+warmed up (see main.startup) unless STARTUP_WARM_UP is off.
+Serve it (e.g. with uvicorn or daphne) for the section event streams at
+/api/schedules/events/sections/, which the WSGI application refuses.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -9,8 +12,14 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "main.settings")
 
 application = get_asgi_application()
+
+if settings.STARTUP_WARM_UP:
+    from main.startup import warm_up
+
+    warm_up()
@@ -0,0 +1,82 @@
+"""
+Primary/replica database routing.
+
+Reads are only sent to a replica while a view has explicitly opted in through
+``replica_reads()`` (see ``schedules.mixins.ReplicaReadMixin``). Everything
+else, including every write and any read issued inside a transaction, goes to
+the primary, so conflict checks made while saving always see current data.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads():
+    """Allow reads issued inside the block to be served by a replica"""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def is_pinned_to_primary(request):
+    """Whether the client wrote recently and must keep reading from the primary"""
+    return settings.DATABASE_REPLICA_PIN_COOKIE in request.COOKIES
+
+
+class PrimaryReplicaRouter:
+    """Send opted-in reads to a random replica and everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if not settings.DATABASE_REPLICAS or not _replica_reads.get():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pin a client to the primary for a few seconds after it writes, so it
+    reads its own changes even while the replicas are catching up
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in ("GET", "HEAD", "OPTIONS", "TRACE")
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                settings.DATABASE_REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True,
+                secure=settings.SESSION_COOKIE_SECURE,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+
+        return response
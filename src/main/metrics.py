@@ -0,0 +1,81 @@
+"""
+Runtime metrics for the current worker process.
+
+Every gunicorn worker keeps its own connections (and connection pool), so the
+numbers describe the worker that answered the request, identified by ``pid``.
+They describe the deployment, so only superusers and scrapers holding
+``METRICS_TOKEN`` may read them.
+"""
+
+import os
+
+from django.conf import settings
+from django.db import connections
+from django.http import JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+
+def pool_stats(pool):
+    """Summarize psycopg_pool's counters into the numbers used to size the pool"""
+    stats = pool.get_stats()
+    requests = stats.get("requests_num", 0)
+    wait_ms = stats.get("requests_wait_ms", 0)
+    # Django opens the pool on the first query; until then nothing is in use.
+    if getattr(pool, "closed", False):
+        stats["pool_size"] = stats["pool_available"] = 0
+    return {
+        "open": not getattr(pool, "closed", False),
+        "min_size": stats.get("pool_min", 0),
+        "max_size": stats.get("pool_max", 0),
+        "size": stats.get("pool_size", 0),
+        "available": stats.get("pool_available", 0),
+        "in_use": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": requests,
+        "requests_queued": stats.get("requests_queued", 0),
+        "requests_errors": stats.get("requests_errors", 0),
+        "wait_ms_total": wait_ms,
+        "wait_ms_avg": round(wait_ms / requests, 2) if requests else 0,
+        "connections_opened": stats.get("connections_num", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+        "returns_bad": stats.get("returns_bad", 0),
+    }
+
+
+def database_stats():
+    """Connection reuse settings and pool statistics for every configured database"""
+    databases = {}
+    for alias in connections:
+        connection = connections[alias]
+        entry = {
+            "vendor": connection.vendor,
+            "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+            "health_checks": connection.settings_dict["CONN_HEALTH_CHECKS"],
+            "connected": connection.connection is not None,
+            "pool": None,
+        }
+        pool = getattr(connection, "pool", None)
+        if pool is not None:
+            entry["pool"] = pool_stats(pool)
+        databases[alias] = entry
+    return databases
+
+
+def can_read_metrics(request):
+    """Whether the request comes from a superuser or carries the METRICS_TOKEN bearer token"""
+    token = settings.METRICS_TOKEN
+    if token and constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return True
+    user = getattr(request, "user", None)
+    return bool(user and user.is_superuser)
+
+
+@require_GET
+def metrics(request):
+    if not can_read_metrics(request):
+        return JsonResponse({"detail": "Superuser or metrics token required"}, status=403)
+    return JsonResponse({
+        "pid": os.getpid(),
+        "databases": database_stats(),
+    })
@@ -0,0 +1,158 @@
+"""
+On-demand request profiling for superusers.
+
+With ``REQUEST_PROFILING`` enabled, a logged-in superuser can add
+``?profile=`` to any URL to see where the time of that request goes: a
+cProfile breakdown of the hottest functions plus every SQL query with its
+duration. When the setting is off the middleware removes itself at startup
+(``MiddlewareNotUsed``), so normal requests pay nothing for it.
+
+``?profile=1`` (or ``text``) replaces the response with a plain text report,
+``?profile=json`` with a JSON report, and ``?profile=store`` keeps the normal
+response and writes the report and a pstats dump to ``REQUEST_PROFILING_DIR``.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+# cProfile cannot profile two requests of the same process at once
+_profiler_lock = threading.Lock()
+
+
+class QueryRecorder:
+    """execute_wrapper that records the SQL and duration of every query"""
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                "alias": self.alias,
+                "sql": sql,
+                "ms": round((time.perf_counter() - started) * 1000, 3),
+                "many": many,
+            })
+
+
+def build_report(request, response, profiler, recorders, elapsed, limit):
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(limit)
+
+    queries = [query for recorder in recorders for query in recorder.queries]
+    # The same statement repeated many times usually means an N+1 query
+    repeated = Counter(query["sql"] for query in queries)
+    return {
+        "method": request.method,
+        "path": request.get_full_path(),
+        "status": response.status_code,
+        "total_ms": round(elapsed * 1000, 3),
+        "sql_count": len(queries),
+        "sql_ms": round(sum(query["ms"] for query in queries), 3),
+        "repeated_sql": [
+            {"sql": sql, "count": count} for sql, count in repeated.most_common() if count > 1
+        ],
+        "queries": queries,
+        "profile": stream.getvalue(),
+    }
+
+
+def format_report(report):
+    lines = [
+        f"{report['method']} {report['path']} -> {report['status']}",
+        f"Total {report['total_ms']:.1f} ms, {report['sql_count']} queries in {report['sql_ms']:.1f} ms",
+        "",
+    ]
+    if report["repeated_sql"]:
+        lines.append("Repeated queries:")
+        lines.extend(f"  {item['count']:>4} x {item['sql']}" for item in report["repeated_sql"])
+        lines.append("")
+    lines.append("Queries:")
+    lines.extend(
+        f"  {query['ms']:>8.2f} ms  [{query['alias']}] {query['sql']}" for query in report["queries"]
+    )
+    lines.extend(["", "Profile:", report["profile"]])
+    return "\n".join(lines)
+
+
+class ProfilingMiddleware:
+    """Profile a request when a superuser asks for it with ?profile="""
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = request.GET.get("profile")
+        if mode is None or not getattr(request, "user", None) or not request.user.is_superuser:
+            return self.get_response(request)
+
+        if not _profiler_lock.acquire(blocking=False):
+            response = self.get_response(request)
+            response["X-Profile"] = "busy"
+            return response
+
+        try:
+            return self.profile(request, mode)
+        finally:
+            _profiler_lock.release()
+
+    def profile(self, request, mode):
+        recorders = [QueryRecorder(alias) for alias in connections]
+        profiler = cProfile.Profile()
+        with ExitStack() as stack:
+            for recorder in recorders:
+                stack.enter_context(connections[recorder.alias].execute_wrapper(recorder))
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+                # Render lazily rendered responses (DRF, templates) inside the profile
+                if hasattr(response, "render") and callable(response.render):
+                    response.render()
+            finally:
+                profiler.disable()
+            elapsed = time.perf_counter() - started
+
+        report = build_report(
+            request, response, profiler, recorders, elapsed, settings.REQUEST_PROFILING_LIMIT
+        )
+
+        if mode == "json":
+            return JsonResponse(report)
+        if mode == "store":
+            response["X-Profile-Report"] = self.store(report, profiler)
+            return response
+        return HttpResponse(format_report(report), content_type="text/plain; charset=utf-8")
+
+    def store(self, report, profiler):
+        """Write the report and a pstats dump (for snakeviz etc.), return the report's name"""
+        directory = Path(settings.REQUEST_PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", report["path"].split("?")[0]).strip("-") or "root"
+        name = f"{timezone.now():%Y%m%d-%H%M%S-%f}-{report['method'].lower()}-{slug}"
+
+        (directory / f"{name}.txt").write_text(format_report(report))
+        (directory / f"{name}.json").write_text(json.dumps(report, indent=2))
+        profiler.dump_stats(directory / f"{name}.prof")
+        return name
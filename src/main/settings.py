@@ -52,12 +52,16 @@ MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "schedules.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "main.profiling.ProfilingMiddleware",
+    "schedules.slow_queries.SlowQueryMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "main.db_router.ReplicaPinningMiddleware",
 ]
 
 # REST Framework settings
@@ -67,16 +71,41 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # Token buckets per client and scope, kept in the shared cache (see main.throttling)
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
-    ],
+        'main.throttling.TokenBucketThrottle',
+    ] if os.getenv('API_THROTTLING', 'True') == 'True' else [],
     'DEFAULT_THROTTLE_RATES': {
-        'anon': '500/minute',
-        'user': '1000/minute',
+        'read': os.getenv('API_THROTTLE_READ', '1000/minute'),
+        'write': os.getenv('API_THROTTLE_WRITE', '300/minute'),
+        'conflicts': os.getenv('API_THROTTLE_CONFLICTS', '120/minute'),
+        'export': os.getenv('API_THROTTLE_EXPORT', '20/minute'),
     },
 }
 
+# Shared by every worker: throttling buckets and the generation counters of
+# schedules.cache. Without Redis or memcached each process has its own.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+elif os.getenv("MEMCACHED_LOCATION"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": os.getenv("MEMCACHED_LOCATION").split(","),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # CSRF settings
 CSRF_COOKIE_SECURE = False  # Set to False for local development
 CSRF_COOKIE_SAMESITE = None  # Allow cross-site requests
@@ -118,9 +147,112 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD", ""),
         "HOST": os.getenv("DB_HOST", ""),
         "PORT": os.getenv("DB_PORT", ""),
+        # Reuse connections across requests instead of reconnecting every time.
+        # Ignored (set to 0) when the connection pool below is enabled.
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        # Verify a reused connection is still usable before handing it out; with
+        # the pool enabled this becomes psycopg_pool's check on checkout.
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {},
     }
 }
 
+# PostgreSQL connection pool (psycopg_pool), one per worker process. Size
+# DB_POOL_MAX_SIZE x gunicorn workers against the server's max_connections and
+# watch /metrics/ for requests waiting on the pool.
+if os.getenv("DB_HOST") and os.getenv("DB_POOL", "False") == "True":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        # Seconds a request waits for a free connection before failing.
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        # Close idle connections above min_size after this many seconds.
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+    }
+
+# /metrics/ (main.metrics) is only shown to logged-in superusers and, when
+# METRICS_TOKEN is set, to scrapers sending "Authorization: Bearer <token>".
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Optional read replicas. DB_REPLICAS is a comma separated list of replica hosts
+# (PostgreSQL) or database files (SQLite); every replica shares the primary's
+# remaining settings. Read-only API actions are routed to them by
+# main.db_router.PrimaryReplicaRouter, everything else stays on "default".
+DATABASE_REPLICAS = []
+
+replicas = [replica.strip() for replica in os.getenv("DB_REPLICAS", "").split(",") if replica.strip()]
+for index, replica in enumerate(replicas, start=1):
+    alias = f"replica{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        **({"HOST": replica} if os.getenv("DB_HOST") else {"NAME": BASE_DIR / replica}),
+        # Tests run against the primary only; replicas mirror it.
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["main.db_router.PrimaryReplicaRouter"]
+
+# Seconds a client keeps reading from the primary after one of its writes, so
+# replication lag never hides the client's own changes (read-your-writes).
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DB_REPLICA_PIN_SECONDS", "5"))
+DATABASE_REPLICA_PIN_COOKIE = "db_primary_pin"
+
+# On-demand profiling: with REQUEST_PROFILING=True a logged-in superuser can add
+# ?profile= to a URL to get a cProfile and SQL breakdown of that request (see
+# main.profiling). Off by default; when off the middleware is not loaded at all.
+REQUEST_PROFILING = os.getenv("REQUEST_PROFILING", "False") == "True"
+REQUEST_PROFILING_DIR = os.getenv("REQUEST_PROFILING_DIR", BASE_DIR / "profiles")
+# Number of functions listed in a profile report.
+REQUEST_PROFILING_LIMIT = int(os.getenv("REQUEST_PROFILING_LIMIT", "40"))
+
+# Slow-query capture (see schedules.slow_queries): queries of the schedules app
+# slower than SLOW_QUERY_MS milliseconds are stored with their EXPLAIN plan and
+# shown in the admin. 0 turns the capture off. ANALYZE only applies to SELECTs
+# on PostgreSQL; the log keeps the newest SLOW_QUERY_LOG_SIZE entries.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+SLOW_QUERY_EXPLAIN_ANALYZE = os.getenv("SLOW_QUERY_EXPLAIN_ANALYZE", "False") == "True"
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "500"))
+
+# The in-memory search index (schedules.search) is rebuilt after writes, and at
+# the latest after this many seconds in case a worker missed the invalidation.
+SEARCH_INDEX_MAX_AGE = int(os.getenv("SEARCH_INDEX_MAX_AGE", "300"))
+
+# Deleted rows are reported by the sync feed (schedules.sync) for this many
+# days; older cursors get 410 Gone and clients download everything again.
+SYNC_TOMBSTONE_DAYS = int(os.getenv("SYNC_TOMBSTONE_DAYS", "30"))
+
+# Section change events (schedules.events) are handed to open event streams by
+# this broker. The default fans out within one process; replace it with a
+# broker relaying between processes when running more than one.
+SCHEDULE_EVENTS_BROKER = os.getenv("SCHEDULE_EVENTS_BROKER", "schedules.events.LocalBroker")
+# Seconds between keepalive comments on idle event streams
+SCHEDULE_EVENTS_KEEPALIVE = int(os.getenv("SCHEDULE_EVENTS_KEEPALIVE", "15"))
+
+# API responses of at least this many bytes are compressed with Brotli or gzip
+# (schedules.compression). List responses are also kept in the cache, already
+# compressed, for API_RESPONSE_CACHE_SECONDS or until a write; 0 turns that off.
+# A write only reaches the other workers through a shared cache, so the default
+# is 0 unless REDIS_URL or MEMCACHED_LOCATION is set.
+API_COMPRESSION_MIN_SIZE = int(os.getenv("API_COMPRESSION_MIN_SIZE", "1024"))
+API_RESPONSE_CACHE_SECONDS = int(os.getenv(
+    "API_RESPONSE_CACHE_SECONDS", "60" if os.getenv("REDIS_URL") or os.getenv("MEMCACHED_LOCATION") else "0"
+))
+
+# Build the URL resolvers and the search index when main.wsgi (or main.asgi) is
+# loaded rather than on the first requests (see main.startup).
+STARTUP_WARM_UP = os.getenv("STARTUP_WARM_UP", "True") == "True"
+
+# Campus hours that room utilization (schedules.analytics) is measured against,
+# and how long reports are cached (writes to the schedule invalidate them).
+CAMPUS_DAYS = os.getenv("CAMPUS_DAYS", "M T W TH F")
+CAMPUS_DAY_START = os.getenv("CAMPUS_DAY_START", "7:00 AM")
+CAMPUS_DAY_END = os.getenv("CAMPUS_DAY_END", "7:00 PM")
+ANALYTICS_CACHE_SECONDS = int(os.getenv("ANALYTICS_CACHE_SECONDS", "3600"))
+# Weekly contact hours above which the teaching load report flags a faculty member
+FACULTY_OVERLOAD_HOURS = float(os.getenv("FACULTY_OVERLOAD_HOURS", "18"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -148,6 +280,9 @@ LANGUAGE_CODE = "en-us"
 
 TIME_ZONE = "UTC"
 
+# Local time of the class schedules ("11:00 AM"), used by the calendar feeds.
+SCHEDULE_TIME_ZONE = os.getenv("SCHEDULE_TIME_ZONE", "Asia/Manila")
+
 USE_I18N = True
 
 USE_TZ = True
@@ -0,0 +1,82 @@
+"""
+Start-up work done before the first request instead of during it.
+
+Importing main.wsgi sets Django up and loads the middleware, but the URL
+resolvers (and with them every view, serializer and DRF module), the compiled
+URL patterns and the schedules search index are only built by the first
+requests that need them. ``warm_up()`` builds them at boot. It is called from
+main.wsgi when ``STARTUP_WARM_UP`` is on; with gunicorn's ``preload_app``
+(see gunicorn.conf.py) that is once in the master process, and every worker
+forked from it starts warm.
+
+Database connections opened for the warm-up are closed again, so no worker
+inherits a connection (or a connection pool) from the master.
+"""
+
+import logging
+import time
+
+from django.db import DatabaseError, connections
+from django.urls import Resolver404, get_resolver, reverse
+
+logger = logging.getLogger(__name__)
+
+# Resolved once so the patterns in front of them are compiled
+WARM_UP_PATHS = [
+    "/health/",
+    "/api/schedules/courses/",
+    "/api/schedules/sections/",
+    "/api/schedules/rooms/",
+    "/api/schedules/faculty/",
+    "/api/schedules/search/",
+    "/api/schedules/changes/",
+]
+
+
+def warm_up_urls():
+    resolver = get_resolver()
+    # Imports every URLconf and view, and builds the reverse lookup tables
+    reverse("health_check")
+    for path in WARM_UP_PATHS:
+        try:
+            resolver.resolve(path)
+        except Resolver404:
+            logger.warning("Warm-up path %s does not resolve", path)
+
+
+def warm_up_search():
+    from schedules.search import get_index
+
+    try:
+        get_index()
+    except DatabaseError as e:
+        # e.g. before the first migrate; the first search builds it instead
+        logger.warning("Search index not built at startup: %s", e)
+
+
+def close_connections():
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+        if hasattr(connection, "close_pool"):
+            connection.close_pool()
+
+
+WARM_UP_STEPS = [
+    ("urls", warm_up_urls),
+    ("search", warm_up_search),
+]
+
+
+def warm_up():
+    """Run the warm-up steps; returns the seconds each one took"""
+    timings = {}
+    try:
+        for name, step in WARM_UP_STEPS:
+            started = time.perf_counter()
+            step()
+            timings[name] = time.perf_counter() - started
+    finally:
+        close_connections()
+    logger.info("Warmed up in %.3fs (%s)", sum(timings.values()),
+                ", ".join(f"{name} {seconds:.3f}s" for name, seconds in timings.items()))
+    return timings
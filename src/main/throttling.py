@@ -0,0 +1,90 @@
+"""
+Token-bucket API throttling shared by every worker.
+
+Each client (user, or IP address when anonymous) has one bucket per scope, so
+cheap reads do not use up the budget of expensive conflict checks. A view
+picks its scope with ``throttle_scope`` (by default ``read`` for safe methods
+and ``write`` otherwise) and what a request costs with ``throttle_cost`` or,
+per action, ``throttle_costs``. Rates come from ``DEFAULT_THROTTLE_RATES``: a
+rate of "300/minute" is a bucket of 300 tokens refilled at 5 per second.
+
+A bucket is a single integer in the cache: the time, in microseconds, at which
+it will be full again. Taking tokens is one atomic ``incr`` that moves that
+time on by their refill time; the request is allowed unless this puts it more
+than a full bucket ahead of now, in which case the tokens are given back. The
+cache must therefore be shared between workers (see ``CACHES``), and no
+database query is made.
+"""
+
+import time
+
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+KEY_PREFIX = "throttle:"
+# Buckets expire after being kept this long (at least twice their period). An
+# idle bucket is full by then anyway; a busy one starts over full, which lets
+# a client through a little early at most once per expiry.
+MIN_KEY_TIMEOUT = 3600
+
+
+def parse_rate(rate):
+    """(tokens, seconds) of a rate such as "300/minute" or "5/s"; None for no limit"""
+    if rate is None:
+        return None
+    tokens, period = rate.split("/")
+    return int(tokens), {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    def __init__(self):
+        self.rates = api_settings.DEFAULT_THROTTLE_RATES
+        self.wait_seconds = None
+
+    def get_scope(self, request, view):
+        default = "read" if request.method in SAFE_METHODS else "write"
+        return getattr(view, "throttle_scope", None) or default
+
+    def get_cost(self, request, view):
+        costs = getattr(view, "throttle_costs", {})
+        return costs.get(getattr(view, "action", None), getattr(view, "throttle_cost", 1))
+
+    def get_cache_key(self, request, view, scope):
+        user = getattr(request, "user", None)
+        ident = f"user:{user.pk}" if user is not None and user.is_authenticated else f"ip:{self.get_ident(request)}"
+        return f"{KEY_PREFIX}{scope}:{ident}"
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        rate = parse_rate(self.rates.get(scope))
+        if rate is None:
+            return True
+        tokens, seconds = rate
+        capacity = seconds * 1_000_000
+        cost = self.get_cost(request, view) * capacity // tokens
+        key = self.get_cache_key(request, view, scope)
+        timeout = max(MIN_KEY_TIMEOUT, 2 * seconds)
+
+        now = time.time_ns() // 1000
+        cache.add(key, now, timeout)
+        try:
+            full_at = cache.incr(key, cost)
+        except ValueError:
+            # Expired or evicted since add()
+            full_at = None
+        if full_at is None or full_at < now + cost:
+            # The bucket was already full; refill time does not accumulate
+            # beyond that. Concurrent requests doing the same may be undercounted.
+            full_at = now + cost
+            cache.set(key, full_at, timeout)
+
+        if full_at - now > capacity:
+            cache.decr(key, cost)
+            self.wait_seconds = (full_at - now - capacity) / 1_000_000
+            return False
+        return True
+
+    def wait(self):
+        return self.wait_seconds
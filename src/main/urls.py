@@ -20,6 +20,8 @@ from django.urls import path, include
 from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
+from main.metrics import metrics
+
 @csrf_exempt
 def health_check(request):
     return HttpResponse("OK")
@@ -27,5 +29,6 @@ def health_check(request):
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("health/", health_check, name="health_check"),
+    path("metrics/", metrics, name="metrics"),
     path("api/schedules/", include("schedules.urls")),
 ]
@@ -1,10 +1,17 @@
 from django.contrib import admin
-from .models import Course, ClassSection, Department, Faculty, AdminUser, Room
+from .models import Course, ClassSection, Department, Faculty, AdminUser, Room, Semester, SlowQueryLog
 
 class ClassSectionInline(admin.TabularInline):
     model = ClassSection
     extra = 0
-    fields = ('section', 'type', 'room', 'schedule', 'faculty')
+    fields = ('semester', 'section', 'type', 'room', 'schedule', 'faculty')
+
+@admin.register(Semester)
+class SemesterAdmin(admin.ModelAdmin):
+    list_display = ('name', 'start_date', 'end_date', 'is_active', 'created_at')
+    list_filter = ('is_active',)
+    search_fields = ('name',)
+    readonly_fields = ('is_active', 'created_at', 'updated_at')
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
@@ -20,8 +27,8 @@ class RoomAdmin(admin.ModelAdmin):
 
 @admin.register(ClassSection)
 class ClassSectionAdmin(admin.ModelAdmin):
-    list_display = ('__str__', 'course', 'section', 'type', 'room', 'faculty', 'schedule')
-    list_filter = ('course', 'type')
+    list_display = ('__str__', 'semester', 'course', 'section', 'type', 'room', 'faculty', 'schedule')
+    list_filter = ('semester', 'course', 'type')
     search_fields = ('course__course_code', 'section', 'room__room', 'schedule')
     autocomplete_fields = ('course', 'faculty', 'room')
 
@@ -42,3 +49,16 @@ class AdminUserAdmin(admin.ModelAdmin):
     list_display = ('name', 'email', 'user_id', 'created_at')
     search_fields = ('name', 'email', 'user_id')
     readonly_fields = ('created_at', 'updated_at')
+
+@admin.register(SlowQueryLog)
+class SlowQueryLogAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'duration_ms', 'method', 'path', 'view', 'caller')
+    list_filter = ('database', 'method', 'view')
+    search_fields = ('sql', 'path', 'view', 'caller')
+    readonly_fields = ('created_at', 'duration_ms', 'database', 'method', 'path', 'view', 'caller', 'sql', 'params', 'plan')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
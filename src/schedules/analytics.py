@@ -0,0 +1,210 @@
+"""
+Reports aggregated over the weekly meetings of a semester.
+
+Meetings (``ClassMeeting``) already hold each section's days and minutes, so a
+report is one grouped query in the database plus a pass over its rows in
+Python; no schedule string is parsed. Results are kept in the cache per
+semester under the ``'api'`` generation (see ``cache.py``), which every
+write to sections, rooms, faculty and semesters bumps.
+
+Room utilization is measured against campus hours, ``CAMPUS_DAYS`` from
+``CAMPUS_DAY_START`` to ``CAMPUS_DAY_END``; booked time outside them is not
+counted. Teaching loads count every weekly meeting, and a faculty member with
+more than ``FACULTY_OVERLOAD_HOURS`` contact hours a week is overloaded.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest, Least
+
+from .cache import API_GENERATION, get_generation
+from .models import ClassMeeting, ClassSection, Faculty, Room
+from .utils import format_time, parse_time_of_day
+
+KEY_PREFIX = 'schedules:analytics:'
+
+# Keys of the teaching load split by section type
+SECTION_TYPES = {'lecture': ClassSection.LECTURE, 'laboratory': ClassSection.LABORATORY}
+
+
+def campus_hours():
+    """(days, first minute, last minute) of the campus week"""
+    return (
+        settings.CAMPUS_DAYS.split(),
+        parse_time_of_day(settings.CAMPUS_DAY_START),
+        parse_time_of_day(settings.CAMPUS_DAY_END),
+    )
+
+
+def cached_report(name, semester, build):
+    """A report of a semester from the cache, built and stored if the data changed since"""
+    key = f"{KEY_PREFIX}{name}:{get_generation(API_GENERATION)}:{semester.pk}"
+    report = cache.get(key)
+    if report is None:
+        report = build(semester)
+        cache.set(key, report, settings.ANALYTICS_CACHE_SECONDS)
+    return report
+
+
+def hours(minutes):
+    return round(minutes / 60, 2)
+
+
+def utilization(minutes, available):
+    return round(minutes / available, 4) if available else 0.0
+
+
+def booked_minutes(semester):
+    """{(room ID, day): minutes booked within campus hours} from one grouped query"""
+    days, start, end = campus_hours()
+    rows = (
+        ClassMeeting.objects
+        .filter(semester=semester, day__in=days, start_minute__lt=end, end_minute__gt=start)
+        .values('room_id', 'day')
+        .order_by()
+        .annotate(minutes=Sum(Least(F('end_minute'), end) - Greatest(F('start_minute'), start)))
+    )
+    return {(row['room_id'], row['day']): row['minutes'] for row in rows}
+
+
+def build_room_utilization(semester):
+    days, start, end = campus_hours()
+    day_minutes = end - start
+    booked = booked_minutes(semester)
+
+    def usage(minutes_by_day, room_count=1):
+        available = day_minutes * room_count
+        return {
+            'booked_hours': hours(sum(minutes_by_day.values())),
+            'utilization': utilization(sum(minutes_by_day.values()), available * len(days)),
+            'by_day': {
+                day: {'booked_hours': hours(minutes), 'utilization': utilization(minutes, available)}
+                for day, minutes in minutes_by_day.items()
+            },
+        }
+
+    rooms, floors, campus = [], {}, dict.fromkeys(days, 0)
+    for room_id, name, floor in Room.objects.order_by('room').values_list('id', 'room', 'floor'):
+        minutes_by_day = {day: booked.get((room_id, day), 0) for day in days}
+        rooms.append({'id': room_id, 'room': name, 'floor': floor, **usage(minutes_by_day)})
+
+        floor_totals = floors.setdefault(floor, {'rooms': 0, 'minutes': dict.fromkeys(days, 0)})
+        floor_totals['rooms'] += 1
+        for day, minutes in minutes_by_day.items():
+            floor_totals['minutes'][day] += minutes
+            campus[day] += minutes
+
+    ranked = sorted(rooms, key=lambda room: (-room['utilization'], room['room']))
+    return {
+        'semester': {'id': semester.pk, 'name': semester.name},
+        'campus_hours': {
+            'days': days,
+            'start': format_time(start),
+            'end': format_time(end),
+            'weekly_hours_per_room': hours(day_minutes * len(days)),
+        },
+        'campus': {'rooms': len(rooms), **usage(campus, len(rooms))},
+        'floors': [
+            {'floor': floor, 'rooms': totals['rooms'], **usage(totals['minutes'], totals['rooms'])}
+            for floor, totals in sorted(floors.items())
+        ],
+        'rooms': rooms,
+        'ranking': [room['id'] for room in ranked],
+    }
+
+
+def room_utilization(semester, limit=5):
+    """
+    Booked hours of every room, floor and the whole campus per weekday, as a
+    fraction of campus hours
+
+    Parameters:
+    - semester: Semester to report on
+    - limit: Number of most and least used rooms to list
+
+    Returns:
+    - Dict with the campus hours, campus, floor and room usage, and the most and least used rooms
+    """
+    report = dict(cached_report('rooms', semester, build_room_utilization))
+    rooms = {room['id']: room for room in report['rooms']}
+    ranking = report.pop('ranking')
+    report['most_used'] = [rooms[room_id] for room_id in ranking[:limit]]
+    report['least_used'] = [rooms[room_id] for room_id in reversed(ranking[-limit:])] if limit else []
+    return report
+
+
+def build_teaching_load(semester):
+    meetings = Q(meetings__semester=semester)
+    minutes = F('meetings__end_minute') - F('meetings__start_minute')
+    load = {}
+    for key, section_type in SECTION_TYPES.items():
+        of_type = meetings & Q(meetings__section__type=section_type)
+        load[f'{key}_sections'] = Count('meetings__section', filter=of_type, distinct=True)
+        load[f'{key}_minutes'] = Sum(minutes, filter=of_type)
+
+    # One grouped query: every faculty member joined to their meetings in the semester
+    rows = (
+        Faculty.objects
+        .order_by('department__name', 'name')
+        .values('id', 'name', 'email', 'department_id', 'department__name')
+        .annotate(**load)
+    )
+
+    departments = {}
+    for row in rows:
+        split = {
+            key: {'sections': row[f'{key}_sections'], 'contact_hours': hours(row[f'{key}_minutes'] or 0)}
+            for key in SECTION_TYPES
+        }
+        sections = sum(part['sections'] for part in split.values())
+        contact_hours = round(sum(part['contact_hours'] for part in split.values()), 2)
+        department = departments.setdefault(row['department_id'], {
+            'id': row['department_id'],
+            'name': row['department__name'],
+            'faculty_count': 0,
+            'sections': 0,
+            'contact_hours': 0,
+            'overloaded': 0,
+            'faculty': [],
+        })
+        overloaded = contact_hours > settings.FACULTY_OVERLOAD_HOURS
+        department['faculty'].append({
+            'id': row['id'],
+            'name': row['name'],
+            'email': row['email'],
+            'sections': sections,
+            'contact_hours': contact_hours,
+            **split,
+            'overloaded': overloaded,
+        })
+        department['faculty_count'] += 1
+        department['sections'] += sections
+        department['contact_hours'] = round(department['contact_hours'] + contact_hours, 2)
+        department['overloaded'] += overloaded
+
+    return {
+        'semester': {'id': semester.pk, 'name': semester.name},
+        'overload_hours': settings.FACULTY_OVERLOAD_HOURS,
+        'departments': list(departments.values()),
+    }
+
+
+def teaching_load(semester, department_id=None):
+    """
+    Weekly contact hours, sections and lecture/laboratory split of every
+    faculty member, grouped by department
+
+    Parameters:
+    - semester: Semester to report on
+    - department_id: Optional department to report on alone
+
+    Returns:
+    - Dict with the overload threshold and the departments, each with its totals and faculty
+    """
+    report = dict(cached_report('teaching-load', semester, build_teaching_load))
+    if department_id is not None:
+        report['departments'] = [
+            department for department in report['departments'] if department['id'] == department_id
+        ]
+    return report
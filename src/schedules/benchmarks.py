@@ -0,0 +1,319 @@
+"""
+Benchmarks for the hot paths of the schedules API.
+
+A synthetic campus is generated into a throwaway test database and a fixed
+set of operations is timed through the Django test client, so runs are
+comparable across commits. Results are plain dictionaries that the
+``benchmark`` management command stores as JSON.
+
+Start-up is timed separately (``benchmark_startup``): each run is a fresh
+interpreter importing main.wsgi and warming it up, as a gunicorn worker does.
+"""
+
+import io
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import redirect_stdout
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, reset_queries
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .models import ClassSection, Faculty, Room
+from .synthetic import CampusGenerator
+from .utils import check_schedule_conflicts
+
+API_PREFIX = '/api/schedules'
+DAYS = ['M', 'T', 'W', 'TH', 'F']
+TIMES = ['7:00 AM - 8:30 AM', '9:00 AM - 10:00 AM', '10:00 AM - 1:00 PM', '1:00 PM - 2:30 PM', '4:00 PM - 7:00 PM']
+# Random slots tried for a write before settling for one that conflicts (and answers 409)
+SLOT_ATTEMPTS = 50
+# Throttles still run, but never answer 429 during a run
+UNTHROTTLED_RATES = {scope: '1000000/second' for scope in ('read', 'write', 'conflicts', 'export')}
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers, e.g. percentile(values, 0.95)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(durations, query_counts=None, statuses=None):
+    """Latency percentiles in milliseconds (and query counts and status codes) of one operation"""
+    summary = {
+        'iterations': len(durations),
+        'mean_ms': round(sum(durations) / len(durations) * 1000, 3) if durations else None,
+        'p50_ms': round(percentile(durations, 0.50) * 1000, 3) if durations else None,
+        'p95_ms': round(percentile(durations, 0.95) * 1000, 3) if durations else None,
+        'p99_ms': round(percentile(durations, 0.99) * 1000, 3) if durations else None,
+    }
+    if query_counts is not None:
+        summary['queries_p50'] = percentile(query_counts, 0.50)
+        summary['queries_max'] = max(query_counts) if query_counts else None
+    if statuses is not None:
+        summary['status_codes'] = {str(status): count for status, count in sorted(Counter(statuses).items())}
+    return summary
+
+
+class Benchmark:
+    """Time a fixed set of operations against the current database"""
+
+    def __init__(self, iterations=50, seed=0):
+        self.iterations = iterations
+        self.random = random.Random(seed)
+        self.client = Client()
+
+    def operations(self):
+        return {
+            'check_schedule_conflicts': self.check_schedule_conflicts,
+            'conflict_check_view': self.conflict_check_view,
+            'course_list': self.course_list,
+            'room_sections_by_day': self.room_sections_by_day,
+            'section_create': self.section_create,
+            'section_update': self.section_update,
+        }
+
+    def run(self, only=None):
+        self.rooms = list(Room.objects.values_list('id', 'room'))
+        self.faculty_ids = list(Faculty.objects.values_list('id', flat=True))
+        self.created_sections = []
+
+        results = {}
+        rest_framework = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': UNTHROTTLED_RATES}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            for name, operation in self.operations().items():
+                if only and name not in only:
+                    continue
+                results[name] = self.measure(operation)
+        return results
+
+    def measure(self, operation):
+        """
+        Time an operation self.iterations times
+
+        The cache is cleared once, before the first iteration, so that run
+        is cold and the rest see whatever the operation itself cached.
+        Requests answered with 409 (no free slot was found for a write) are
+        counted in the status codes; any other error aborts the run.
+        """
+        durations, query_counts, statuses = [], [], []
+        cache.clear()
+        for iteration in range(self.iterations):
+            # Keep the bounded query log from overflowing across iterations
+            reset_queries()
+            request = operation(iteration)
+            # Views log with print(); keep that out of the benchmark output
+            with redirect_stdout(io.StringIO()), CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = request()
+                durations.append(time.perf_counter() - started)
+            query_counts.append(len(queries))
+            status_code = getattr(response, 'status_code', None)
+            if status_code is None:
+                continue
+            statuses.append(status_code)
+            if status_code >= 400 and status_code != 409:
+                raise RuntimeError(f"{operation.__name__} failed with status {status_code}")
+        return summarize(durations, query_counts, statuses if statuses else None)
+
+    def random_slot(self):
+        return self.random.choice(DAYS), self.random.choice(TIMES)
+
+    def free_slot(self, room_id, faculty_id, exclude_section_id=None):
+        """A random (day, time) free for the room and faculty, or a conflicting one if none turns up"""
+        for _ in range(SLOT_ATTEMPTS):
+            day, time_range = self.random_slot()
+            if not check_schedule_conflicts(day, time_range, faculty_id, room_id, exclude_section_id):
+                break
+        return day, time_range
+
+    def check_schedule_conflicts(self, iteration):
+        day, time_range = self.random_slot()
+        room_id, _ = self.random.choice(self.rooms)
+        faculty_id = self.random.choice(self.faculty_ids)
+        return lambda: check_schedule_conflicts(day, time_range, faculty_id=faculty_id, room_id=room_id)
+
+    def conflict_check_view(self, iteration):
+        day, time_range = self.random_slot()
+        room_id, _ = self.random.choice(self.rooms)
+        data = {
+            'day': day,
+            'time': time_range,
+            'room': room_id,
+            'faculty_id': self.random.choice(self.faculty_ids),
+        }
+        return lambda: self.client.post(f'{API_PREFIX}/conflicts/check/', data, content_type='application/json')
+
+    def course_list(self, iteration):
+        return lambda: self.client.get(f'{API_PREFIX}/courses/')
+
+    def room_sections_by_day(self, iteration):
+        _, room = self.random.choice(self.rooms)
+        day = self.random.choice(DAYS)
+        return lambda: self.client.get(f'{API_PREFIX}/rooms/{room}/sections/by-day/', {'day': day})
+
+    def section_create(self, iteration):
+        room_id, _ = self.random.choice(self.rooms)
+        faculty_id = self.random.choice(self.faculty_ids)
+        day, time_range = self.free_slot(room_id, faculty_id)
+        data = {
+            'course_code': f'BENCH {iteration}',
+            'section': 'A',
+            'type': ClassSection.LECTURE,
+            'room_id': room_id,
+            'day': day,
+            'time': time_range,
+            'faculty_id': faculty_id,
+        }
+
+        def request():
+            response = self.client.post(f'{API_PREFIX}/sections/', data, content_type='application/json')
+            if response.status_code == 201:
+                self.created_sections.append(response.json()['id'])
+            return response
+        return request
+
+    def section_update(self, iteration):
+        section_ids = self.created_sections or list(ClassSection.objects.values_list('id', flat=True)[:100])
+        section_id = section_ids[iteration % len(section_ids)]
+        room_id, faculty_id = ClassSection.objects.values_list('room_id', 'faculty_id').get(pk=section_id)
+        day, time_range = self.free_slot(room_id, faculty_id, exclude_section_id=section_id)
+        data = {'day': day, 'time': time_range}
+        return lambda: self.client.patch(f'{API_PREFIX}/sections/{section_id}/', data, content_type='application/json')
+
+
+def run_benchmarks(rooms, faculty, sections, seed=0, iterations=50, only=None):
+    """Seed a synthetic campus into the current database and benchmark it"""
+    started = time.perf_counter()
+    dataset = CampusGenerator(rooms=rooms, faculty=faculty, sections=sections, seed=seed).generate()
+    dataset['seconds'] = round(time.perf_counter() - started, 3)
+
+    return {
+        'dataset': dataset,
+        'database': connection.vendor,
+        'iterations': iterations,
+        'operations': Benchmark(iterations=iterations, seed=seed).run(only=only),
+    }
+
+
+def compare_results(previous, current):
+    """p50/p95 change per operation between two benchmark result dictionaries"""
+    changes = {}
+    for name, result in current['operations'].items():
+        before = previous.get('operations', {}).get(name)
+        if not before:
+            continue
+        changes[name] = {
+            key: {
+                'before': before.get(key),
+                'after': result.get(key),
+                'change_pct': (
+                    round((result[key] - before[key]) / before[key] * 100, 1)
+                    if before.get(key) and result.get(key) is not None else None
+                ),
+            }
+            for key in ('p50_ms', 'p95_ms', 'queries_p50')
+        }
+    return changes
+
+
+# Run in a fresh interpreter; prints the seconds each phase took as JSON
+STARTUP_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import main.wsgi
+imported = time.perf_counter()
+from main.startup import warm_up
+steps = warm_up()
+print(json.dumps({'import': imported - started, 'warm_up': time.perf_counter() - imported, 'steps': steps}))
+"""
+
+
+def start_process(importtime=False):
+    """
+    Import and warm up main.wsgi in a new interpreter
+
+    Parameters:
+    - importtime: Run with -X importtime, which reports every import on stderr
+      (and slows the imports down)
+
+    Returns:
+    - (seconds the whole process took, its phase timings, its stderr)
+    """
+    command = [sys.executable, *(['-X', 'importtime'] if importtime else []), '-c', STARTUP_SCRIPT]
+    # Warmed up by the script itself, so importing and warming up are timed apart
+    env = {**os.environ, 'STARTUP_WARM_UP': 'False', 'PYTHONPATH': str(settings.BASE_DIR)}
+    started = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True, env=env, cwd=settings.BASE_DIR)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"Starting main.wsgi failed:\n{result.stderr}")
+    return elapsed, json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def parse_importtime(output):
+    """
+    Imports reported by -X importtime
+
+    Returns:
+    - List of (module, self microseconds, cumulative microseconds), in import order
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        try:
+            own, cumulative, module = line[len('import time:'):].split('|')
+            imports.append((module.strip(), int(own), int(cumulative)))
+        except ValueError:
+            # The header line
+            continue
+    return imports
+
+
+def import_profile(imports, top=15):
+    """Slowest top-level packages (by their modules' own time) and slowest single imports"""
+    packages = defaultdict(int)
+    for module, own, _ in imports:
+        packages[module.split('.')[0]] += own
+    slowest_packages = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    slowest_modules = sorted(imports, key=lambda item: item[2], reverse=True)[:top]
+    return {
+        'total_ms': round(sum(own for _, own, _ in imports) / 1000, 3),
+        'packages': [{'package': name, 'ms': round(own / 1000, 3)} for name, own in slowest_packages],
+        'modules': [
+            {'module': module, 'self_ms': round(own / 1000, 3), 'cumulative_ms': round(cumulative / 1000, 3)}
+            for module, own, cumulative in slowest_modules
+        ],
+    }
+
+
+def run_startup_benchmark(repeat=10, top=15):
+    """Time repeat cold starts of main.wsgi, plus one with an import profile"""
+    phases = defaultdict(list)
+    for _ in range(repeat):
+        elapsed, timings, _ = start_process()
+        phases['process'].append(elapsed)
+        phases['import'].append(timings['import'])
+        phases['warm_up'].append(timings['warm_up'])
+        for step, seconds in timings['steps'].items():
+            phases[f'warm_up_{step}'].append(seconds)
+
+    _, _, stderr = start_process(importtime=True)
+    return {
+        'python': sys.version.split()[0],
+        'iterations': repeat,
+        'operations': {name: summarize(durations) for name, durations in phases.items()},
+        'imports': import_profile(parse_importtime(stderr), top=top),
+    }
@@ -0,0 +1,89 @@
+"""
+Race-free writes of class sections.
+
+Checking for conflicts and inserting afterwards lets two admins who book the
+same room at the same moment both pass the check. On PostgreSQL the meetings
+table has exclusion constraints (migration 0010), so overlapping meetings of a
+room or faculty member can never be committed; a violation is turned back
+into the usual list of conflicts. Other databases lock the room and faculty
+rows for the duration of the write and check again while holding them, which
+serializes writes per room and per faculty member rather than globally.
+
+SQLite ignores SELECT ... FOR UPDATE and only has one lock for the whole
+database, taken by a transaction's first write. There the write starts with a
+statement that changes nothing but takes that lock, so the check runs with no
+other write in flight; every section write is serialized, and one waiting
+longer than the connection's timeout (5 seconds) fails with "database is
+locked".
+"""
+
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, transaction
+
+from .models import Faculty, Room
+
+# Names of the exclusion constraints of migration 0010
+OVERLAP_CONSTRAINTS = ('meeting_room_no_overlap', 'meeting_faculty_no_overlap')
+
+
+class ScheduleConflict(Exception):
+    """A write that would double-book a room or faculty member"""
+
+    def __init__(self, conflicts):
+        super().__init__("Schedule conflict detected")
+        self.conflicts = conflicts
+
+
+def overlap_enforced(using=DEFAULT_DB_ALIAS):
+    """Whether the database itself rejects overlapping meetings"""
+    return connections[using].vendor == 'postgresql'
+
+
+def is_overlap_violation(error):
+    """Whether an IntegrityError comes from one of the overlap constraints"""
+    diag = getattr(error.__cause__, 'diag', None)
+    return getattr(diag, 'constraint_name', None) in OVERLAP_CONSTRAINTS
+
+
+def lock_schedules(room_id=None, faculty_id=None, using=DEFAULT_DB_ALIAS):
+    """
+    Lock the room and faculty rows whose schedules a write is about to change,
+    always in that order; on SQLite, the whole database
+    """
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            # Matches no row, but still takes the write lock until the commit
+            cursor.execute(f"UPDATE {quote(Room._meta.db_table)} SET {quote('id')} = {quote('id')} WHERE 0 = 1")
+        return
+    if room_id:
+        list(Room.objects.select_for_update().filter(pk=room_id).values_list('pk', flat=True))
+    if faculty_id:
+        list(Faculty.objects.select_for_update().filter(pk=faculty_id).values_list('pk', flat=True))
+
+
+def write_section(write, find_conflicts, room_id=None, faculty_id=None):
+    """
+    Run write() so that it cannot double-book the room or faculty member
+
+    Parameters:
+    - write: Callable saving the section
+    - find_conflicts: Callable returning the section's conflicts, as check_schedule_conflicts does
+    - room_id, faculty_id: Room and faculty the section will occupy
+
+    Returns:
+    - Whatever write() returns; raises ScheduleConflict with the conflicts instead of writing
+    """
+    try:
+        with transaction.atomic():
+            if not overlap_enforced():
+                lock_schedules(room_id, faculty_id)
+                conflicts = find_conflicts()
+                if conflicts:
+                    raise ScheduleConflict(conflicts)
+            return write()
+    except IntegrityError as e:
+        if not is_overlap_violation(e):
+            raise
+        # Rolled back by now, so the section that won the race is visible
+        raise ScheduleConflict(find_conflicts()) from e
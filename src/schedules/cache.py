@@ -0,0 +1,45 @@
+"""
+Generation counters for data kept in memory or in the cache.
+
+Each namespace (e.g. ``'search'``) has a counter in the Django cache that is
+bumped whenever its rows change. Anything derived from those rows remembers
+the generation it was built from and is rebuilt once the counter moves on.
+Model signals bump the counters (see ``signals.py``); bulk writes that skip
+signals, such as ``bulk_create`` or raw SQL, call ``bump_generation`` themselves.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+KEY_PREFIX = 'schedules:generation:'
+
+# Namespace of everything derived from the schedule tables as a whole: cached
+# API responses (compression.py) and reports (analytics.py)
+API_GENERATION = 'api'
+
+
+def get_generation(namespace):
+    """Current generation of a namespace, 0 if nothing was written since the cache was cleared"""
+    return cache.get(KEY_PREFIX + namespace, 0)
+
+
+def bump_generation(namespace):
+    """Mark everything derived from a namespace as stale"""
+    key = KEY_PREFIX + namespace
+    # add() is a no-op if the key exists, so concurrent bumps never reset it
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, 1, timeout=None)
+        return 1
+
+
+def bump_generation_on_commit(namespace):
+    """
+    Bump a namespace now and again once the current transaction commits, so
+    nothing derived from the old rows in between is kept as current
+    """
+    bump_generation(namespace)
+    transaction.on_commit(lambda: bump_generation(namespace), robust=True)
@@ -0,0 +1,169 @@
+"""
+Compression of API responses, and a cache of the compressed list responses.
+
+Responses under ``/api/schedules/`` of at least ``API_COMPRESSION_MIN_SIZE``
+bytes are compressed with Brotli or gzip, whichever the client prefers in its
+Accept-Encoding. Streaming responses (exports, calendar feeds, event streams)
+are left alone.
+
+List actions named in a viewset's ``cached_actions`` are also kept in the
+cache for ``API_RESPONSE_CACHE_SECONDS``, compressed, under the ``'api'``
+generation (see ``cache.py``) that every write to the schedule tables bumps.
+A hit is answered from ``process_view`` with the stored bytes: no query, no
+serializer and no compression. The viewset's authentication, permission and
+throttle checks still run first, so a hit takes its throttle tokens; a
+request they refuse goes on to the view, which answers it as usual.
+
+The generation is only bumped in the cache of the worker that made the write,
+so the response cache is only correct with a cache shared by every worker
+(``REDIS_URL`` or ``MEMCACHED_LOCATION``); ``API_RESPONSE_CACHE_SECONDS``
+defaults to 0 without one.
+"""
+
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import APIException
+
+from .cache import API_GENERATION, get_generation
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is in requirements.txt
+    brotli = None
+
+PATH_PREFIX = '/api/schedules/'
+KEY_PREFIX = 'schedules:response:'
+
+# Preferred first; Brotli at quality 5 compresses about as fast as gzip level 6
+ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+
+
+def negotiate(accept_encoding):
+    """Best of ENCODINGS acceptable to an Accept-Encoding header, None for identity"""
+    weights = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output of identical content identical
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response, encoding):
+    """Compress a response in place if it is worth it; returns whether it was"""
+    if response.streaming or response.has_header('Content-Encoding'):
+        return False
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if encoding is None or len(response.content) < settings.API_COMPRESSION_MIN_SIZE:
+        return False
+
+    response.content = compress(response.content, encoding)
+    response['Content-Encoding'] = encoding
+    response['Content-Length'] = str(len(response.content))
+    # The compressed bytes differ from the identity ones, as GZipMiddleware notes
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = f'W/{etag}'
+    return True
+
+
+def response_cache_key(request, encoding):
+    variant = f"{request.get_full_path()}\n{request.headers.get('Accept', '')}"
+    digest = hashlib.sha1(variant.encode()).hexdigest()
+    return f"{KEY_PREFIX}{get_generation(API_GENERATION)}:{encoding or 'identity'}:{digest}"
+
+
+def is_cached_view(request, view_func):
+    """Whether the view is an action listed in its viewset's cached_actions"""
+    if request.method != 'GET' or not settings.API_RESPONSE_CACHE_SECONDS or 'profile' in request.GET:
+        return False
+    action = (getattr(view_func, 'actions', None) or {}).get('get')
+    return action in getattr(getattr(view_func, 'cls', None), 'cached_actions', ())
+
+
+def passes_view_checks(request, view_func, view_args, view_kwargs):
+    """Whether the viewset's authentication, permissions and throttles let the request through"""
+    view = view_func.cls(**view_func.initkwargs)
+    view.action_map = view_func.actions
+    view.args, view.kwargs = view_args, view_kwargs
+    view.request = view.initialize_request(request, *view_args, **view_kwargs)
+    try:
+        view.initial(view.request, *view_args, **view_kwargs)
+    except APIException:
+        # Refused tokens are given back, so the view can check again and answer
+        return False
+    return True
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not request.path.startswith(PATH_PREFIX):
+            return response
+
+        encoding = negotiate(request.headers.get('Accept-Encoding', ''))
+        if getattr(response, 'from_response_cache', False):
+            return response
+        compress_response(response, encoding)
+
+        key = getattr(request, 'response_cache_key', None)
+        if (key and response.status_code == 200 and not response.streaming
+                and response.get('Content-Type', '').startswith('application/json')):
+            cache.set(key, {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'encoding': response.get('Content-Encoding'),
+            }, settings.API_RESPONSE_CACHE_SECONDS)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not request.path.startswith(PATH_PREFIX) or not is_cached_view(request, view_func):
+            return None
+
+        key = response_cache_key(request, negotiate(request.headers.get('Accept-Encoding', '')))
+        cached = cache.get(key)
+        if cached is None:
+            request.response_cache_key = key
+            return None
+        if not passes_view_checks(request, view_func, view_args, view_kwargs):
+            return None
+
+        response = HttpResponse(cached['content'], content_type=cached['content_type'])
+        if cached['encoding']:
+            response['Content-Encoding'] = cached['encoding']
+        response['Content-Length'] = str(len(cached['content']))
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        response['X-Response-Cache'] = 'hit'
+        response.from_response_cache = True
+        return response
@@ -0,0 +1,222 @@
+"""
+Server-sent events of class section changes.
+
+Saving or deleting a section publishes an event once the transaction commits
+(see ``signals.py``). The broker named by ``SCHEDULE_EVENTS_BROKER`` hands it
+to every open stream; the default ``LocalBroker`` fans events out within this
+process only, so run a single ASGI process or plug in a broker that relays
+events between processes. A broker needs two methods: ``publish(event)``,
+callable from any thread, and ``subscribe()``, returning a ``Subscription``
+(or anything with the same ``get()`` and ``close()``).
+
+Each stream applies its own room, floor, faculty and department filters. A
+subscriber that falls more than ``QUEUE_SIZE`` events behind is dropped; its
+display reconnects and loads the schedule again.
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+QUEUE_SIZE = 100
+
+CREATED, UPDATED, DELETED, RELOAD = 'section.created', 'section.updated', 'section.deleted', 'reload'
+
+# Filter -> event keys it is matched against (current and previous placement)
+FILTERS = {
+    'room': ('room', 'previous_room'),
+    'floor': ('floor', 'previous_floor'),
+    'faculty': ('faculty', 'previous_faculty'),
+    'department': ('department', 'previous_department'),
+}
+# Rooms may also be filtered by name
+ROOM_NAME_KEYS = ('room_name', 'previous_room_name')
+
+_ids = itertools.count(1)
+
+
+class Closed(Exception):
+    """The subscription was dropped or closed"""
+
+
+class Subscription:
+    """Queue of the events for one stream, fed from any thread"""
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+        self.closed = False
+
+    def put(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The stream's event loop is gone
+            self.close()
+
+    def _put(self, event):
+        if self.closed:
+            return
+        if self.queue.full():
+            # Too far behind to catch up; the client reconnects and reloads
+            self.close()
+            return
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        """Next event, None after a timeout; raises Closed once dropped"""
+        if self.closed:
+            raise Closed()
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.closed = True
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """Fans events out to the subscribers in this process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = set()
+
+    def publish(self, event):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber.put(event)
+
+    def subscribe(self):
+        subscription = Subscription(self)
+        with self.lock:
+            self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscribers.discard(subscription)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.SCHEDULE_EVENTS_BROKER)()
+        return _broker
+
+
+def reset_broker():
+    """Forget the broker, e.g. after SCHEDULE_EVENTS_BROKER changed"""
+    global _broker
+    with _broker_lock:
+        _broker = None
+
+
+def section_event(kind, section, previous=None):
+    """
+    Event describing a change of a section
+
+    Parameters:
+    - kind: CREATED, UPDATED or DELETED
+    - section: The section as saved (or as it was before being deleted)
+    - previous: Optional (room, faculty) the section had before an update
+
+    Returns:
+    - Dict with the event type, the section's fields and where it is held, plus
+      where it was held before when an update moved it
+    """
+    room, faculty = section.room, section.faculty
+    event = {
+        'type': kind,
+        'id': section.pk,
+        'semester': section.semester_id,
+        'course': section.course.course_code,
+        'section': section.section,
+        'section_type': section.type,
+        'schedule': section.schedule,
+        'room': room.pk,
+        'room_name': room.room,
+        'floor': room.floor,
+        'faculty': faculty.pk if faculty else None,
+        'faculty_name': faculty.name if faculty else None,
+        'department': faculty.department_id if faculty else None,
+        'version': section.version,
+    }
+    if previous:
+        previous_room, previous_faculty = previous
+        if previous_room is not None and previous_room.pk != room.pk:
+            event['previous_room'] = previous_room.pk
+            event['previous_room_name'] = previous_room.room
+            event['previous_floor'] = previous_room.floor
+        if previous_faculty is not None and previous_faculty.pk != event['faculty']:
+            event['previous_faculty'] = previous_faculty.pk
+            event['previous_department'] = previous_faculty.department_id
+    return event
+
+
+def reload_event(semester_id=None):
+    """Event telling every display to load its schedule again, after bulk writes that send no signals"""
+    return {'type': RELOAD, 'semester': semester_id}
+
+
+def publish(event):
+    get_broker().publish(event)
+
+
+def matches(event, filters):
+    """
+    Whether an event passes a stream's filters
+
+    Parameters:
+    - event: Event dict
+    - filters: Dict of {filter name: value}, room as an ID or a name, the rest as strings
+
+    Returns:
+    - True if every filter matches the section's current or previous placement;
+      reload events always match
+    """
+    if event['type'] == RELOAD:
+        return True
+    for name, value in filters.items():
+        keys = ROOM_NAME_KEYS if name == 'room' and not value.isdigit() else FILTERS[name]
+        if not any(event.get(key) is not None and str(event[key]) == value for key in keys):
+            return False
+    return True
+
+
+def format_event(event):
+    """An event as an SSE message"""
+    return f"id: {next(_ids)}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+
+
+async def stream(filters, keepalive):
+    """SSE messages of the events passing the filters, until the subscriber is dropped or goes away"""
+    # Subscribed here rather than in the view, so the queue belongs to the loop serving the response
+    subscription = get_broker().subscribe()
+    try:
+        # Reconnect after 5 seconds if the connection drops
+        yield b"retry: 5000\n\n"
+        while True:
+            try:
+                event = await subscription.get(timeout=keepalive)
+            except Closed:
+                return
+            if event is None:
+                yield b": keepalive\n\n"
+            elif matches(event, filters):
+                yield format_event(event)
+    finally:
+        subscription.close()
@@ -0,0 +1,155 @@
+"""
+Streaming CSV and XLSX export of a semester's class sections.
+
+Rows come from a single query read with ``iterator(chunk_size=...)`` and are
+encoded chunk by chunk, so memory stays flat however many sections a
+semester has. XLSX files are written as a zip stream with inline strings,
+which needs no spreadsheet library and no temporary file.
+"""
+
+import csv
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from .models import ClassSection
+from .utils import format_time, parse_schedule
+
+COLUMNS = [
+    'Semester', 'Course', 'Section', 'Type', 'Days', 'Start', 'End', 'Schedule',
+    'Room', 'Floor', 'Faculty', 'Faculty Email', 'Department',
+]
+CHUNK_SIZE = 2000
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def export_rows(semester=None, chunk_size=CHUNK_SIZE):
+    """One list of values per section of a semester (the active one by default), in COLUMNS order"""
+    sections = ClassSection.objects.for_semester(semester).order_by('course__course_code', 'section').values_list(
+        'semester__name', 'course__course_code', 'section', 'type', 'schedule',
+        'room__room', 'room__floor', 'faculty__name', 'faculty__email', 'faculty__department__name',
+    )
+    for semester_name, course, section, section_type, schedule, room, floor, faculty, email, department in (
+        sections.iterator(chunk_size=chunk_size)
+    ):
+        parsed = parse_schedule(schedule)
+        days, start, end = (' '.join(parsed[0]), format_time(parsed[1]), format_time(parsed[2])) if parsed else ('', '', '')
+        yield [
+            semester_name, course, section, section_type, days, start, end, schedule,
+            room, floor, faculty or '', email or '', department or '',
+        ]
+
+
+class _Buffer:
+    """Write-only file object whose contents are taken out after each write"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b''.join(chunk.encode() if isinstance(chunk, str) else chunk for chunk in self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_csv(rows):
+    buffer = _Buffer()
+    writer = csv.writer(buffer)
+    # A byte order mark lets Excel detect UTF-8
+    yield '\ufeff'.encode()
+    writer.writerow(COLUMNS)
+    for row in rows:
+        writer.writerow(row)
+        if len(buffer.chunks) >= 500:
+            yield buffer.take()
+    yield buffer.take()
+
+
+# Characters XML 1.0 does not allow, even escaped
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Sections" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_row(values):
+    cells = ''.join(
+        f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_INVALID_XML.sub("", str(value)))}</t></is></c>'
+        for value in values
+    )
+    return f'<row>{cells}</row>'
+
+
+def stream_xlsx(rows):
+    buffer = _Buffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+        yield buffer.take()
+
+        # The sheet's size is unknown up front; zip64 keeps very large terms valid
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                '<sheetData>' + _xlsx_row(COLUMNS)
+            ).encode())
+            pending = []
+            for row in rows:
+                pending.append(_xlsx_row(row))
+                if len(pending) >= 500:
+                    sheet.write(''.join(pending).encode())
+                    pending = []
+                    yield buffer.take()
+            sheet.write((''.join(pending) + '</sheetData></worksheet>').encode())
+    yield buffer.take()
+
+
+def stream_export(filetype, semester=None):
+    """Bytes chunks of the export of a semester as 'csv' or 'xlsx'"""
+    rows = export_rows(semester)
+    return stream_csv(rows) if filetype == 'csv' else stream_xlsx(rows)
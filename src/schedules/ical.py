@@ -0,0 +1,181 @@
+"""
+iCalendar (.ics) feeds of class schedules.
+
+Every section becomes one weekly recurring event ("M TH | 11:00 AM - 12:00 PM"
+is a VEVENT with RRULE:FREQ=WEEKLY;BYDAY=MO,TH) from the start to the end of
+its semester. Feeds are streamed, and carry an ETag derived from a single
+aggregate query, so a calendar client polling an unchanged feed gets a
+304 Not Modified without any section being loaded.
+"""
+
+import hashlib
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import HttpResponseNotModified, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
+from django.utils.text import slugify
+from rest_framework.renderers import BaseRenderer
+
+from .utils import parse_schedule
+
+ICAL_DAYS = {'M': 'MO', 'T': 'TU', 'W': 'WE', 'TH': 'TH', 'F': 'FR', 'S': 'SA', 'SU': 'SU'}
+WEEKDAYS = {'M': 0, 'T': 1, 'W': 2, 'TH': 3, 'F': 4, 'S': 5, 'SU': 6}
+
+
+def escape(text):
+    """Escape a TEXT value (RFC 5545 3.3.11)"""
+    return (
+        str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """Fold a content line into chunks of at most 75 octets, each ending in CRLF"""
+    chunks, current, size = [], '', 0
+    for char in line:
+        length = len(char.encode())
+        # Continuation lines start with a space, which counts towards their 75 octets
+        if size + length > 75:
+            chunks.append(current)
+            current, size = ' ', 1
+        current += char
+        size += length
+    chunks.append(current)
+    return ''.join(chunk + '\r\n' for chunk in chunks)
+
+
+def format_utc(value):
+    return value.astimezone(ZoneInfo('UTC')).strftime('%Y%m%dT%H%M%SZ')
+
+
+def feed_etag(sections, semester, owner):
+    """
+    ETag of a feed: changes whenever a section is added, removed or edited,
+    or the semester, the owner (room or faculty) or a related row is renamed
+    """
+    state = sections.order_by().aggregate(
+        count=Count('id'),
+        sections=Max('updated_at'),
+        courses=Max('course__updated_at'),
+        rooms=Max('room__updated_at'),
+        faculty=Max('faculty__updated_at'),
+    )
+    parts = [
+        semester.pk, semester.updated_at, semester.start_date, semester.end_date,
+        owner.pk, getattr(owner, 'updated_at', None), *state.values(),
+    ]
+    return hashlib.md5('|'.join(map(str, parts)).encode()).hexdigest()
+
+
+class CalendarFeed:
+    """Lines of a VCALENDAR for the sections of one semester"""
+
+    def __init__(self, name, semester, sections):
+        self.name = name
+        self.semester = semester
+        self.sections = sections
+        self.zone = ZoneInfo(settings.SCHEDULE_TIME_ZONE)
+        self.first_day = semester.start_date or timezone.localtime(semester.created_at, self.zone).date()
+
+    def lines(self):
+        yield 'BEGIN:VCALENDAR'
+        yield 'VERSION:2.0'
+        yield 'PRODID:-//UPCampus//Schedules//EN'
+        yield 'CALSCALE:GREGORIAN'
+        yield 'METHOD:PUBLISH'
+        yield f'X-WR-CALNAME:{escape(self.name)}'
+        yield f'X-WR-TIMEZONE:{settings.SCHEDULE_TIME_ZONE}'
+        yield from self.timezone()
+        for section in self.sections.iterator(chunk_size=500):
+            yield from self.event(section)
+        yield 'END:VCALENDAR'
+
+    def timezone(self):
+        # Campus time zones without daylight saving (e.g. Asia/Manila) need a
+        # single STANDARD rule; the offset is the one in force at the start
+        offset = datetime.combine(self.first_day, time(), self.zone).utcoffset()
+        sign = '-' if offset < timedelta(0) else '+'
+        hours, minutes = divmod(abs(int(offset.total_seconds())) // 60, 60)
+        yield 'BEGIN:VTIMEZONE'
+        yield f'TZID:{settings.SCHEDULE_TIME_ZONE}'
+        yield 'BEGIN:STANDARD'
+        yield 'DTSTART:19700101T000000'
+        yield f'TZOFFSETFROM:{sign}{hours:02d}{minutes:02d}'
+        yield f'TZOFFSETTO:{sign}{hours:02d}{minutes:02d}'
+        yield 'END:STANDARD'
+        yield 'END:VTIMEZONE'
+
+    def event(self, section):
+        parsed = parse_schedule(section.schedule)
+        if parsed is None:
+            return
+        days, start, end = parsed
+        days = [day for day in days if day in WEEKDAYS]
+        if not days:
+            return
+
+        # The first class is on the first of its days on or after the semester start
+        first = min(
+            self.first_day + timedelta(days=(WEEKDAYS[day] - self.first_day.weekday()) % 7) for day in days
+        )
+        tzid = settings.SCHEDULE_TIME_ZONE
+        rule = f"FREQ=WEEKLY;BYDAY={','.join(ICAL_DAYS[day] for day in days)}"
+        if self.semester.end_date:
+            until = datetime.combine(self.semester.end_date, time(23, 59, 59), self.zone)
+            rule += f';UNTIL={format_utc(until)}'
+
+        title = f"{section.course.course_code} {section.section} ({section.type})"
+        yield 'BEGIN:VEVENT'
+        yield f'UID:section-{section.pk}-semester-{section.semester_id}@upcampus'
+        yield f'DTSTAMP:{format_utc(section.updated_at)}'
+        yield f'LAST-MODIFIED:{format_utc(section.updated_at)}'
+        yield f'DTSTART;TZID={tzid}:{first:%Y%m%d}T{start // 60:02d}{start % 60:02d}00'
+        yield f'DTEND;TZID={tzid}:{first:%Y%m%d}T{end // 60:02d}{end % 60:02d}00'
+        yield f'RRULE:{rule}'
+        yield f'SUMMARY:{escape(title)}'
+        yield f'LOCATION:{escape(section.room)}'
+        if section.faculty:
+            yield f'DESCRIPTION:{escape(f"Faculty: {section.faculty.name}")}'
+        yield 'END:VEVENT'
+
+    def __iter__(self):
+        for line in self.lines():
+            yield fold(line).encode()
+
+
+class ICalendarRenderer(BaseRenderer):
+    """
+    Lets views accept the .ics format suffix; feeds themselves are returned as
+    streaming responses, so only error responses are rendered here (as text)
+    """
+    media_type = 'text/calendar'
+    format = 'ics'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and 'detail' in data:
+            data = data['detail']
+        return str(data).encode()
+
+
+def ics_response(request, sections, semester, owner, name, filename):
+    """Streaming .ics response for sections, or 304 if the client's copy is current"""
+    etag = quote_etag(feed_etag(sections, semester, owner))
+    etags = parse_etags(request.headers.get('If-None-Match', ''))
+    if etag in etags or '*' in etags:
+        response = HttpResponseNotModified()
+    else:
+        response = StreamingHttpResponse(
+            CalendarFeed(name, semester, sections.select_related('course', 'room', 'faculty')),
+            content_type='text/calendar; charset=utf-8'
+        )
+        response['Content-Disposition'] = f'inline; filename="{slugify(filename)}.ics"'
+    response['ETag'] = etag
+    # Calendar clients may keep the feed but must revalidate it on every poll
+    response['Cache-Control'] = 'private, no-cache'
+    return response
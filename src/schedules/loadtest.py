@@ -0,0 +1,270 @@
+"""
+Concurrent load replay against a running schedules API.
+
+A mix of requests (browsing courses, polling room schedules, conflict probes
+and section edits) is either generated from the rows the server already has
+or read from a recorded JSON lines file, then replayed by a pool of threads
+using only the standard library. The ``replay_load`` management command
+prints the summary and can save the mix and the results for later runs.
+"""
+
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+
+from .benchmarks import DAYS, TIMES, percentile
+
+API_PREFIX = '/api/schedules'
+
+# Share of each kind of request in a synthetic mix, roughly registration week
+DEFAULT_MIX = {
+    'browse_courses': 35,
+    'poll_room_schedule': 35,
+    'conflict_probe': 20,
+    'section_edit': 10,
+}
+
+
+def parse_mix(value):
+    """'browse_courses=40,section_edit=10' -> {'browse_courses': 40, 'section_edit': 10}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown request kind '{name}', expected one of {', '.join(DEFAULT_MIX)}")
+        if not weight.strip().isdigit():
+            raise ValueError(f"Weight of '{name}' must be a whole number")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise ValueError("At least one request kind needs a weight above zero")
+    return mix
+
+
+class LoadClient:
+    """Minimal JSON client for the schedules API on top of urllib"""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def request(self, method, path, body=None):
+        """(status, parsed body or None); status is None when the server could not be reached"""
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            method=method.upper(),
+            headers={'Content-Type': 'application/json', 'Accept': 'application/json'}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, self.decode(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, self.decode(e.read())
+        except (urllib.error.URLError, OSError) as e:
+            return None, {'detail': str(e)}
+
+    def decode(self, content):
+        try:
+            return json.loads(content) if content else None
+        except ValueError:
+            return None
+
+    def get_all(self, path, max_pages=10):
+        """Rows of a list endpoint, following page numbers of paginated responses"""
+        rows = []
+        for page in range(1, max_pages + 1):
+            separator = '&' if '?' in path else '?'
+            status, data = self.request('GET', f'{API_PREFIX}{path}{separator}page={page}')
+            if status != 200:
+                if page == 1:
+                    raise RuntimeError(f"GET {path} returned {status}: {data}")
+                break
+            if isinstance(data, list):
+                return data
+            rows.extend(data.get('results', []))
+            if not data.get('next'):
+                break
+        return rows
+
+
+def discover_targets(client):
+    """Course, room, faculty and section IDs the synthetic mix can use"""
+    targets = {
+        'courses': [course['id'] for course in client.get_all('/courses/')],
+        'rooms': [(room['id'], room['room']) for room in client.get_all('/rooms/')],
+        'faculty': [faculty['id'] for faculty in client.get_all('/faculty/')],
+        'sections': [section['id'] for section in client.get_all('/sections/')],
+    }
+    missing = [name for name, rows in targets.items() if not rows]
+    if missing:
+        raise RuntimeError(
+            f"The server has no {', '.join(missing)}; seed it first, e.g. with generate_campus"
+        )
+    return targets
+
+
+def synthetic_mix(targets, count, mix=None, seed=0):
+    """A reproducible list of requests: {'kind', 'method', 'path', 'body'}"""
+    rng = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    kinds = [kind for kind, weight in mix.items() if weight > 0]
+    weights = [mix[kind] for kind in kinds]
+
+    requests = []
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        day, time_range = rng.choice(DAYS), rng.choice(TIMES)
+
+        if kind == 'browse_courses':
+            # Mostly the full list, sometimes a single course
+            if rng.random() < 0.7:
+                request = {'method': 'GET', 'path': f'{API_PREFIX}/courses/'}
+            else:
+                request = {'method': 'GET', 'path': f'{API_PREFIX}/courses/{rng.choice(targets["courses"])}/'}
+        elif kind == 'poll_room_schedule':
+            _, room = rng.choice(targets['rooms'])
+            request = {'method': 'GET', 'path': f'{API_PREFIX}/rooms/{urllib.parse.quote(room)}/sections/by-day/?day={day}'}
+        elif kind == 'conflict_probe':
+            room_id, _ = rng.choice(targets['rooms'])
+            request = {'method': 'POST', 'path': f'{API_PREFIX}/conflicts/check/', 'body': {
+                'day': day,
+                'time': time_range,
+                'room': room_id,
+                'faculty_id': rng.choice(targets['faculty']),
+            }}
+        else:
+            request = {'method': 'PATCH', 'path': f'{API_PREFIX}/sections/{rng.choice(targets["sections"])}/', 'body': {
+                'day': day,
+                'time': time_range,
+            }}
+
+        request['kind'] = kind
+        requests.append(request)
+    return requests
+
+
+def load_recording(path):
+    """Requests from a JSON lines file, one {'method', 'path', 'body'?, 'kind'?} per line"""
+    requests = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: {e}")
+            if 'method' not in request or 'path' not in request:
+                raise ValueError(f"{path}:{number}: every request needs a method and a path")
+            request.setdefault('kind', f"{request['method'].upper()} {request['path'].split('?')[0]}")
+            requests.append(request)
+    return requests
+
+
+def save_recording(requests, path):
+    with open(path, 'w') as f:
+        for request in requests:
+            f.write(json.dumps(request) + '\n')
+
+
+class LoadReplay:
+    """Replay requests with a fixed number of concurrent workers"""
+
+    def __init__(self, client, requests, concurrency=8, duration=None):
+        self.client = client
+        self.requests = requests
+        self.concurrency = concurrency
+        # With a duration the requests are replayed in a loop until it is up
+        self.duration = duration
+        self.lock = threading.Lock()
+        self.results = []
+
+    def run(self):
+        self.results = []
+        self.position = 0
+        self.started = time.perf_counter()
+        workers = [threading.Thread(target=self.worker, daemon=True) for _ in range(self.concurrency)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - self.started
+        return summarize_results(self.results, elapsed, self.concurrency)
+
+    def next_request(self):
+        with self.lock:
+            if self.duration is not None:
+                if time.perf_counter() - self.started >= self.duration:
+                    return None
+                request = self.requests[self.position % len(self.requests)]
+            elif self.position < len(self.requests):
+                request = self.requests[self.position]
+            else:
+                return None
+            self.position += 1
+            return request
+
+    def worker(self):
+        while True:
+            request = self.next_request()
+            if request is None:
+                return
+            started = time.perf_counter()
+            status, _ = self.client.request(request['method'], request['path'], request.get('body'))
+            latency = time.perf_counter() - started
+            with self.lock:
+                self.results.append((request['kind'], status, latency))
+
+
+def summarize_latencies(latencies):
+    return {
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3) if latencies else None,
+        'max_ms': round(max(latencies) * 1000, 3) if latencies else None,
+    }
+
+
+def summarize_rates(statuses):
+    """Error, conflict (409) and throttle (429) rates of a list of status codes"""
+    total = len(statuses)
+    # Conflicts and throttling are expected answers under contention, not errors
+    errors = sum(1 for status in statuses if status is None or (status >= 400 and status not in (409, 429)))
+    return {
+        'error_rate': round(errors / total, 4) if total else 0.0,
+        'conflict_rate': round(statuses.count(409) / total, 4) if total else 0.0,
+        'throttled_rate': round(statuses.count(429) / total, 4) if total else 0.0,
+    }
+
+
+def summarize_results(results, elapsed, concurrency):
+    """Throughput, latency percentiles and error/409 rates overall and per request kind"""
+    statuses = [status for _, status, _ in results]
+    summary = {
+        'requests': len(results),
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(results) / elapsed, 2) if elapsed else None,
+        **summarize_latencies([latency for _, _, latency in results]),
+        **summarize_rates(statuses),
+        'status_codes': {str(status): count for status, count in sorted(
+            Counter(statuses).items(), key=lambda item: (item[0] is None, item[0] or 0)
+        )},
+        'kinds': {},
+    }
+
+    for kind in sorted({kind for kind, _, _ in results}):
+        kind_results = [(status, latency) for name, status, latency in results if name == kind]
+        summary['kinds'][kind] = {
+            'requests': len(kind_results),
+            **summarize_latencies([latency for _, latency in kind_results]),
+            **summarize_rates([status for status, _ in kind_results]),
+        }
+    return summary
@@ -0,0 +1,86 @@
+import json
+import subprocess
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.utils import timezone
+from schedules.benchmarks import Benchmark, compare_results, run_benchmarks
+
+class Command(BaseCommand):
+    help = 'Benchmarks conflict checks, list endpoints and section writes against a synthetic campus'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rooms', type=int, default=200, help='Rooms in the synthetic campus')
+        parser.add_argument('--faculty', type=int, default=300, help='Faculty in the synthetic campus')
+        parser.add_argument('--sections', type=int, default=2000, help='Sections in the synthetic campus')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the campus and the requests')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed runs per operation')
+        parser.add_argument(
+            '--only',
+            action='append',
+            choices=list(Benchmark().operations()),
+            help='Run only this operation; may be repeated'
+        )
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+
+    def handle(self, *args, **options):
+        previous = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as f:
+                    previous = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read {options['compare']}: {e}")
+
+        # Benchmark in a throwaway test database, never against real data
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            self.stdout.write(
+                f"Benchmarking {options['sections']} sections, {options['rooms']} rooms, "
+                f"{options['faculty']} faculty ({options['iterations']} iterations)..."
+            )
+            results = run_benchmarks(
+                rooms=options['rooms'],
+                faculty=options['faculty'],
+                sections=options['sections'],
+                seed=options['seed'],
+                iterations=options['iterations'],
+                only=options['only'],
+            )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        results['timestamp'] = timezone.now().isoformat()
+        results['commit'] = self.git_commit()
+
+        self.stdout.write(f"{'operation':<26} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8}  statuses")
+        for name, result in results['operations'].items():
+            statuses = ' '.join(f"{code}x{count}" for code, count in result.get('status_codes', {}).items())
+            self.stdout.write(
+                f"{name:<26} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                f"{result['p99_ms']:>9.2f} {result['queries_p50']:>8}  {statuses or '-'}"
+            )
+
+        if previous:
+            results['comparison'] = compare_results(previous, results)
+            self.stdout.write(f"\nCompared to {previous.get('commit') or options['compare']}:")
+            for name, change in results['comparison'].items():
+                p50 = change['p50_ms']['change_pct']
+                p95 = change['p95_ms']['change_pct']
+                self.stdout.write(f"{name:<26} p50 {p50:+.1f}%  p95 {p95:+.1f}%" if None not in (p50, p95) else name)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
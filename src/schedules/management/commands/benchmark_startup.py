@@ -0,0 +1,58 @@
+import json
+from django.core.management.base import CommandError
+from django.utils import timezone
+from schedules.benchmarks import compare_results, run_startup_benchmark
+from .benchmark import Command as BenchmarkCommand
+
+class Command(BenchmarkCommand):
+    help = 'Times cold starts of main.wsgi (import and warm-up) and profiles the imports'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10, help='Cold starts to time')
+        parser.add_argument('--top', type=int, default=15, help='Slowest packages and imports to list')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+
+    def handle(self, *args, **options):
+        previous = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as f:
+                    previous = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read {options['compare']}: {e}")
+
+        self.stdout.write(f"Starting main.wsgi {options['repeat']} times...")
+        try:
+            results = run_startup_benchmark(repeat=options['repeat'], top=options['top'])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        results['timestamp'] = timezone.now().isoformat()
+        results['commit'] = self.git_commit()
+
+        self.stdout.write(f"{'phase':<26} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for name, result in results['operations'].items():
+            self.stdout.write(
+                f"{name:<26} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f}"
+            )
+
+        imports = results['imports']
+        self.stdout.write(f"\nImports (one run with -X importtime, {imports['total_ms']:.1f} ms in all):")
+        for package in imports['packages']:
+            self.stdout.write(f"  {package['package']:<40} {package['ms']:>9.2f}")
+        self.stdout.write("\nSlowest imports, including what they import:")
+        for module in imports['modules']:
+            self.stdout.write(f"  {module['module']:<40} {module['cumulative_ms']:>9.2f}")
+
+        if previous:
+            results['comparison'] = compare_results(previous, results)
+            self.stdout.write(f"\nCompared to {previous.get('commit') or options['compare']}:")
+            for name, change in results['comparison'].items():
+                p50 = change['p50_ms']['change_pct']
+                p95 = change['p95_ms']['change_pct']
+                self.stdout.write(f"{name:<26} p50 {p50:+.1f}%  p95 {p95:+.1f}%" if None not in (p50, p95) else name)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
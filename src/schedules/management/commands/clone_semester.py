@@ -0,0 +1,85 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from schedules.booking import ScheduleConflict
+from schedules.models import Room, Semester
+from schedules.semesters import clone_semester
+
+class Command(BaseCommand):
+    help = 'Copies every class section of a semester into another (or a new) semester'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='ID or name of the semester to copy from')
+        parser.add_argument('target', help='ID or name of the semester to copy into; created if it does not exist')
+        parser.add_argument('--drop-faculty', action='store_true', help='Leave faculty of the copied sections unassigned')
+        parser.add_argument(
+            '--room-map',
+            action='append',
+            default=[],
+            metavar='OLD=NEW',
+            help='Move copied sections from room OLD to room NEW (room IDs or names); may be repeated'
+        )
+        parser.add_argument('--activate', action='store_true', help='Make the target the active semester')
+
+    def handle(self, *args, **options):
+        source = self.get_semester(options['source'])
+        if source is None:
+            raise CommandError(f"Semester {options['source']} does not exist")
+
+        room_map = {}
+        for mapping in options['room_map']:
+            old, separator, new = mapping.partition('=')
+            if not separator:
+                raise CommandError(f'Invalid room mapping "{mapping}", expected OLD=NEW')
+            room_map[self.get_room_id(old.strip())] = self.get_room_id(new.strip())
+
+        with transaction.atomic():
+            target = self.get_semester(options['target'])
+            if target is None:
+                target = Semester.objects.create(name=options['target'])
+                self.stdout.write(f'Created semester {target}')
+
+            try:
+                cloned, conflicts = clone_semester(
+                    source,
+                    target,
+                    drop_faculty=options['drop_faculty'],
+                    room_map=room_map
+                )
+            except ScheduleConflict as e:
+                self.write_conflicts(target, e.conflicts)
+                raise CommandError(f'Nothing cloned: the copies would double-book rooms or faculty in {target}')
+            except ValueError as e:
+                raise CommandError(str(e))
+
+            if options['activate']:
+                target.activate()
+
+        self.stdout.write(self.style.SUCCESS(f'Cloned {cloned} sections from {source} into {target}'))
+
+        self.write_conflicts(target, conflicts)
+
+    def write_conflicts(self, target, conflicts):
+        if conflicts:
+            self.stdout.write(self.style.WARNING(f'{len(conflicts)} schedule conflicts in {target}:'))
+            for conflict in conflicts:
+                other = conflict['conflicts_with']
+                self.stdout.write(
+                    f"  {conflict['type']}: {conflict['course']} {conflict['section']} ({conflict['schedule']}) "
+                    f"overlaps {other['course']} {other['section']} ({other['schedule']}) on {conflict['conflict_day']}"
+                )
+
+    def get_semester(self, value):
+        if value.isdigit():
+            return Semester.objects.filter(id=int(value)).first()
+        return Semester.objects.filter(name=value).first()
+
+    def get_room_id(self, value):
+        if value.isdigit():
+            rooms = Room.objects.filter(id=int(value))
+        else:
+            rooms = Room.objects.filter(room=value)
+
+        room_ids = list(rooms.values_list('id', flat=True)[:2])
+        if len(room_ids) != 1:
+            raise CommandError(f'Room "{value}" does not exist or is ambiguous')
+        return room_ids[0]
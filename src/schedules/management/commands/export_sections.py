@@ -0,0 +1,39 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from schedules.export import FORMATS, stream_export
+from schedules.models import Semester
+
+class Command(BaseCommand):
+    help = 'Writes every class section of a semester, with its room, faculty and department, as CSV or XLSX'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv', help='File type of the export')
+        parser.add_argument('--semester', help='ID or name of the semester to export, the active one by default')
+        parser.add_argument('--output', help='File to write to; CSV is written to standard output by default')
+
+    def handle(self, *args, **options):
+        semester = self.get_semester(options['semester'])
+        if options['format'] == 'xlsx' and not options['output']:
+            raise CommandError("--output is required for XLSX exports")
+
+        chunks = stream_export(options['format'], semester)
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+            self.stderr.write(self.style.SUCCESS(f"Exported {semester} to {options['output']}"))
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+
+    def get_semester(self, value):
+        if value is None:
+            return Semester.objects.active()
+        if value.isdigit():
+            semester = Semester.objects.filter(id=int(value)).first()
+        else:
+            semester = Semester.objects.filter(name=value).first()
+        if semester is None:
+            raise CommandError(f"Semester {value} does not exist")
+        return semester
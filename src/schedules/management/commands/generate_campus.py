@@ -0,0 +1,57 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from schedules.models import Semester
+from schedules.synthetic import CampusGenerator
+
+class Command(BaseCommand):
+    help = 'Generates a synthetic campus (rooms, faculty, courses and sections) for load tests and benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rooms', type=int, default=100, help='Number of rooms')
+        parser.add_argument('--faculty', type=int, default=200, help='Number of faculty members')
+        parser.add_argument('--sections', type=int, default=1000, help='Number of class sections')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed produces the same campus')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert')
+        parser.add_argument(
+            '--semester',
+            help='Name of the semester to generate sections into (created and activated if missing); '
+                 'defaults to the active semester'
+        )
+
+    def handle(self, *args, **options):
+        semester = None
+        if options['semester']:
+            semester, created = Semester.objects.get_or_create(name=options['semester'])
+            if created:
+                semester.activate()
+
+        self.stdout.write('Generating synthetic campus...')
+        started = time.perf_counter()
+
+        generator = CampusGenerator(
+            rooms=options['rooms'],
+            faculty=options['faculty'],
+            sections=options['sections'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+        )
+        try:
+            summary = generator.generate(semester)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {summary['sections']} sections, {summary['courses']} courses, "
+            f"{summary['rooms']} rooms and {summary['faculty']} faculty in {summary['semester']} "
+            f"in {elapsed:.1f}s"
+        ))
+        if summary['existing']:
+            self.stdout.write(
+                f"{summary['existing']} sections already exist in {summary['semester']} and were left as they are"
+            )
+        if summary['conflicts']:
+            self.stdout.write(self.style.WARNING(
+                f"{summary['conflicts']} sections could not be placed without a room conflict; "
+                f"add rooms for a conflict-free campus"
+            ))
@@ -0,0 +1,77 @@
+import csv
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from schedules.models import Semester
+from schedules.registrar import BATCH_SIZE, RegistrarImport
+
+class Command(BaseCommand):
+    help = 'Imports a registrar CSV dump of sections, creating or updating their courses, rooms, faculty and departments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='CSV file to import, or - for standard input')
+        parser.add_argument(
+            '--semester',
+            help='ID or name of the semester to import into, the active one by default; created if it does not exist'
+        )
+        parser.add_argument('--report', help='Write the skipped rows and their errors as CSV to this file')
+        parser.add_argument('--dry-run', action='store_true', help='Check the file and report without saving anything')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Rows staged per batch')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        with transaction.atomic():
+            semester = self.get_semester(options['semester'])
+            importer = RegistrarImport(semester, batch_size=options['batch_size'])
+            try:
+                if options['file'] == '-':
+                    importer.run(sys.stdin, dry_run=options['dry_run'])
+                else:
+                    with open(options['file'], newline='', encoding='utf-8-sig') as lines:
+                        importer.run(lines, dry_run=options['dry_run'])
+            except (OSError, ValueError, csv.Error) as e:
+                raise CommandError(str(e))
+            except IntegrityError as e:
+                # e.g. a section booked through the API between the checks and the upsert
+                raise CommandError(f"Nothing imported, the semester changed during the import: {e}")
+            if options['dry_run']:
+                # Also forget a semester created for the dry run
+                transaction.set_rollback(True)
+
+        counts = importer.counts
+        verb = 'Checked' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {counts['rows'] - counts['skipped']} of {counts['rows']} rows into {semester}: "
+            f"{counts['sections_created']} sections created, {counts['sections_updated']} updated; "
+            f"{counts['courses_created']} courses, {counts['rooms_created']} rooms, "
+            f"{counts['faculty_created']} faculty and {counts['departments_created']} departments created, "
+            f"{counts['faculty_updated']} faculty updated"
+        ))
+
+        if importer.errors:
+            self.stdout.write(self.style.WARNING(f"{len(importer.errors)} rows skipped"))
+            if options['report']:
+                with open(options['report'], 'w', newline='', encoding='utf-8') as report:
+                    writer = csv.writer(report)
+                    writer.writerow(['line', 'error'])
+                    writer.writerows(importer.errors)
+                self.stdout.write(f"Errors written to {options['report']}")
+            else:
+                for line, error in importer.errors:
+                    self.stdout.write(f"  line {line}: {error}")
+
+    def get_semester(self, value):
+        if value is None:
+            return Semester.objects.active()
+        if value.isdigit():
+            semester = Semester.objects.filter(id=int(value)).first()
+        else:
+            semester = Semester.objects.filter(name=value).first()
+            if semester is None:
+                semester = Semester.objects.create(name=value)
+                self.stdout.write(f'Created semester {semester}')
+        if semester is None:
+            raise CommandError(f"Semester {value} does not exist")
+        return semester
@@ -0,0 +1,12 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from schedules.sync import prune_tombstones
+
+class Command(BaseCommand):
+    help = 'Deletes the sync feed tombstones older than SYNC_TOMBSTONE_DAYS; run it daily'
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} tombstones older than {settings.SYNC_TOMBSTONE_DAYS} days"
+        ))
@@ -0,0 +1,73 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from schedules.loadtest import (
+    DEFAULT_MIX, LoadClient, LoadReplay, discover_targets, load_recording, parse_mix, save_recording, synthetic_mix
+)
+
+class Command(BaseCommand):
+    help = 'Replays a recorded or synthetic mix of API calls against a running server with concurrent workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the running server')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent workers')
+        parser.add_argument('--requests', type=int, default=1000, help='Requests in a synthetic mix')
+        parser.add_argument('--duration', type=float, help='Replay the mix in a loop for this many seconds')
+        parser.add_argument(
+            '--mix',
+            default=','.join(f'{kind}={weight}' for kind, weight in DEFAULT_MIX.items()),
+            help='Weights of the synthetic request kinds'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic mix')
+        parser.add_argument('--replay', help='JSON lines file of recorded requests to replay instead of a synthetic mix')
+        parser.add_argument('--record', help='Write the requests to this JSON lines file before replaying them')
+        parser.add_argument('--timeout', type=float, default=30, help='Timeout of one request in seconds')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency must be at least 1")
+
+        client = LoadClient(options['url'], timeout=options['timeout'])
+        try:
+            if options['replay']:
+                requests = load_recording(options['replay'])
+            else:
+                mix = parse_mix(options['mix'])
+                targets = discover_targets(client)
+                requests = synthetic_mix(targets, options['requests'], mix=mix, seed=options['seed'])
+        except (OSError, ValueError, RuntimeError) as e:
+            raise CommandError(str(e))
+
+        if not requests:
+            raise CommandError("There are no requests to replay")
+        if options['record']:
+            save_recording(requests, options['record'])
+            self.stdout.write(f"Requests written to {options['record']}")
+
+        self.stdout.write(
+            f"Replaying {len(requests)} requests against {options['url']} "
+            f"with {options['concurrency']} workers..."
+        )
+        results = LoadReplay(
+            client, requests, concurrency=options['concurrency'], duration=options['duration']
+        ).run()
+
+        self.stdout.write(
+            f"{results['requests']} requests in {results['seconds']:.2f}s "
+            f"({results['throughput_rps']} req/s), status codes {results['status_codes']}"
+        )
+        self.stdout.write(
+            f"{'kind':<26} {'requests':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'errors':>7} {'409':>7} {'429':>7}"
+        )
+        for name, result in [*results['kinds'].items(), ('total', results)]:
+            self.stdout.write(
+                f"{name:<26} {result['requests']:>8} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                f"{result['p99_ms']:>9.2f} {result['error_rate']:>7.1%} {result['conflict_rate']:>7.1%} "
+                f"{result['throttled_rate']:>7.1%}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
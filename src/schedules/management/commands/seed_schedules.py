@@ -1,5 +1,7 @@
 from django.core.management.base import BaseCommand
-from schedules.models import Course, ClassSection
+from schedules.cache import API_GENERATION, bump_generation
+from schedules.models import Course, ClassMeeting, ClassSection, Room, Semester
+from schedules.search import GENERATION as SEARCH_GENERATION
 
 class Command(BaseCommand):
     help = 'Seeds the database with initial schedule data'
@@ -101,16 +103,39 @@ class Command(BaseCommand):
             }
         ]
         
-        for course_data in courses_data:
-            course = Course.objects.create(course_code=course_data['course_code'])
-            
-            for section_data in course_data['sections']:
-                ClassSection.objects.create(
-                    course=course,
-                    section=section_data['section'],
-                    type=section_data['type'],
-                    room=section_data['room'],
-                    schedule=section_data['schedule']
-                )
+        # Create all rows with one bulk insert per table
+        courses = Course.objects.bulk_create(
+            [Course(course_code=course_data['course_code']) for course_data in courses_data]
+        )
+        
+        room_names = sorted({
+            section_data['room'] for course_data in courses_data for section_data in course_data['sections']
+        })
+        existing_rooms = {room.room: room for room in Room.objects.filter(room__in=room_names)}
+        new_rooms = [
+            # Room names start with the building, followed by the floor and room number
+            Room(room=name, floor=name.split()[-1][0])
+            for name in room_names if name not in existing_rooms
+        ]
+        Room.objects.bulk_create(new_rooms)
+        rooms = {**existing_rooms, **{room.room: room for room in new_rooms}}
+        
+        semester = Semester.objects.active()
+        sections = ClassSection.objects.bulk_create([
+            ClassSection(
+                semester=semester,
+                course=course,
+                section=section_data['section'],
+                type=section_data['type'],
+                room=rooms[section_data['room']],
+                schedule=section_data['schedule']
+            )
+            for course, course_data in zip(courses, courses_data)
+            for section_data in course_data['sections']
+        ])
+        ClassMeeting.objects.create_for_sections(sections)
+        # bulk_create sends no signals
+        bump_generation(SEARCH_GENERATION)
+        bump_generation(API_GENERATION)
         
         self.stdout.write(self.style.SUCCESS('Successfully seeded schedules data')) 
\ No newline at end of file
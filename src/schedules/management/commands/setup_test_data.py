@@ -1,7 +1,9 @@
 import random
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from schedules.models import Course, ClassSection, Department, Faculty, AdminUser
+from schedules.cache import API_GENERATION, bump_generation_on_commit
+from schedules.models import Course, ClassMeeting, ClassSection, Department, Faculty, AdminUser, Room, Semester
+from schedules.search import GENERATION as SEARCH_GENERATION
 
 class Command(BaseCommand):
     help = 'Generates initial test data for the UPCampus app'
@@ -22,145 +24,177 @@ class Command(BaseCommand):
                 # Create departments
                 self.stdout.write('Creating departments...')
                 departments = {
-                    'Biology': Department.objects.create(name='Biology'),
-                    'Computer Science': Department.objects.create(name='Computer Science'),
-                    'Mathematics': Department.objects.create(name='Mathematics'),
-                    'Statistics': Department.objects.create(name='Statistics'),
+                    department.name: department
+                    for department in Department.objects.bulk_create([
+                        Department(name='Biology'),
+                        Department(name='Computer Science'),
+                        Department(name='Mathematics'),
+                        Department(name='Statistics'),
+                    ])
                 }
                 
                 # Create courses
                 self.stdout.write('Creating courses...')
                 courses = {
-                    'CMSC 126': Course.objects.create(course_code='CMSC 126'),
-                    'CMSC 129': Course.objects.create(course_code='CMSC 129'),
-                    'MATH 101': Course.objects.create(course_code='MATH 101'),
-                    'STAT 101': Course.objects.create(course_code='STAT 101'),
-                    'BIO 101': Course.objects.create(course_code='BIO 101'),
+                    course.course_code: course
+                    for course in Course.objects.bulk_create([
+                        Course(course_code='CMSC 126'),
+                        Course(course_code='CMSC 129'),
+                        Course(course_code='MATH 101'),
+                        Course(course_code='STAT 101'),
+                        Course(course_code='BIO 101'),
+                    ])
                 }
                 
+                # Create rooms
+                self.stdout.write('Creating rooms...')
+                room_floors = {
+                    'SCI 105': '1', 'SCI 205': '2', 'SCI 305': '3',
+                    'SCI 402': '4', 'SCI 404': '4', 'SCI 405': '4',
+                }
+                existing_rooms = {room.room: room for room in Room.objects.filter(room__in=room_floors)}
+                new_rooms = Room.objects.bulk_create([
+                    Room(room=name, floor=floor) for name, floor in room_floors.items() if name not in existing_rooms
+                ])
+                rooms = {**existing_rooms, **{room.room: room for room in new_rooms}}
+                
                 # Create faculty members
                 self.stdout.write('Creating faculty members...')
-                faculty = [
-                    Faculty.objects.create(name='Alicaya, Erik', department=departments['Computer Science']),
-                    Faculty.objects.create(name='Dulaca, Ryan', department=departments['Computer Science']),
-                    Faculty.objects.create(name='Noel, Kyle', department=departments['Computer Science']),
-                    Faculty.objects.create(name='Roldan, Jace', department=departments['Computer Science']),
-                    Faculty.objects.create(name='Tan, Darmae', department=departments['Computer Science']),
-                    Faculty.objects.create(name='Dr. Santos', department=departments['Biology']),
-                    Faculty.objects.create(name='Prof. Garcia', department=departments['Mathematics']),
-                    Faculty.objects.create(name='Dr. Lee', department=departments['Statistics']),
-                ]
+                faculty = Faculty.objects.bulk_create([
+                    Faculty(name='Alicaya, Erik', email='ealicaya@up.edu.ph', department=departments['Computer Science']),
+                    Faculty(name='Dulaca, Ryan', email='rdulaca@up.edu.ph', department=departments['Computer Science']),
+                    Faculty(name='Noel, Kyle', email='knoel@up.edu.ph', department=departments['Computer Science']),
+                    Faculty(name='Roldan, Jace', email='jroldan@up.edu.ph', department=departments['Computer Science']),
+                    Faculty(name='Tan, Darmae', email='dtan@up.edu.ph', department=departments['Computer Science']),
+                    Faculty(name='Dr. Santos', email='santos@up.edu.ph', department=departments['Biology']),
+                    Faculty(name='Prof. Garcia', email='garcia@up.edu.ph', department=departments['Mathematics']),
+                    Faculty(name='Dr. Lee', email='lee@up.edu.ph', department=departments['Statistics']),
+                ])
                 
                 # Create class sections
                 self.stdout.write('Creating class sections...')
-                sections = [
+                semester = Semester.objects.active()
+                sections = ClassSection.objects.bulk_create([
                     # CMSC 126 sections
-                    ClassSection.objects.create(
+                    ClassSection(
+                        semester=semester,
                         course=courses['CMSC 126'],
                         section='A',
                         type='Lecture',
-                        room='SCI 405',
+                        room=rooms['SCI 405'],
                         schedule='M TH | 11:00 AM - 12:00 PM',
                         faculty=faculty[0]  # Alicaya, Erik
                     ),
-                    ClassSection.objects.create(
+                    ClassSection(
+                        semester=semester,
                         course=courses['CMSC 126'],
                         section='A1',
                         type='Laboratory',
-                        room='SCI 402',
+                        room=rooms['SCI 402'],
                         schedule='TH | 3:00 PM - 6:00 PM',
                         faculty=faculty[0]  # Alicaya, Erik
                     ),
-                    ClassSection.objects.create(
+                    ClassSection(
+                        semester=semester,
                         course=courses['CMSC 126'],
                         section='A2',
                         type='Laboratory',
-                        room='SCI 402',
+                        room=rooms['SCI 402'],
                         schedule='M | 3:00 PM - 6:00 PM',
                         faculty=faculty[1]  # Dulaca, Ryan
                     ),
                     
                     # CMSC 129 sections
-                    ClassSection.objects.create(
+                    ClassSection(
+                        semester=semester,
                         course=courses['CMSC 129'],
                         section='A',
                         type='Lecture',
-                        room='SCI 405',
+                        room=rooms['SCI 405'],
                         schedule='M TH | 9:00 AM - 10:00 AM',
                         faculty=faculty[2]  # Noel, Kyle
                     ),
-                    ClassSection.objects.create(
+                    ClassSection(
+                        semester=semester,
                         course=courses['CMSC 129'],
                         section='A1',
                         type='Laboratory',
-                        room='SCI 404',
+                        room=rooms['SCI 404'],
                         schedule='T | 9:00 AM - 12:00 PM',
                         faculty=faculty[3]  # Roldan, Jace
                     ),
-                    ClassSection.objects.create(
+                    ClassSection(
+                        semester=semester,
                         course=courses['CMSC 129'],
                         section='A2',
                         type='Laboratory',
-                        room='SCI 404',
+                        room=rooms['SCI 404'],
                         schedule='F | 9:00 AM - 12:00 PM',
                         faculty=faculty[4]  # Tan, Darmae
                     ),
                     
                     # Other courses
-                    ClassSection.objects.create(
+                    ClassSection(
+                        semester=semester,
                         course=courses['MATH 101'],
                         section='A',
                         type='Lecture',
-                        room='SCI 305',
+                        room=rooms['SCI 305'],
                         schedule='T F | 1:00 PM - 2:00 PM',
                         faculty=faculty[6]  # Prof. Garcia
                     ),
-                    ClassSection.objects.create(
+                    ClassSection(
+                        semester=semester,
                         course=courses['STAT 101'],
                         section='A',
                         type='Lecture',
-                        room='SCI 205',
+                        room=rooms['SCI 205'],
                         schedule='W | 10:00 AM - 12:00 PM',
                         faculty=faculty[7]  # Dr. Lee
                     ),
-                    ClassSection.objects.create(
+                    ClassSection(
+                        semester=semester,
                         course=courses['BIO 101'],
                         section='A',
                         type='Lecture',
-                        room='SCI 105',
+                        room=rooms['SCI 105'],
                         schedule='M W | 2:00 PM - 3:00 PM',
                         faculty=faculty[5]  # Dr. Santos
                     ),
-                ]
+                ])
+                ClassMeeting.objects.create_for_sections(sections)
                 
                 # Create admin users
                 self.stdout.write('Creating admin users...')
-                admin_users = [
-                    AdminUser.objects.create(
+                admin_users = AdminUser.objects.bulk_create([
+                    AdminUser(
                         name='Jennie Kim',
                         email='jennierubyjanet@gmail.com',
                         user_id='jen123',
                         password='rubyjane1@'
                     ),
-                    AdminUser.objects.create(
+                    AdminUser(
                         name='Lalisa Manoban',
                         email='lalalisa@gmail.com',
                         user_id='lalisa0327',
                         password='lalaLisa2703'
                     ),
-                    AdminUser.objects.create(
+                    AdminUser(
                         name='Rose Park',
                         email='rosie@gmail.com',
                         user_id='aptrose1@',
                         password='apateupateuRSP'
                     ),
-                    AdminUser.objects.create(
+                    AdminUser(
                         name='Jisoo Kim',
                         email='sooya@gmail.com',
                         user_id='sooya143',
                         password='hellojisoopp4'
                     ),
-                ]
+                ])
+                # bulk_create sends no signals
+                bump_generation_on_commit(SEARCH_GENERATION)
+                bump_generation_on_commit(API_GENERATION)
                 
                 self.stdout.write(self.style.SUCCESS('Successfully created test data!'))
                 
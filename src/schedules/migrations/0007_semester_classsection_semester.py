@@ -0,0 +1,69 @@
+# Generated by Django 5.1.6 on 2026-10-19 13:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def assign_current_semester(apps, schema_editor):
+    """Keep existing sections by moving them into an active semester"""
+    Semester = apps.get_model('schedules', 'Semester')
+    ClassSection = apps.get_model('schedules', 'ClassSection')
+
+    if not ClassSection.objects.exists():
+        return
+
+    semester = Semester.objects.create(name='Current Semester', is_active=True)
+    ClassSection.objects.update(semester=semester)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0006_room_alter_classsection_room'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='classsection',
+            unique_together=set(),
+        ),
+        migrations.CreateModel(
+            name='Semester',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('is_active',), name='unique_active_semester')],
+            },
+        ),
+        migrations.AddField(
+            model_name='classsection',
+            name='semester',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='class_sections', to='schedules.semester'),
+        ),
+        migrations.RunPython(assign_current_semester, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='classsection',
+            name='semester',
+            field=models.ForeignKey(blank=True, on_delete=django.db.models.deletion.CASCADE, related_name='class_sections', to='schedules.semester'),
+        ),
+        migrations.AddIndex(
+            model_name='classsection',
+            index=models.Index(fields=['semester', 'room'], name='section_semester_room_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='classsection',
+            index=models.Index(fields=['semester', 'faculty'], name='section_semester_faculty_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='classsection',
+            constraint=models.UniqueConstraint(fields=('semester', 'course', 'section'), name='unique_semester_course_section'),
+        ),
+    ]
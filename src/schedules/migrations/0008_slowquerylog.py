@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0007_semester_classsection_semester'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQueryLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('duration_ms', models.FloatField()),
+                ('database', models.CharField(max_length=50)),
+                ('sql', models.TextField()),
+                ('params', models.TextField(blank=True)),
+                ('method', models.CharField(blank=True, max_length=10)),
+                ('path', models.CharField(blank=True, max_length=255)),
+                ('view', models.CharField(blank=True, max_length=255)),
+                ('caller', models.CharField(blank=True, max_length=255)),
+                ('plan', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from schedules.utils import parse_schedule
+
+
+def create_meetings(apps, schema_editor):
+    """Derive the meetings of existing sections from their schedule strings"""
+    ClassSection = apps.get_model('schedules', 'ClassSection')
+    ClassMeeting = apps.get_model('schedules', 'ClassMeeting')
+
+    meetings = []
+    rows = ClassSection.objects.values_list('id', 'semester_id', 'room_id', 'faculty_id', 'schedule')
+    for section_id, semester_id, room_id, faculty_id, schedule in rows.iterator(chunk_size=2000):
+        parsed = parse_schedule(schedule)
+        if parsed is None:
+            continue
+        days, start, end = parsed
+        meetings.extend(
+            ClassMeeting(
+                section_id=section_id, semester_id=semester_id, room_id=room_id, faculty_id=faculty_id,
+                day=day, start_minute=start, end_minute=end
+            )
+            for day in dict.fromkeys(days)
+        )
+    ClassMeeting.objects.bulk_create(meetings, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0008_slowquerylog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassMeeting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.CharField(choices=[('M', 'Monday'), ('T', 'Tuesday'), ('W', 'Wednesday'), ('TH', 'Thursday'), ('F', 'Friday'), ('S', 'Saturday'), ('SU', 'Sunday')], max_length=2)),
+                ('start_minute', models.PositiveSmallIntegerField()),
+                ('end_minute', models.PositiveSmallIntegerField()),
+            ],
+            options={
+                'ordering': ['day', 'start_minute'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='classsection',
+            index=models.Index(fields=['semester', 'type'], name='section_semester_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['course_code'], name='course_code_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['floor'], name='room_floor_idx'),
+        ),
+        migrations.AddField(
+            model_name='classmeeting',
+            name='faculty',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='meetings', to='schedules.faculty'),
+        ),
+        migrations.AddField(
+            model_name='classmeeting',
+            name='room',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='meetings', to='schedules.room'),
+        ),
+        migrations.AddField(
+            model_name='classmeeting',
+            name='section',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='meetings', to='schedules.classsection'),
+        ),
+        migrations.AddField(
+            model_name='classmeeting',
+            name='semester',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='meetings', to='schedules.semester'),
+        ),
+        migrations.AddIndex(
+            model_name='classmeeting',
+            index=models.Index(fields=['semester', 'day', 'start_minute'], name='meeting_semester_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='classmeeting',
+            index=models.Index(fields=['semester', 'room', 'day', 'start_minute'], name='meeting_room_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='classmeeting',
+            index=models.Index(fields=['semester', 'faculty', 'day', 'start_minute'], name='meeting_faculty_day_idx'),
+        ),
+        migrations.RunPython(create_meetings, migrations.RunPython.noop),
+    ]
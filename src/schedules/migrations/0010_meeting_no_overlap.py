@@ -0,0 +1,85 @@
+from django.db import migrations
+from django.db.models import F
+
+from schedules.utils import audit_schedule_conflicts, parse_schedule
+
+# Exclusion constraints rejecting overlapping meetings of one room or one
+# faculty member on the same day of a semester. PostgreSQL only (GiST with
+# btree_gist for the equality columns); other databases rely on the row locks
+# taken by schedules.booking.write_section. Rows with no faculty never
+# conflict on faculty, since NULL = NULL is not true.
+OVERLAP_CONSTRAINTS = {
+    'meeting_room_no_overlap': 'room_id',
+    'meeting_faculty_no_overlap': 'faculty_id',
+}
+
+
+def describe(section, course_key='course'):
+    return f"{section[course_key]} {section['section']} ({section['schedule']}, {section['room']})"
+
+
+def check_existing_sections(apps):
+    """
+    Fail with a readable list of what to fix first: sections that end before
+    they start (not a valid range) and overlapping sections of a semester
+    """
+    ClassSection = apps.get_model('schedules', 'ClassSection')
+    sections = list(ClassSection.objects.values(
+        'id', 'semester_id', 'section', 'schedule', 'room_id', 'faculty_id',
+        course_code=F('course__course_code'),
+        room_name=F('room__room'),
+    ).order_by())
+
+    problems = []
+    semesters = {}
+    for section in sections:
+        section['room'] = section.pop('room_name')
+        parsed = parse_schedule(section['schedule'])
+        if parsed is not None and parsed[1] >= parsed[2]:
+            problems.append(f"{describe(section, 'course_code')} ends before it starts")
+        else:
+            semesters.setdefault(section['semester_id'], []).append(section)
+    for semester_sections in semesters.values():
+        for conflict in audit_schedule_conflicts(semester_sections):
+            problems.append(
+                f"{conflict['type'].capitalize()} conflict on {conflict['conflict_day']}: "
+                f"{describe(conflict)} and {describe(conflict['conflicts_with'])}"
+            )
+
+    if problems:
+        raise RuntimeError(
+            "Cannot add the room and faculty overlap constraints until these sections are fixed:\n"
+            + "\n".join(f"- {problem}" for problem in problems)
+        )
+
+
+def add_constraints(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    check_existing_sections(apps)
+    table = schema_editor.quote_name(apps.get_model('schedules', 'ClassMeeting')._meta.db_table)
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    for name, column in OVERLAP_CONSTRAINTS.items():
+        schema_editor.execute(
+            f'ALTER TABLE {table} ADD CONSTRAINT {schema_editor.quote_name(name)} EXCLUDE USING gist '
+            f'(semester_id WITH =, {column} WITH =, day WITH =, int4range(start_minute, end_minute) WITH &&)'
+        )
+
+
+def remove_constraints(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = schema_editor.quote_name(apps.get_model('schedules', 'ClassMeeting')._meta.db_table)
+    for name in OVERLAP_CONSTRAINTS:
+        schema_editor.execute(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {schema_editor.quote_name(name)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0009_classmeeting'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_constraints, remove_constraints),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0010_meeting_no_overlap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classsection',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='faculty',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='room',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from main.db_router import is_pinned_to_primary, replica_reads
+from .models import StaleVersion
+
+
+class ReplicaReadMixin:
+    """
+    Serve the read-only actions of a viewset from a read replica
+
+    Writes (and the conflict checks made while writing) always use the primary,
+    and so do reads from a client that wrote within the last few seconds.
+    """
+    replica_actions = ('list', 'retrieve', 'sections', 'sections_by_day', 'schedules', 'recommend')
+
+    def dispatch(self, request, *args, **kwargs):
+        action = self.action_map.get(request.method.lower())
+        if action in self.replica_actions and not is_pinned_to_primary(request):
+            with replica_reads():
+                return super().dispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'This record was changed by someone else. Reload it and try again.'
+    default_code = 'precondition_failed'
+
+
+def version_etag(obj):
+    return quote_etag(str(obj.version))
+
+
+def parse_if_match(header):
+    """ETags of an If-Match header, weak ones (from compressed responses) compared as strong"""
+    return [etag.removeprefix('W/') for etag in parse_etags(header)]
+
+
+class VersionedMixin:
+    """
+    Optimistic concurrency for a viewset of a VersionedModel
+
+    Detail and update responses carry the row's version as their ETag. An
+    update with If-Match is refused with 412 unless it names the version just
+    read by get_object(), and the write itself only applies to that version
+    (see VersionedModel), so a change made in between is never overwritten.
+    Updates without If-Match still apply, as before.
+    """
+    etag_actions = ('retrieve', 'update', 'partial_update')
+
+    def get_object(self):
+        obj = super().get_object()
+        if self.action in ('update', 'partial_update'):
+            if_match = self.request.headers.get('If-Match')
+            if if_match and if_match.strip() != '*' and version_etag(obj) not in parse_if_match(if_match):
+                raise PreconditionFailed()
+        self.versioned_object = obj
+        return obj
+
+    def handle_exception(self, exc):
+        if isinstance(exc, StaleVersion):
+            exc = PreconditionFailed()
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        obj = getattr(self, 'versioned_object', None)
+        if obj is not None and self.action in self.etag_actions and status.is_success(response.status_code):
+            response['ETag'] = version_etag(obj)
+        return response
@@ -1,9 +1,109 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.core.validators import RegexValidator
+from django.utils import timezone
+
+from .cache import API_GENERATION, bump_generation_on_commit
 
 # Create your models here.
 
-class Course(models.Model):
+class BatchedTombstonesMixin:
+    """Deletes leave the tombstones of every row they cascade to with one INSERT (see sync.py)"""
+
+    def delete(self, using=None, keep_parents=False):
+        from .sync import batch_tombstones
+
+        using = using or router.db_for_write(self.__class__, instance=self)
+        with batch_tombstones(using):
+            return super().delete(using=using, keep_parents=keep_parents)
+
+
+class SemesterManager(models.Manager):
+    DEFAULT_NAME = 'Current Semester'
+
+    def active(self):
+        """Return the active semester, creating the first one on a fresh database"""
+        semester = self.filter(is_active=True).first()
+        if semester is None:
+            semester, _ = self.get_or_create(name=self.DEFAULT_NAME)
+            semester.activate()
+        return semester
+
+
+class Semester(BatchedTombstonesMixin, models.Model):
+    """Model representing an academic term that class sections belong to"""
+    name = models.CharField(max_length=50, unique=True)  # e.g. "1st Semester AY 2025-2026"
+    start_date = models.DateField(null=True, blank=True)
+    end_date = models.DateField(null=True, blank=True)
+    is_active = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = SemesterManager()
+
+    def __str__(self):
+        return self.name
+
+    def activate(self):
+        """
+        Make this the active semester. Only the semester pointer rows are
+        updated; sections of the previous term are kept as history.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            Semester.objects.filter(is_active=True).exclude(pk=self.pk).update(is_active=False, updated_at=now)
+            Semester.objects.filter(pk=self.pk).update(is_active=True, updated_at=now)
+            # Responses for the default semester change with it
+            bump_generation_on_commit(API_GENERATION)
+        self.is_active = True
+        self.updated_at = now
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['is_active'],
+                condition=models.Q(is_active=True),
+                name='unique_active_semester'
+            ),
+        ]
+
+
+class StaleVersion(Exception):
+    """A versioned row was changed by someone else since it was read"""
+
+
+class VersionedModel(models.Model):
+    """
+    Model with a version counter for optimistic concurrency control
+
+    Every update of a saved instance is a single conditional
+    ``UPDATE ... SET version = version + 1 WHERE id = %s AND version = %s``
+    using the version the instance was read with. If another writer got there
+    first no row matches and StaleVersion is raised instead of silently
+    overwriting their change. Raw SQL writers bump the column themselves.
+    """
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        version_field = self._meta.get_field('version')
+        values = [(field, model, value) for field, model, value in values if field is not version_field]
+        values.append((version_field, None, self.version + 1))
+
+        updated = super()._do_update(
+            base_qs.filter(version=self.version), using, pk_val, values, update_fields, forced_update
+        )
+        if updated:
+            self.version += 1
+        elif base_qs.filter(pk=pk_val).exists():
+            raise StaleVersion(f"{self._meta.verbose_name} {pk_val} was changed since version {self.version}")
+        # Otherwise the row was deleted and save() goes on to insert it, as usual
+        return updated
+
+
+class Course(BatchedTombstonesMixin, models.Model):
     """Model representing a course"""
     course_code = models.CharField(max_length=20, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -14,20 +114,31 @@ class Course(models.Model):
 
     class Meta:
         ordering = ['course_code']
+        indexes = [
+            models.Index(fields=['updated_at'], name='course_updated_at_idx'),
+            # Prefix searches (course_code LIKE 'CMSC%') on PostgreSQL need the
+            # pattern operator class; other databases ignore it
+            models.Index(fields=['course_code'], name='course_code_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ]
 
 
-class Department(models.Model):
+class Department(BatchedTombstonesMixin, models.Model):
     """Model representing an academic department"""
     name = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.name
     
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['updated_at'], name='department_updated_at_idx'),
+        ]
 
 
-class Room(models.Model):
+class Room(BatchedTombstonesMixin, VersionedModel):
     """Model representing a room"""
     room = models.CharField(max_length=50)
     floor = models.CharField(max_length=20)
@@ -40,9 +151,13 @@ class Room(models.Model):
     class Meta:
         ordering = ['room']
         unique_together = ['room', 'floor']
+        indexes = [
+            models.Index(fields=['floor'], name='room_floor_idx'),
+            models.Index(fields=['updated_at'], name='room_updated_at_idx'),
+        ]
 
 
-class Faculty(models.Model):
+class Faculty(BatchedTombstonesMixin, VersionedModel):
     """Model representing a faculty member or professor"""
     name = models.CharField(max_length=100)
     email = models.EmailField(
@@ -65,6 +180,9 @@ class Faculty(models.Model):
     class Meta:
         verbose_name_plural = "Faculty"
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['updated_at'], name='faculty_updated_at_idx'),
+        ]
 
 
 class AdminUser(models.Model):
@@ -85,7 +203,15 @@ class AdminUser(models.Model):
         ordering = ['name']
 
 
-class ClassSection(models.Model):
+class ClassSectionQuerySet(models.QuerySet):
+    def for_semester(self, semester=None):
+        """Sections of the given semester (instance or id), the active semester by default"""
+        if semester is None:
+            return self.filter(semester__is_active=True)
+        return self.filter(semester=semester)
+
+
+class ClassSection(VersionedModel):
     """Model representing a class section of a course"""
     LECTURE = 'Lecture'
     LABORATORY = 'Laboratory'
@@ -95,6 +221,8 @@ class ClassSection(models.Model):
         (LABORATORY, 'Laboratory'),
     ]
     
+    # Left empty, save() puts a new section in the active semester
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='class_sections', blank=True)
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='sections')
     section = models.CharField(max_length=10)
     type = models.CharField(max_length=20, choices=SECTION_TYPE_CHOICES, default=LECTURE)
@@ -104,9 +232,172 @@ class ClassSection(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ClassSectionQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.course.course_code} - {self.section} ({self.type})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        section = super().from_db(db, field_names, values)
+        # Room and faculty as loaded, so change events can tell where a section moved from
+        section._loaded_placement = (section.__dict__.get('room_id'), section.__dict__.get('faculty_id'))
+        return section
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        adding = self._state.adding and self.pk is None
+        with transaction.atomic(savepoint=False):
+            if self.semester_id is None:
+                self.semester = Semester.objects.active()
+            super().save(*args, **kwargs)
+            if adding:
+                # A new section has no meetings to replace yet
+                ClassMeeting.objects.create_for_sections([self])
+            elif update_fields is None or set(update_fields) & ClassMeeting.SYNCED_FIELDS:
+                ClassMeeting.objects.rebuild_for_sections([self])
     
     class Meta:
         ordering = ['course', 'section']
-        unique_together = ['course', 'section']
+        # Every index leads with the semester so queries on the current term
+        # only touch that term's rows, however much history accumulates.
+        constraints = [
+            models.UniqueConstraint(fields=['semester', 'course', 'section'], name='unique_semester_course_section'),
+        ]
+        indexes = [
+            models.Index(fields=['semester', 'room'], name='section_semester_room_idx'),
+            models.Index(fields=['semester', 'faculty'], name='section_semester_faculty_idx'),
+            models.Index(fields=['semester', 'type'], name='section_semester_type_idx'),
+            # The sync feed (sync.py) reads recent changes across all terms
+            models.Index(fields=['updated_at'], name='section_updated_at_idx'),
+        ]
+
+
+
+class ClassMeetingManager(models.Manager):
+    def meetings_for(self, section_rows):
+        """Unsaved meetings for (id, semester_id, room_id, faculty_id, schedule) rows"""
+        from .utils import parse_schedule
+
+        for section_id, semester_id, room_id, faculty_id, schedule in section_rows:
+            parsed = parse_schedule(schedule)
+            if parsed is None:
+                continue
+            days, start, end = parsed
+            for day in dict.fromkeys(days):
+                yield ClassMeeting(
+                    section_id=section_id,
+                    semester_id=semester_id,
+                    room_id=room_id,
+                    faculty_id=faculty_id,
+                    day=day,
+                    start_minute=start,
+                    end_minute=end,
+                )
+
+    def create_for_sections(self, sections, batch_size=1000):
+        """
+        Create the meetings of sections that were written without save(),
+        e.g. with bulk_create. ``sections`` is a queryset or a list of sections.
+        """
+        if isinstance(sections, models.QuerySet):
+            rows = sections.values_list('id', 'semester_id', 'room_id', 'faculty_id', 'schedule').iterator(batch_size)
+        else:
+            rows = ((s.pk, s.semester_id, s.room_id, s.faculty_id, s.schedule) for s in sections)
+
+        meetings = []
+        for meeting in self.meetings_for(rows):
+            meetings.append(meeting)
+            if len(meetings) == batch_size:
+                self.bulk_create(meetings)
+                meetings = []
+        if meetings:
+            self.bulk_create(meetings)
+
+    def rebuild_for_sections(self, sections):
+        """Replace the meetings of the given sections after their schedules changed"""
+        with transaction.atomic(savepoint=False):
+            self.filter(section__in=[section.pk for section in sections]).delete()
+            self.create_for_sections(sections)
+
+
+class ClassMeeting(models.Model):
+    """
+    One weekly meeting of a class section, derived from its schedule string.
+
+    "M TH | 11:00 AM - 12:00 PM" becomes two rows (M and TH, 660-720). Room,
+    faculty and semester are copied from the section so that filters and
+    conflict checks are plain indexed range predicates instead of LIKE scans
+    over the schedule text. Rows are rebuilt by ClassSection.save(); code that
+    writes sections in bulk calls ClassMeeting.objects.create_for_sections().
+    On PostgreSQL, exclusion constraints (migration 0010) reject overlapping
+    meetings of a room or faculty member; see booking.py.
+    """
+    DAY_CHOICES = [
+        ('M', 'Monday'),
+        ('T', 'Tuesday'),
+        ('W', 'Wednesday'),
+        ('TH', 'Thursday'),
+        ('F', 'Friday'),
+        ('S', 'Saturday'),
+        ('SU', 'Sunday'),
+    ]
+    # Section fields the meetings depend on
+    SYNCED_FIELDS = {'schedule', 'semester', 'semester_id', 'room', 'room_id', 'faculty', 'faculty_id'}
+
+    section = models.ForeignKey(ClassSection, on_delete=models.CASCADE, related_name='meetings')
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='meetings')
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='meetings')
+    faculty = models.ForeignKey(Faculty, on_delete=models.SET_NULL, null=True, blank=True, related_name='meetings')
+    day = models.CharField(max_length=2, choices=DAY_CHOICES)
+    start_minute = models.PositiveSmallIntegerField()  # minutes after midnight
+    end_minute = models.PositiveSmallIntegerField()
+
+    objects = ClassMeetingManager()
+
+    def __str__(self):
+        return f"{self.section_id} {self.day} {self.start_minute}-{self.end_minute}"
+
+    class Meta:
+        ordering = ['day', 'start_minute']
+        indexes = [
+            models.Index(fields=['semester', 'day', 'start_minute'], name='meeting_semester_day_idx'),
+            models.Index(fields=['semester', 'room', 'day', 'start_minute'], name='meeting_room_day_idx'),
+            models.Index(fields=['semester', 'faculty', 'day', 'start_minute'], name='meeting_faculty_day_idx'),
+        ]
+
+
+class Tombstone(models.Model):
+    """A deleted row of a model in the sync feed, so clients can delete their copy too (see sync.py)"""
+    model = models.CharField(max_length=20)  # Name of the feed, e.g. "sections"
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.model} {self.object_id}"
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_at_idx'),
+        ]
+
+
+class SlowQueryLog(models.Model):
+    """A query of the schedules app that ran longer than SLOW_QUERY_MS, with its plan"""
+    created_at = models.DateTimeField(auto_now_add=True)
+    duration_ms = models.FloatField()
+    database = models.CharField(max_length=50)
+    sql = models.TextField()
+    params = models.TextField(blank=True)
+    method = models.CharField(max_length=10, blank=True)
+    path = models.CharField(max_length=255, blank=True)
+    view = models.CharField(max_length=255, blank=True)  # e.g. "schedules.views.ScheduleConflictView"
+    caller = models.CharField(max_length=255, blank=True)  # e.g. "schedules/utils.py:52 in check_schedule_conflicts"
+    plan = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.duration_ms:.1f} ms in {self.view or self.caller}"
+
+    class Meta:
+        ordering = ['-created_at', '-id']
@@ -0,0 +1,180 @@
+"""
+Free rooms for a new section, ranked by how well they fit it.
+
+The meetings of the semester on the requested days are read once into an
+occupancy index (room -> day -> busy intervals), next to the mix of section
+types each room holds. Every room is then checked and scored in memory, so
+the cost is a few queries whatever the number of rooms; nothing is probed
+with check_schedule_conflicts room by room.
+
+A room's type is inferred from its use: a room holding mostly laboratories is
+a laboratory room. A free room scores
+- TYPE_WEIGHT if its type matches the section's, half of it if it is unused
+- BUILDING_WEIGHT in the building of the course's other sections (the room
+  name's prefix, "SCI" of "SCI 402") and FLOOR_WEIGHT on the requested floor,
+  or without one on a floor of the course's other sections
+- ADJACENT_WEIGHT for each side of the meeting right next to another class
+- minus FRAGMENT_WEIGHT per hour of gaps it leaves shorter than
+  MIN_USEFUL_GAP minutes, which no other class fits into
+Adjacency and gaps are averaged over the meeting's days.
+"""
+
+import re
+from collections import Counter, defaultdict
+
+from django.db.models import Count
+
+from .analytics import campus_hours
+from .models import ClassMeeting, ClassSection, Room
+
+TYPE_WEIGHT = 4
+BUILDING_WEIGHT = 2
+FLOOR_WEIGHT = 1
+ADJACENT_WEIGHT = 0.5
+FRAGMENT_WEIGHT = 1
+MIN_USEFUL_GAP = 60
+
+BUILDING_PATTERN = re.compile(r'[^\d\s-]+')
+
+
+def building_of(room_name):
+    """Building of a room from its name's prefix, e.g. 'SCI 402' -> 'SCI'"""
+    match = BUILDING_PATTERN.match(room_name.strip())
+    return match.group().upper() if match else ''
+
+
+def semester_filter(semester):
+    """Filter on a semester (instance or ID), the active one if None"""
+    if semester is None:
+        return {'semester__is_active': True}
+    return {'semester': semester}
+
+
+def occupancy_index(semester, days):
+    """{room ID: {day: sorted [(start minute, end minute), ...]}} of the meetings on the given days"""
+    index = defaultdict(lambda: defaultdict(list))
+    meetings = (
+        ClassMeeting.objects
+        .filter(day__in=days, **semester_filter(semester))
+        .order_by('start_minute')
+        .values_list('room_id', 'day', 'start_minute', 'end_minute')
+    )
+    for room_id, day, start, end in meetings:
+        index[room_id][day].append((start, end))
+    return index
+
+
+def room_types(semester):
+    """{room ID: the type most of its sections are}, for rooms with a clear majority"""
+    counts = defaultdict(Counter)
+    rows = (
+        ClassSection.objects
+        .filter(**semester_filter(semester))
+        .values('room_id', 'type')
+        .order_by()
+        .annotate(count=Count('id'))
+    )
+    for row in rows:
+        counts[row['room_id']][row['type']] = row['count']
+
+    types = {}
+    for room_id, counter in counts.items():
+        (first, first_count), *rest = counter.most_common(2)
+        if not rest or first_count > rest[0][1]:
+            types[room_id] = first
+    return types
+
+
+def fit(busy, start, end, day_start, day_end):
+    """
+    How a meeting fits one day of a room
+
+    Returns:
+    - None if it overlaps a booking, else (sides touching a booking, minutes of gaps too short to use)
+    """
+    before, after = min(day_start, start), max(day_end, end)
+    touching_before = touching_after = False
+    for busy_start, busy_end in busy:
+        if busy_start < end and start < busy_end:
+            return None
+        if busy_end <= start and busy_end >= before:
+            before, touching_before = busy_end, True
+        elif busy_start >= end and busy_start <= after:
+            after, touching_after = busy_start, True
+
+    gaps = (start - before, after - end)
+    adjacent = (touching_before and gaps[0] == 0) + (touching_after and gaps[1] == 0)
+    wasted = sum(gap for gap in gaps if 0 < gap < MIN_USEFUL_GAP)
+    return adjacent, wasted
+
+
+def recommend_rooms(days, start, end, section_type=None, floor=None, course_code=None, semester=None, limit=10):
+    """
+    Free rooms for a meeting, best fit first
+
+    Parameters:
+    - days: Day abbreviations the section meets on, e.g. ['M', 'TH']
+    - start, end: Meeting time in minutes after midnight
+    - section_type: Optional ClassSection type the room should suit
+    - floor: Optional floor to prefer
+    - course_code: Optional course whose other sections' buildings and floors are preferred
+    - semester: Semester (instance or ID), the active one by default
+    - limit: Number of rooms to return
+
+    Returns:
+    - List of dicts with each room, its inferred type, its score and what it was scored on
+    """
+    _, day_start, day_end = campus_hours()
+    index = occupancy_index(semester, days)
+    types = room_types(semester)
+
+    course_buildings, course_floors = set(), set()
+    if course_code:
+        placements = (
+            ClassSection.objects
+            .filter(course__course_code=course_code, **semester_filter(semester))
+            .values_list('room__room', 'room__floor')
+        )
+        for room_name, room_floor in placements:
+            course_buildings.add(building_of(room_name))
+            course_floors.add(room_floor)
+    preferred_floors = {floor} if floor else course_floors
+
+    recommendations = []
+    for room_id, name, room_floor in Room.objects.values_list('id', 'room', 'floor'):
+        busy = index.get(room_id, {})
+        fits = [fit(busy.get(day, ()), start, end, day_start, day_end) for day in days]
+        if None in fits:
+            continue
+
+        room_type = types.get(room_id)
+        type_match = None if room_type is None or section_type is None else room_type == section_type
+        building = building_of(name)
+        same_building = building in course_buildings
+        same_floor = room_floor in preferred_floors
+        adjacent = sum(sides for sides, _ in fits) / len(days)
+        wasted = sum(minutes for _, minutes in fits) / len(days)
+
+        score = (
+            (TYPE_WEIGHT if type_match else TYPE_WEIGHT / 2 if type_match is None and section_type else 0)
+            + BUILDING_WEIGHT * same_building
+            + FLOOR_WEIGHT * same_floor
+            + ADJACENT_WEIGHT * adjacent
+            - FRAGMENT_WEIGHT * wasted / 60
+        )
+        recommendations.append({
+            'id': room_id,
+            'room': name,
+            'floor': room_floor,
+            'building': building,
+            'type': room_type,
+            'score': round(score, 3),
+            'type_match': type_match,
+            'same_building': same_building,
+            'same_floor': same_floor,
+            'adjacent_sides': round(adjacent, 2),
+            'wasted_minutes': round(wasted),
+        })
+
+    recommendations.sort(key=lambda room: (-room['score'], room['room']))
+    return recommendations[:limit]
@@ -0,0 +1,496 @@
+"""
+Bulk import of registrar CSV dumps.
+
+Rows are checked one by one while the file is read and streamed into two
+staging tables (``COPY`` on PostgreSQL, batched inserts elsewhere): one row per
+CSV line and one per weekly meeting. Everything after that is a handful of
+set-based statements over the staging tables: duplicates, unknown faculty and
+room or faculty conflicts (within the file and with the rest of the semester)
+are marked as row errors, then departments, rooms, faculty, courses and
+sections are upserted by their natural keys from the rows left. A bad row is
+reported and skipped; it never aborts the rest of the load.
+"""
+
+import csv
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import API_GENERATION, bump_generation, bump_generation_on_commit
+from . import events
+from .models import ClassMeeting, ClassSection, Course, Department, Faculty, Room
+from .search import GENERATION as SEARCH_GENERATION
+from .sync import restamp
+from .utils import format_schedule, normalize_day, parse_schedule
+
+STAGING_TABLE = 'schedules_registrar_staging'
+STAGING_MEETING_TABLE = 'schedules_registrar_staging_meeting'
+BATCH_SIZE = 2000
+
+# Normalized CSV header -> staging column. The export's own header is accepted,
+# so an exported semester can be imported again.
+HEADERS = {
+    'course': 'course',
+    'course_code': 'course',
+    'section': 'section',
+    'type': 'type',
+    'schedule': 'schedule',
+    'days': 'days',
+    'start': 'start',
+    'end': 'end',
+    'room': 'room',
+    'floor': 'floor',
+    'faculty': 'faculty',
+    'faculty_name': 'faculty',
+    'faculty_email': 'email',
+    'email': 'email',
+    'department': 'department',
+}
+REQUIRED = ('course', 'section', 'room', 'floor')
+
+# Staging column -> model field whose max_length it must fit
+LENGTHS = {
+    'course': Course._meta.get_field('course_code'),
+    'section': ClassSection._meta.get_field('section'),
+    'schedule': ClassSection._meta.get_field('schedule'),
+    'room': Room._meta.get_field('room'),
+    'floor': Room._meta.get_field('floor'),
+    'faculty': Faculty._meta.get_field('name'),
+    'department': Department._meta.get_field('name'),
+}
+TYPES = {value.lower(): value for value, _ in ClassSection.SECTION_TYPE_CHOICES}
+
+STAGING_COLUMNS = (
+    'line', 'course', 'section', 'type', 'schedule', 'room', 'floor', 'faculty', 'email', 'department', 'error',
+)
+MEETING_COLUMNS = ('line', 'day', 'start_minute', 'end_minute', 'room', 'floor', 'email')
+
+
+def normalize_header(name):
+    return '_'.join((name or '').strip().lower().split())
+
+
+def clean_row(values):
+    """
+    Staging values of one CSV row (a dict of staging column -> text) and its
+    meetings as (day, start minute, end minute). Raises ValueError with the
+    reason the row cannot be imported.
+    """
+    values = {column: ' '.join(value.split()) for column, value in values.items()}
+    missing = [column for column in REQUIRED if not values.get(column)]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}")
+    values['course'] = values['course'].upper()
+
+    schedule = values.get('schedule')
+    if not schedule and values.get('days'):
+        schedule = f"{values['days']} | {values.get('start', '')} - {values.get('end', '')}"
+    parsed = parse_schedule(schedule)
+    if parsed is None:
+        raise ValueError(f'Invalid schedule "{schedule}", expected e.g. "M TH | 11:00 AM - 12:00 PM"')
+    days, start, end = parsed
+    days = [normalize_day(day) for day in days]
+    if None in days:
+        raise ValueError(f'Invalid day in schedule "{schedule}"')
+    if start >= end:
+        raise ValueError(f'Schedule "{schedule}" ends before it starts')
+    days = list(dict.fromkeys(days))
+    values['schedule'] = format_schedule(days, start, end)
+
+    section_type = TYPES.get((values.get('type') or ClassSection.LECTURE).lower())
+    if section_type is None:
+        raise ValueError(f"Invalid type \"{values['type']}\", expected {' or '.join(TYPES.values())}")
+    values['type'] = section_type
+
+    for column, field in LENGTHS.items():
+        if len(values.get(column) or '') > field.max_length:
+            raise ValueError(f"{column.capitalize()} is longer than {field.max_length} characters")
+
+    if values.get('email'):
+        try:
+            Faculty._meta.get_field('email').run_validators(values['email'])
+        except ValidationError as e:
+            raise ValueError(f"Invalid faculty email \"{values['email']}\": {' '.join(e.messages)}")
+
+    return values, [(day, start, end) for day in days]
+
+
+class RegistrarImport:
+    """
+    Import of one registrar CSV file into a semester. Sections already in the
+    semester (same course and section name) are updated, others are created;
+    sections missing from the file are left alone.
+
+    After run(), ``counts`` holds what was read, created and updated and
+    ``errors`` the (line, message) of every row that was skipped.
+    """
+
+    def __init__(self, semester, batch_size=BATCH_SIZE):
+        self.semester = semester
+        self.batch_size = batch_size
+        self.counts = {}
+        self.errors = []
+        self.quote = connection.ops.quote_name
+
+    def run(self, lines, dry_run=False):
+        """Import CSV text lines (e.g. an open file); with dry_run nothing is kept but the report"""
+        reader = csv.DictReader(lines)
+        columns = {normalize_header(name): HEADERS[normalize_header(name)]
+                   for name in reader.fieldnames or [] if normalize_header(name) in HEADERS}
+        present = set(columns.values())
+        missing = [column for column in REQUIRED if column not in present]
+        if 'schedule' not in present and not {'days', 'start', 'end'} <= present:
+            missing.append('schedule (or days, start and end)')
+        if missing:
+            raise ValueError(f"CSV header is missing {', '.join(missing)}")
+
+        stamp = timezone.now()
+        now = ClassSection._meta.get_field('updated_at').get_db_prep_value(stamp, connection)
+        with transaction.atomic(), connection.cursor() as cursor:
+            self.create_staging_tables(cursor)
+            self.counts['rows'] = self.stage(cursor, reader, columns)
+            self.validate(cursor)
+            self.upsert(cursor, now)
+            bump_generation_on_commit(API_GENERATION)
+            self.errors = self.fetch_errors(cursor)
+            self.drop_staging_tables(cursor)
+            # The load may have taken longer than the sync feed looks back
+            restamp(cursor, [Department, Room, Faculty, Course, ClassSection], stamp)
+            if dry_run:
+                transaction.set_rollback(True)
+
+        self.counts['skipped'] = len(self.errors)
+        if not dry_run and self.counts['rows'] > self.counts['skipped']:
+            bump_generation(SEARCH_GENERATION)
+            # Raw SQL sends no signals, so displays are told to reload instead
+            semester_id = self.semester.pk
+            transaction.on_commit(lambda: events.publish(events.reload_event(semester_id)), robust=True)
+        return self
+
+    def create_staging_tables(self, cursor):
+        staging, meetings = self.quote(STAGING_TABLE), self.quote(STAGING_MEETING_TABLE)
+        self.drop_staging_tables(cursor)
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {staging} (line integer PRIMARY KEY, course text, section text, type text, "
+            f"schedule text, room text, floor text, faculty text, email text, department text, error text, "
+            f"course_id integer, room_id integer, faculty_id integer, section_id integer)"
+        )
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {meetings} (line integer, day text, start_minute integer, end_minute integer, "
+            f"room text, floor text, email text)"
+        )
+
+    def drop_staging_tables(self, cursor):
+        for table in (STAGING_TABLE, STAGING_MEETING_TABLE):
+            cursor.execute(f"DROP TABLE IF EXISTS {self.quote(table)}")
+
+    def stage(self, cursor, reader, columns):
+        """Check each row and write it, with its meetings, to the staging tables; returns the number of rows"""
+        rows, meetings, count = [], [], 0
+        for row in reader:
+            count += 1
+            values = {column: '' for column in HEADERS.values()}
+            for name, value in row.items():
+                column = columns.get(normalize_header(name))
+                if column and isinstance(value, str):
+                    values[column] = value
+            try:
+                values, row_meetings = clean_row(values)
+            except ValueError as e:
+                rows.append((reader.line_num, *[''] * (len(STAGING_COLUMNS) - 2), str(e)))
+            else:
+                rows.append((reader.line_num, *[values[column] for column in STAGING_COLUMNS[1:-1]], None))
+                meetings.extend(
+                    (reader.line_num, day, start, end, values['room'], values['floor'], values['email'])
+                    for day, start, end in row_meetings
+                )
+
+            if len(rows) >= self.batch_size:
+                self.write(cursor, STAGING_TABLE, STAGING_COLUMNS, rows)
+                self.write(cursor, STAGING_MEETING_TABLE, MEETING_COLUMNS, meetings)
+                rows, meetings = [], []
+
+        self.write(cursor, STAGING_TABLE, STAGING_COLUMNS, rows)
+        self.write(cursor, STAGING_MEETING_TABLE, MEETING_COLUMNS, meetings)
+
+        staging, meeting_table = self.quote(STAGING_TABLE), self.quote(STAGING_MEETING_TABLE)
+        cursor.execute(f"CREATE INDEX {self.quote(STAGING_TABLE + '_key')} ON {staging} (course, section)")
+        cursor.execute(f"CREATE INDEX {self.quote(STAGING_TABLE + '_email')} ON {staging} (email)")
+        cursor.execute(
+            f"CREATE INDEX {self.quote(STAGING_MEETING_TABLE + '_room')} ON {meeting_table} (day, room, floor)"
+        )
+        cursor.execute(f"CREATE INDEX {self.quote(STAGING_MEETING_TABLE + '_email')} ON {meeting_table} (day, email)")
+        return count
+
+    def write(self, cursor, table, columns, rows):
+        if not rows:
+            return
+        column_list = ', '.join(self.quote(column) for column in columns)
+        if connection.vendor == 'postgresql':
+            with cursor.copy(f"COPY {self.quote(table)} ({column_list}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+        else:
+            placeholders = ', '.join(['%s'] * len(columns))
+            cursor.executemany(f"INSERT INTO {self.quote(table)} ({column_list}) VALUES ({placeholders})", rows)
+
+    def table(self, model):
+        return self.quote(model._meta.db_table)
+
+    def column(self, model, name):
+        return self.quote(model._meta.get_field(name).column)
+
+    def mark(self, cursor, errors):
+        """Record the first error of each (line, message) pair on rows that have none yet"""
+        first = {}
+        for line, message in errors:
+            first.setdefault(line, message)
+        cursor.executemany(
+            f"UPDATE {self.quote(STAGING_TABLE)} SET error = %s WHERE line = %s AND error IS NULL",
+            [(message, line) for line, message in first.items()]
+        )
+
+    def validate(self, cursor):
+        """Set-based checks marking rows that cannot be imported"""
+        staging = self.quote(STAGING_TABLE)
+        meetings = self.quote(STAGING_MEETING_TABLE)
+        faculty = self.table(Faculty)
+        faculty_email = self.column(Faculty, 'email')
+
+        # The same section twice in the file: the first row wins
+        cursor.execute(
+            f"SELECT later.line, MIN(earlier.line) FROM {staging} later JOIN {staging} earlier "
+            f"ON earlier.course = later.course AND earlier.section = later.section AND earlier.line < later.line "
+            f"WHERE later.error IS NULL AND earlier.error IS NULL GROUP BY later.line"
+        )
+        self.mark(cursor, [(line, f"Duplicate of line {first}") for line, first in cursor.fetchall()])
+
+        # One faculty member listed with different names or departments
+        cursor.execute(
+            f"SELECT later.line, MIN(earlier.line) FROM {staging} later JOIN {staging} earlier "
+            f"ON earlier.email = later.email AND earlier.line < later.line "
+            f"AND ((earlier.faculty <> later.faculty AND earlier.faculty <> '' AND later.faculty <> '') "
+            f"OR (earlier.department <> later.department AND earlier.department <> '' AND later.department <> '')) "
+            f"WHERE later.email <> '' AND later.error IS NULL AND earlier.error IS NULL GROUP BY later.line"
+        )
+        self.mark(cursor, [
+            (line, f"Faculty listed with another name or department on line {first}")
+            for line, first in cursor.fetchall()
+        ])
+
+        # New faculty need a name and a department somewhere in the file
+        cursor.execute(
+            f"SELECT staged.line, staged.email FROM {staging} staged WHERE staged.error IS NULL "
+            f"AND staged.email <> '' AND NOT EXISTS (SELECT 1 FROM {faculty} f WHERE f.{faculty_email} = staged.email) "
+            f"AND NOT EXISTS (SELECT 1 FROM {staging} other WHERE other.email = staged.email "
+            f"AND other.faculty <> '' AND other.department <> '' AND other.error IS NULL)"
+        )
+        self.mark(cursor, [
+            (line, f"Faculty {email} does not exist; give their name and department")
+            for line, email in cursor.fetchall()
+        ])
+
+        self.mark(cursor, self.existing_conflicts(cursor, staging, meetings))
+        self.mark(cursor, self.file_conflicts(cursor, staging, meetings))
+
+    def existing_conflicts(self, cursor, staging, meetings):
+        """Rows overlapping a meeting of a section of the semester that the file does not replace"""
+        class_meetings = self.table(ClassMeeting)
+        sections = self.table(ClassSection)
+        courses = self.table(Course)
+        m = {name: self.column(ClassMeeting, name) for name in ('section', 'semester', 'room', 'faculty', 'day',
+                                                                  'start_minute', 'end_minute')}
+        replaced = (
+            f"NOT EXISTS (SELECT 1 FROM {staging} replacing WHERE replacing.course = c.{self.column(Course, 'course_code')} "
+            f"AND replacing.section = s.{self.column(ClassSection, 'section')} AND replacing.error IS NULL)"
+        )
+        overlap = (
+            f"existing.{m['semester']} = %s AND existing.{m['day']} = staged.day "
+            f"AND existing.{m['start_minute']} < staged.end_minute AND staged.start_minute < existing.{m['end_minute']}"
+        )
+        joins = (
+            f"JOIN {sections} s ON s.{self.quote('id')} = existing.{m['section']} "
+            f"JOIN {courses} c ON c.{self.quote('id')} = s.{self.column(ClassSection, 'course')} "
+            f"JOIN {staging} staged_row ON staged_row.line = staged.line AND staged_row.error IS NULL"
+        )
+        cursor.execute(
+            f"SELECT staged.line, 'room', staged.day, c.{self.column(Course, 'course_code')}, "
+            f"s.{self.column(ClassSection, 'section')} FROM {meetings} staged "
+            f"JOIN {self.table(Room)} r ON r.{self.column(Room, 'room')} = staged.room "
+            f"AND r.{self.column(Room, 'floor')} = staged.floor "
+            f"JOIN {class_meetings} existing ON existing.{m['room']} = r.{self.quote('id')} AND {overlap} "
+            f"{joins} WHERE {replaced} "
+            f"UNION ALL "
+            f"SELECT staged.line, 'faculty', staged.day, c.{self.column(Course, 'course_code')}, "
+            f"s.{self.column(ClassSection, 'section')} FROM {meetings} staged "
+            f"JOIN {self.table(Faculty)} f ON f.{self.column(Faculty, 'email')} = staged.email "
+            f"JOIN {class_meetings} existing ON existing.{m['faculty']} = f.{self.quote('id')} AND {overlap} "
+            f"{joins} WHERE staged.email <> '' AND {replaced} "
+            f"ORDER BY 1",
+            [self.semester.pk, self.semester.pk]
+        )
+        return [
+            (line, f"{kind.capitalize()} conflict on {day} with {course} {section}")
+            for line, kind, day, course, section in cursor.fetchall()
+        ]
+
+    def file_conflicts(self, cursor, staging, meetings):
+        """Rows overlapping an earlier row of the file in the same room or with the same faculty"""
+        overlap = (
+            "earlier.day = later.day AND earlier.line < later.line "
+            "AND earlier.start_minute < later.end_minute AND later.start_minute < earlier.end_minute"
+        )
+        valid = (
+            f"JOIN {staging} later_row ON later_row.line = later.line AND later_row.error IS NULL "
+            f"JOIN {staging} earlier_row ON earlier_row.line = earlier.line AND earlier_row.error IS NULL"
+        )
+        cursor.execute(
+            f"SELECT later.line, 'room', later.day, MIN(earlier.line) FROM {meetings} later "
+            f"JOIN {meetings} earlier ON earlier.room = later.room AND earlier.floor = later.floor AND {overlap} "
+            f"{valid} GROUP BY later.line, later.day "
+            f"UNION ALL "
+            f"SELECT later.line, 'faculty', later.day, MIN(earlier.line) FROM {meetings} later "
+            f"JOIN {meetings} earlier ON earlier.email = later.email AND {overlap} "
+            f"{valid} WHERE later.email <> '' GROUP BY later.line, later.day "
+            f"ORDER BY 1"
+        )
+        return [
+            (line, f"{kind.capitalize()} conflict on {day} with line {earlier}")
+            for line, kind, day, earlier in cursor.fetchall()
+        ]
+
+    def upsert(self, cursor, now):
+        """Create and update departments, rooms, faculty, courses, sections and meetings from the valid rows"""
+        staging = self.quote(STAGING_TABLE)
+        valid = "staged.error IS NULL"
+        quote, column, table = self.quote, self.column, self.table
+        departments, rooms, faculty, courses = table(Department), table(Room), table(Faculty), table(Course)
+        sections, meetings = table(ClassSection), table(ClassMeeting)
+        first_of_email = (
+            f"staged.line = (SELECT MIN(other.line) FROM {staging} other WHERE other.email = staged.email "
+            f"AND other.faculty <> '' AND other.department <> '' AND other.error IS NULL)"
+        )
+
+        cursor.execute(
+            f"INSERT INTO {departments} ({column(Department, 'name')}, {column(Department, 'created_at')}, "
+            f"{column(Department, 'updated_at')}) "
+            f"SELECT new.department, %s, %s FROM (SELECT DISTINCT staged.department FROM {staging} staged WHERE {valid} "
+            f"AND staged.email <> '' AND staged.department <> '' "
+            f"AND NOT EXISTS (SELECT 1 FROM {departments} d WHERE d.{column(Department, 'name')} = staged.department)) new",
+            [now, now]
+        )
+        self.counts['departments_created'] = cursor.rowcount
+
+        cursor.execute(
+            f"INSERT INTO {rooms} ({column(Room, 'room')}, {column(Room, 'floor')}, "
+            f"{column(Room, 'created_at')}, {column(Room, 'updated_at')}, {column(Room, 'version')}) "
+            f"SELECT new.room, new.floor, %s, %s, 1 FROM (SELECT DISTINCT staged.room, staged.floor FROM {staging} staged "
+            f"WHERE {valid} AND NOT EXISTS (SELECT 1 FROM {rooms} r WHERE r.{column(Room, 'room')} = staged.room "
+            f"AND r.{column(Room, 'floor')} = staged.floor)) new",
+            [now, now]
+        )
+        self.counts['rooms_created'] = cursor.rowcount
+
+        # Existing faculty take the name and department of their first complete row
+        department_of_row = (
+            f"(SELECT d.{quote('id')} FROM {departments} d WHERE d.{column(Department, 'name')} = staged.department)"
+        )
+        cursor.execute(
+            f"UPDATE {faculty} SET "
+            f"{column(Faculty, 'name')} = (SELECT staged.faculty FROM {staging} staged "
+            f"WHERE staged.email = {faculty}.{column(Faculty, 'email')} AND {first_of_email}), "
+            f"{column(Faculty, 'department')} = (SELECT {department_of_row} FROM {staging} staged "
+            f"WHERE staged.email = {faculty}.{column(Faculty, 'email')} AND {first_of_email}), "
+            f"{column(Faculty, 'updated_at')} = %s, "
+            f"{column(Faculty, 'version')} = {column(Faculty, 'version')} + 1 "
+            f"WHERE EXISTS (SELECT 1 FROM {staging} staged WHERE staged.email = {faculty}.{column(Faculty, 'email')} "
+            f"AND {first_of_email} AND (staged.faculty <> {faculty}.{column(Faculty, 'name')} "
+            f"OR {department_of_row} <> {faculty}.{column(Faculty, 'department')}))",
+            [now]
+        )
+        self.counts['faculty_updated'] = cursor.rowcount
+
+        cursor.execute(
+            f"INSERT INTO {faculty} ({column(Faculty, 'name')}, {column(Faculty, 'email')}, "
+            f"{column(Faculty, 'department')}, {column(Faculty, 'created_at')}, {column(Faculty, 'updated_at')}, "
+            f"{column(Faculty, 'version')}) "
+            f"SELECT staged.faculty, staged.email, {department_of_row}, %s, %s, 1 FROM {staging} staged "
+            f"WHERE {valid} AND {first_of_email} "
+            f"AND NOT EXISTS (SELECT 1 FROM {faculty} f WHERE f.{column(Faculty, 'email')} = staged.email)",
+            [now, now]
+        )
+        self.counts['faculty_created'] = cursor.rowcount
+
+        cursor.execute(
+            f"INSERT INTO {courses} ({column(Course, 'course_code')}, {column(Course, 'created_at')}, "
+            f"{column(Course, 'updated_at')}) "
+            f"SELECT new.course, %s, %s FROM (SELECT DISTINCT staged.course FROM {staging} staged WHERE {valid} "
+            f"AND NOT EXISTS (SELECT 1 FROM {courses} c WHERE c.{column(Course, 'course_code')} = staged.course)) new",
+            [now, now]
+        )
+        self.counts['courses_created'] = cursor.rowcount
+
+        # Resolve the natural keys of the valid rows to IDs once
+        cursor.execute(
+            f"UPDATE {staging} SET "
+            f"course_id = (SELECT c.{quote('id')} FROM {courses} c WHERE c.{column(Course, 'course_code')} = {staging}.course), "
+            f"room_id = (SELECT r.{quote('id')} FROM {rooms} r WHERE r.{column(Room, 'room')} = {staging}.room "
+            f"AND r.{column(Room, 'floor')} = {staging}.floor), "
+            f"faculty_id = (SELECT f.{quote('id')} FROM {faculty} f WHERE f.{column(Faculty, 'email')} = {staging}.email) "
+            f"WHERE error IS NULL"
+        )
+        section_id = (
+            f"(SELECT s.{quote('id')} FROM {sections} s WHERE s.{column(ClassSection, 'semester')} = %s "
+            f"AND s.{column(ClassSection, 'course')} = {staging}.course_id "
+            f"AND s.{column(ClassSection, 'section')} = {staging}.section)"
+        )
+        cursor.execute(f"UPDATE {staging} SET section_id = {section_id} WHERE error IS NULL", [self.semester.pk])
+        cursor.execute(f"CREATE INDEX {quote(STAGING_TABLE + '_section')} ON {staging} (section_id)")
+
+        row_of_section = f"FROM {staging} staged WHERE staged.section_id = {sections}.{quote('id')} AND {valid}"
+        cursor.execute(
+            f"UPDATE {sections} SET "
+            f"{column(ClassSection, 'type')} = (SELECT staged.type {row_of_section}), "
+            f"{column(ClassSection, 'room')} = (SELECT staged.room_id {row_of_section}), "
+            f"{column(ClassSection, 'schedule')} = (SELECT staged.schedule {row_of_section}), "
+            f"{column(ClassSection, 'faculty')} = (SELECT staged.faculty_id {row_of_section}), "
+            f"{column(ClassSection, 'updated_at')} = %s, "
+            f"{column(ClassSection, 'version')} = {column(ClassSection, 'version')} + 1 "
+            f"WHERE {quote('id')} IN (SELECT staged.section_id FROM {staging} staged "
+            f"WHERE {valid} AND staged.section_id IS NOT NULL)",
+            [now]
+        )
+        self.counts['sections_updated'] = cursor.rowcount
+
+        fields = ('semester', 'course', 'section', 'type', 'room', 'schedule', 'faculty', 'created_at', 'updated_at',
+                  'version')
+        cursor.execute(
+            f"INSERT INTO {sections} ({', '.join(column(ClassSection, name) for name in fields)}) "
+            f"SELECT %s, staged.course_id, staged.section, staged.type, staged.room_id, staged.schedule, "
+            f"staged.faculty_id, %s, %s, 1 FROM {staging} staged WHERE {valid} AND staged.section_id IS NULL",
+            [self.semester.pk, now, now]
+        )
+        self.counts['sections_created'] = cursor.rowcount
+        cursor.execute(
+            f"UPDATE {staging} SET section_id = {section_id} WHERE error IS NULL AND section_id IS NULL",
+            [self.semester.pk]
+        )
+
+        # Meetings of every imported section come straight from the staged ones
+        cursor.execute(
+            f"DELETE FROM {meetings} WHERE {column(ClassMeeting, 'section')} IN "
+            f"(SELECT staged.section_id FROM {staging} staged WHERE {valid})"
+        )
+        fields = ('section', 'semester', 'room', 'faculty', 'day', 'start_minute', 'end_minute')
+        cursor.execute(
+            f"INSERT INTO {meetings} ({', '.join(column(ClassMeeting, name) for name in fields)}) "
+            f"SELECT staged.section_id, %s, staged.room_id, staged.faculty_id, meeting.day, meeting.start_minute, "
+            f"meeting.end_minute FROM {quote(STAGING_MEETING_TABLE)} meeting "
+            f"JOIN {staging} staged ON staged.line = meeting.line WHERE {valid}",
+            [self.semester.pk]
+        )
+
+    def fetch_errors(self, cursor):
+        cursor.execute(f"SELECT line, error FROM {self.quote(STAGING_TABLE)} WHERE error IS NOT NULL ORDER BY line")
+        return cursor.fetchall()
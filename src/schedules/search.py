@@ -0,0 +1,189 @@
+"""
+In-memory autocomplete index over courses, rooms and faculty.
+
+The index maps every whole value with the spaces removed (so "cmsc12" finds
+"CMSC 128"), every prefix of it, every prefix of every word and every trigram
+to the entries containing them. Results are taken rank by rank (exact, prefix,
+word prefix, substring), so a query never ranks more entries than it returns
+plus the few that fail to confirm a word-prefix or substring match. It is
+built from three queries and rebuilt on the next search after a write to one
+of the models (see ``cache.py``), or after ``SEARCH_INDEX_MAX_AGE`` seconds
+so workers whose local cache missed a bump still catch up.
+"""
+
+import heapq
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from .cache import get_generation
+from .models import Course, Faculty, Room
+
+GENERATION = 'search'
+TYPES = ('course', 'room', 'faculty')
+
+# Ranks, best first
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+MATCHES = {EXACT: 'exact', PREFIX: 'prefix', WORD_PREFIX: 'word_prefix', SUBSTRING: 'substring'}
+
+WORD = re.compile(r'[a-z0-9]+')
+
+
+def normalize(value):
+    """Lower-case words of a value: 'CMSC 128-1' -> ['cmsc', '128', '1']"""
+    return WORD.findall(value.lower())
+
+
+class Entry:
+    __slots__ = ('type', 'id', 'label', 'detail', 'fields')
+
+    def __init__(self, type, id, label, detail, values):
+        self.type = type
+        self.id = id
+        self.label = label
+        self.detail = detail
+        # (words, words joined without spaces) of every searchable value
+        self.fields = [(words, ''.join(words)) for words in map(normalize, values) if words]
+
+    def matches(self, words, compact, rank):
+        """Whether one value of this entry matches the query at a rank the index cannot tell exactly"""
+        for field_words, field_compact in self.fields:
+            if rank == WORD_PREFIX:
+                if all(any(word.startswith(query_word) for word in field_words) for query_word in words):
+                    return True
+            elif compact in field_compact:
+                return True
+        return False
+
+    def as_dict(self, rank):
+        return {
+            'type': self.type,
+            'id': self.id,
+            'label': self.label,
+            'detail': self.detail,
+            'match': MATCHES[rank],
+        }
+
+
+class SearchIndex:
+    def __init__(self, entries, generation=None):
+        self.entries = entries
+        self.generation = generation
+        self.built_at = time.monotonic()
+        self.exact = defaultdict(set)
+        self.prefixes = defaultdict(set)
+        self.word_prefixes = defaultdict(set)
+        self.trigrams = defaultdict(set)
+        self.types = defaultdict(set)
+
+        for position, entry in enumerate(entries):
+            self.types[entry.type].add(position)
+            for words, compact in entry.fields:
+                self.exact[compact].add(position)
+                for end in range(1, len(compact) + 1):
+                    self.prefixes[compact[:end]].add(position)
+                for word in words:
+                    for end in range(1, len(word) + 1):
+                        self.word_prefixes[word[:end]].add(position)
+                for start in range(len(compact) - 2):
+                    self.trigrams[compact[start:start + 3]].add(position)
+
+        # Within a rank, shorter labels come first, then alphabetical order
+        self.order = [0] * len(entries)
+        by_label = sorted(range(len(entries)), key=lambda position: (
+            len(entries[position].label), entries[position].label.lower()
+        ))
+        for order, position in enumerate(by_label):
+            self.order[position] = order
+
+    @classmethod
+    def build(cls, generation=None):
+        entries = [
+            Entry('course', course_id, code, '', [code])
+            for course_id, code in Course.objects.values_list('id', 'course_code')
+        ]
+        entries += [
+            Entry('room', room_id, room, floor, [room, floor])
+            for room_id, room, floor in Room.objects.values_list('id', 'room', 'floor')
+        ]
+        entries += [
+            Entry('faculty', faculty_id, name, email, [name, email])
+            for faculty_id, name, email in Faculty.objects.values_list('id', 'name', 'email')
+        ]
+        return cls(entries, generation)
+
+    def tiers(self, words, compact):
+        """
+        (rank, positions, verify) from the best rank down. Positions of the
+        last two ranks are a superset that each entry has to confirm.
+        """
+        yield EXACT, self.exact.get(compact, set()), False
+        yield PREFIX, self.prefixes.get(compact, set()), False
+        yield WORD_PREFIX, self.intersect(self.word_prefixes, words), len(words) > 1
+        if len(compact) >= 3:
+            trigrams = [compact[start:start + 3] for start in range(len(compact) - 2)]
+            yield SUBSTRING, self.intersect(self.trigrams, trigrams), True
+
+    def intersect(self, index, keys):
+        positions = None
+        for key in keys:
+            positions = index.get(key, set()) if positions is None else positions & index.get(key, set())
+            if not positions:
+                return set()
+        return positions or set()
+
+    def search(self, query, types=None, limit=10):
+        words = normalize(query)
+        if not words:
+            return []
+        compact = ''.join(words)
+        allowed = set().union(*(self.types[type] for type in types)) if types else None
+
+        results, seen = [], set()
+        for rank, positions, verify in self.tiers(words, compact):
+            positions = positions - seen
+            if allowed is not None:
+                positions &= allowed
+
+            if verify:
+                ordered = sorted(positions, key=self.order.__getitem__)
+                matching = (position for position in ordered if self.entries[position].matches(words, compact, rank))
+            else:
+                matching = heapq.nsmallest(limit - len(results), positions, key=self.order.__getitem__)
+
+            for position in matching:
+                seen.add(position)
+                results.append(self.entries[position].as_dict(rank))
+                if len(results) == limit:
+                    return results
+        return results
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    """The current index, rebuilt if the data changed since it was built"""
+    global _index
+    generation = get_generation(GENERATION)
+    index = _index
+    if index is not None and index.generation == generation and not _expired(index):
+        return index
+
+    with _lock:
+        # Another thread may have rebuilt it while this one waited
+        if _index is None or _index.generation != generation or _expired(_index):
+            _index = SearchIndex.build(generation)
+        return _index
+
+
+def _expired(index):
+    return time.monotonic() - index.built_at > settings.SEARCH_INDEX_MAX_AGE
+
+
+def search(query, types=None, limit=10):
+    return get_index().search(query, types=types, limit=limit)
@@ -0,0 +1,136 @@
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from . import events
+from .booking import ScheduleConflict, is_overlap_violation, overlap_enforced
+from .cache import API_GENERATION, bump_generation_on_commit
+from .models import ClassMeeting, ClassSection
+from .sync import restamp
+from .utils import audit_semester_conflicts
+
+
+def clone_semester(source, target, drop_faculty=False, room_map=None):
+    """
+    Copy every class section of one semester into another
+
+    The copy is a single INSERT ... SELECT (room changes included), plus one
+    more for the sections' meetings, so the cost does not grow with
+    round-trips per section. Sections that already
+    exist in the target (same course and section name) are left untouched.
+    Conflicts are audited once for the whole target term at the end instead
+    of once per section. Where the database rejects overlapping meetings
+    (see booking.py) a copy with conflicts is rolled back and ScheduleConflict
+    is raised with them instead.
+
+    Parameters:
+    - source: Semester to copy from
+    - target: Semester to copy into
+    - drop_faculty: Leave the faculty of the copied sections unassigned
+    - room_map: Optional dict of {old room ID: new room ID} applied to the copies
+
+    Returns:
+    - Tuple of (number of sections copied, list of conflicts in the target semester)
+    """
+    if source.pk == target.pk:
+        raise ValueError("Cannot clone a semester into itself")
+
+    now = timezone.now()
+    table = connection.ops.quote_name(ClassSection._meta.db_table)
+    fields = [field for field in ClassSection._meta.concrete_fields if not field.primary_key]
+
+    # Every column is copied as-is except for these
+    overrides = {
+        'semester': ("%s", [target.pk]),
+        'created_at': ("%s", [ClassSection._meta.get_field('created_at').get_db_prep_value(now, connection)]),
+        'updated_at': ("%s", [ClassSection._meta.get_field('updated_at').get_db_prep_value(now, connection)]),
+        'version': ("%s", [1]),
+    }
+    if drop_faculty:
+        overrides['faculty'] = ("NULL", [])
+    if room_map:
+        room_column = connection.ops.quote_name(ClassSection._meta.get_field('room').column)
+        overrides['room'] = (
+            f"CASE source.{room_column} {'WHEN %s THEN %s ' * len(room_map)}ELSE source.{room_column} END",
+            [room_id for pair in room_map.items() for room_id in pair],
+        )
+
+    columns, selects, params = [], [], []
+    for field in fields:
+        column = connection.ops.quote_name(field.column)
+        columns.append(column)
+        if field.name in overrides:
+            sql, field_params = overrides[field.name]
+            selects.append(sql)
+            params.extend(field_params)
+        else:
+            selects.append(f"source.{column}")
+
+    semester_column = connection.ops.quote_name(ClassSection._meta.get_field('semester').column)
+    course_column = connection.ops.quote_name(ClassSection._meta.get_field('course').column)
+    section_column = connection.ops.quote_name(ClassSection._meta.get_field('section').column)
+
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"SELECT {', '.join(selects)} FROM {table} source "
+        f"WHERE source.{semester_column} = %s AND NOT EXISTS ("
+        f"SELECT 1 FROM {table} existing WHERE existing.{semester_column} = %s "
+        f"AND existing.{course_column} = source.{course_column} "
+        f"AND existing.{section_column} = source.{section_column})"
+    )
+    params.extend([source.pk, target.pk])
+
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            cloned = cursor.rowcount
+            # Audited from the sections, before their meetings exist
+            conflicts = audit_semester_conflicts(target)
+            if conflicts and overlap_enforced():
+                raise ScheduleConflict(conflicts)
+            cursor.execute(*copy_meetings_sql(source, target))
+            # The audit may have taken longer than the sync feed looks back
+            restamp(cursor, [ClassSection], now)
+    except IntegrityError as e:
+        if not is_overlap_violation(e):
+            raise
+        # A section written into the target since the audit
+        raise ScheduleConflict([]) from e
+
+    # The copies were inserted without signals
+    bump_generation_on_commit(API_GENERATION)
+    transaction.on_commit(lambda: events.publish(events.reload_event(target.pk)), robust=True)
+    return cloned, conflicts
+
+
+def copy_meetings_sql(source, target):
+    """
+    INSERT ... SELECT copying the meetings of the source sections to their
+    copies in the target that have none yet, taking room and faculty from the copy
+    """
+    quote = connection.ops.quote_name
+    meetings = quote(ClassMeeting._meta.db_table)
+    sections = quote(ClassSection._meta.db_table)
+
+    def column(model, name):
+        return quote(model._meta.get_field(name).column)
+
+    copied = {
+        'section': f"copy.{quote('id')}",
+        'semester': f"copy.{column(ClassSection, 'semester')}",
+        'room': f"copy.{column(ClassSection, 'room')}",
+        'faculty': f"copy.{column(ClassSection, 'faculty')}",
+        'day': f"meeting.{column(ClassMeeting, 'day')}",
+        'start_minute': f"meeting.{column(ClassMeeting, 'start_minute')}",
+        'end_minute': f"meeting.{column(ClassMeeting, 'end_minute')}",
+    }
+    sql = (
+        f"INSERT INTO {meetings} ({', '.join(column(ClassMeeting, name) for name in copied)}) "
+        f"SELECT {', '.join(copied.values())} FROM {meetings} meeting "
+        f"JOIN {sections} original ON original.{quote('id')} = meeting.{column(ClassMeeting, 'section')} "
+        f"JOIN {sections} copy ON copy.{column(ClassSection, 'semester')} = %s "
+        f"AND copy.{column(ClassSection, 'course')} = original.{column(ClassSection, 'course')} "
+        f"AND copy.{column(ClassSection, 'section')} = original.{column(ClassSection, 'section')} "
+        f"WHERE original.{column(ClassSection, 'semester')} = %s AND NOT EXISTS ("
+        f"SELECT 1 FROM {meetings} existing WHERE existing.{column(ClassMeeting, 'section')} = copy.{quote('id')})"
+    )
+    return sql, [target.pk, source.pk]
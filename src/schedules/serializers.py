@@ -1,14 +1,44 @@
 from rest_framework import serializers
-from .models import Course, ClassSection, Department, Faculty, AdminUser, Room
-from .utils import check_schedule_conflicts
+from .models import Course, ClassSection, Department, Faculty, AdminUser, Room, Semester
+from .utils import check_schedule_conflicts, parse_schedule
 from datetime import datetime
 import re
 
 class RoomSerializer(serializers.ModelSerializer):
     class Meta:
         model = Room
-        fields = ['id', 'room', 'floor']
-        read_only_fields = ['id']
+        fields = ['id', 'room', 'floor', 'version']
+        read_only_fields = ['id', 'version']
+
+class SemesterSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Semester
+        fields = ['id', 'name', 'start_date', 'end_date', 'is_active', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'is_active', 'created_at', 'updated_at']
+
+class SemesterCloneSerializer(serializers.Serializer):
+    """Options for copying a semester's sections into another semester"""
+    target = serializers.PrimaryKeyRelatedField(queryset=Semester.objects.all(), required=False)
+    name = serializers.CharField(max_length=50, required=False)
+    drop_faculty = serializers.BooleanField(default=False)
+    room_map = serializers.DictField(child=serializers.IntegerField(), required=False)
+    activate = serializers.BooleanField(default=False)
+    
+    def validate_room_map(self, value):
+        try:
+            room_map = {int(old): new for old, new in value.items()}
+        except ValueError:
+            raise serializers.ValidationError("Room map keys must be room IDs")
+        
+        room_ids = set(room_map) | set(room_map.values())
+        if Room.objects.filter(id__in=room_ids).count() != len(room_ids):
+            raise serializers.ValidationError("Room map refers to rooms that do not exist")
+        return room_map
+    
+    def validate(self, data):
+        if not data.get('target') and not data.get('name'):
+            raise serializers.ValidationError("Either a target semester or a name for a new semester is required")
+        return data
 
 class ClassSectionSerializer(serializers.ModelSerializer):
     faculty_name = serializers.SerializerMethodField()
@@ -17,8 +47,8 @@ class ClassSectionSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = ClassSection
-        fields = ['id', 'section', 'type', 'room', 'room_display', 'schedule', 'faculty', 'faculty_name', 'is_active']
-        read_only_fields = ['id']
+        fields = ['id', 'semester', 'section', 'type', 'room', 'room_display', 'schedule', 'faculty', 'faculty_name', 'is_active', 'version']
+        read_only_fields = ['id', 'version']
     
     def get_faculty_name(self, obj):
         return obj.faculty.name if obj.faculty else None
@@ -180,8 +210,8 @@ class FacultySerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Faculty
-        fields = ['id', 'name', 'email', 'department', 'department_name']
-        read_only_fields = ['id']
+        fields = ['id', 'name', 'email', 'department', 'department_name', 'version']
+        read_only_fields = ['id', 'version']
     
     def get_department_name(self, obj):
         return obj.department.name
@@ -192,8 +222,8 @@ class FacultyDetailSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Faculty
-        fields = ['id', 'name', 'email', 'department', 'department_name', 'class_sections', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ['id', 'name', 'email', 'department', 'department_name', 'class_sections', 'created_at', 'updated_at', 'version']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'version']
     
     def get_department_name(self, obj):
         return obj.department.name
@@ -221,7 +251,29 @@ class AdminUserDetailSerializer(serializers.ModelSerializer):
     def get_department_name(self, obj):
         return obj.department.name if obj.department else None
 
-class ClassSectionCreateSerializer(serializers.ModelSerializer):
+class ScheduleConflictMixin:
+    """
+    Remembers the schedule a section was validated with, so that the view can
+    check it again while it holds the write (see booking.write_section)
+    """
+    _conflict_check = None
+
+    def validate_time(self, value):
+        """A time range such as "11:00 AM - 12:00 PM" that ends after it starts"""
+        parsed = parse_schedule(f"M | {value}")
+        if parsed is None:
+            raise serializers.ValidationError("Invalid time format. Expected format: '11:00 AM - 12:00 PM'")
+        _, start, end = parsed
+        if start >= end:
+            raise serializers.ValidationError("The end time must be after the start time")
+        return value
+
+    def find_conflicts(self):
+        if not self._conflict_check:
+            return []
+        return check_schedule_conflicts(**self._conflict_check)
+
+class ClassSectionCreateSerializer(ScheduleConflictMixin, serializers.ModelSerializer):
     course_code = serializers.CharField(write_only=True)
     day = serializers.CharField(write_only=True)
     time = serializers.CharField(write_only=True)
@@ -230,8 +282,8 @@ class ClassSectionCreateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = ClassSection
-        fields = ['id', 'course_code', 'section', 'type', 'room_id', 'day', 'time', 'schedule', 'faculty_id', 'faculty', 'room']
-        read_only_fields = ['id', 'schedule', 'faculty', 'room']
+        fields = ['id', 'semester', 'course_code', 'section', 'type', 'room_id', 'day', 'time', 'schedule', 'faculty_id', 'faculty', 'room']
+        read_only_fields = ['id', 'semester', 'schedule', 'faculty', 'room']
     
     def validate(self, data):
         """Check for faculty and room schedule conflicts but don't raise an error - this is handled in the view"""
@@ -240,14 +292,19 @@ class ClassSectionCreateSerializer(serializers.ModelSerializer):
         faculty_id = data.get('faculty_id')
         room_id = data.get('room_id')
         
+        # New sections always go into the active semester
+        data['semester'] = Semester.objects.active()
+        
         # Only check for conflicts if we have the necessary data
         if day and time and (faculty_id or room_id):
-            conflicts = check_schedule_conflicts(
-                day=day, 
-                time=time, 
-                faculty_id=faculty_id, 
-                room_id=room_id
-            )
+            self._conflict_check = {
+                'day': day,
+                'time': time,
+                'faculty_id': faculty_id,
+                'room_id': room_id,
+                'semester': data['semester'],
+            }
+            conflicts = self.find_conflicts()
             
             if conflicts:
                 # Store the conflicts on the instance for the view to access
@@ -287,7 +344,7 @@ class ClassSectionCreateSerializer(serializers.ModelSerializer):
         
         return ClassSection.objects.create(**validated_data)
 
-class ClassSectionUpdateSerializer(serializers.ModelSerializer):
+class ClassSectionUpdateSerializer(ScheduleConflictMixin, serializers.ModelSerializer):
     course_code = serializers.CharField(write_only=True, required=False)
     day = serializers.CharField(write_only=True, required=False)
     time = serializers.CharField(write_only=True, required=False)
@@ -296,8 +353,8 @@ class ClassSectionUpdateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = ClassSection
-        fields = ['id', 'course_code', 'section', 'type', 'room_id', 'day', 'time', 'schedule', 'faculty_id', 'faculty', 'room']
-        read_only_fields = ['id', 'schedule', 'faculty', 'room']
+        fields = ['id', 'semester', 'course_code', 'section', 'type', 'room_id', 'day', 'time', 'schedule', 'faculty_id', 'faculty', 'room']
+        read_only_fields = ['id', 'semester', 'schedule', 'faculty', 'room']
     
     def validate(self, data):
         """Check for faculty and room schedule conflicts but don't raise an error - this is handled in the view"""
@@ -308,7 +365,7 @@ class ClassSectionUpdateSerializer(serializers.ModelSerializer):
         instance = self.instance
         
         # We need to check for conflicts if any scheduling-related field is changing
-        if instance and (day is not None or time is not None or room_id is not None):
+        if instance and (day is not None or time is not None or room_id is not None or faculty_id is not None):
             # Use existing values for any missing fields
             if faculty_id is None and instance.faculty:
                 faculty_id = instance.faculty.id
@@ -328,13 +385,15 @@ class ClassSectionUpdateSerializer(serializers.ModelSerializer):
             
             # Now check for conflicts if we have all the necessary data
             if day and time and (faculty_id or room_id):
-                conflicts = check_schedule_conflicts(
-                    day=day, 
-                    time=time, 
-                    faculty_id=faculty_id, 
-                    room_id=room_id,
-                    exclude_section_id=instance.id
-                )
+                self._conflict_check = {
+                    'day': day,
+                    'time': time,
+                    'faculty_id': faculty_id,
+                    'room_id': room_id,
+                    'exclude_section_id': instance.id,
+                    'semester': instance.semester_id,
+                }
+                conflicts = self.find_conflicts()
                 
                 if conflicts:
                     # Store the conflicts on the instance for the view to access
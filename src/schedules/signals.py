@@ -0,0 +1,77 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import events
+
+from .cache import API_GENERATION, bump_generation_on_commit
+from .models import AdminUser, ClassSection, Course, Department, Faculty, Room, Semester
+from .search import GENERATION as SEARCH_GENERATION
+from .sync import record_deletion
+
+
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=Room)
+@receiver([post_save, post_delete], sender=Faculty)
+def invalidate_search_index(sender, **kwargs):
+    bump_generation_on_commit(SEARCH_GENERATION)
+
+
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=ClassSection)
+@receiver([post_save, post_delete], sender=Room)
+@receiver([post_save, post_delete], sender=Faculty)
+@receiver([post_save, post_delete], sender=Department)
+@receiver([post_save, post_delete], sender=Semester)
+@receiver([post_save, post_delete], sender=AdminUser)
+def invalidate_cached_responses(sender, origin=None, **kwargs):
+    if origin is not None:
+        # Once for a whole delete, however many rows it cascades to
+        if getattr(origin, '_api_generation_bumped', False):
+            return
+        origin._api_generation_bumped = True
+    bump_generation_on_commit(API_GENERATION)
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=ClassSection)
+@receiver(post_delete, sender=Room)
+@receiver(post_delete, sender=Faculty)
+@receiver(post_delete, sender=Department)
+def leave_tombstone(sender, instance, **kwargs):
+    record_deletion(instance)
+
+
+@receiver(pre_delete, sender=Faculty)
+def touch_unassigned_sections(sender, instance, **kwargs):
+    # SET_NULL clears the faculty with an update that bumps neither, so the sync feed would miss it
+    ClassSection.objects.filter(faculty=instance).update(updated_at=timezone.now(), version=F('version') + 1)
+
+
+@receiver(post_save, sender=ClassSection)
+def publish_section_saved(sender, instance, created, **kwargs):
+    previous = None
+    room_id, faculty_id = getattr(instance, '_loaded_placement', (None, None))
+    if not created:
+        # Only looked up when the section moved
+        previous = (
+            Room.objects.filter(pk=room_id).first() if room_id and room_id != instance.room_id else None,
+            Faculty.objects.filter(pk=faculty_id).first() if faculty_id and faculty_id != instance.faculty_id else None,
+        )
+    instance._loaded_placement = (instance.room_id, instance.faculty_id)
+    event = events.section_event(events.CREATED if created else events.UPDATED, instance, previous)
+    transaction.on_commit(lambda: events.publish(event), robust=True)
+
+
+@receiver(post_delete, sender=ClassSection)
+def publish_section_deleted(sender, instance, origin=None, **kwargs):
+    if origin is not None and getattr(origin, 'model', type(origin)) is not ClassSection:
+        # Cascaded from a room, course, semester...: one reload rather than loading every section's room
+        if not getattr(origin, '_reload_published', False):
+            origin._reload_published = True
+            transaction.on_commit(lambda: events.publish(events.reload_event()), robust=True)
+        return
+    event = events.section_event(events.DELETED, instance)
+    transaction.on_commit(lambda: events.publish(event), robust=True)
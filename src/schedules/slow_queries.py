@@ -0,0 +1,190 @@
+"""
+Slow-query capture for the schedules app.
+
+While a request is handled, every query is timed through a connection
+``execute_wrapper``. Queries that take longer than ``SLOW_QUERY_MS`` and were
+issued from code in this app running inside the resolved view (not from a
+middleware of the app wrapping every request, such as compression) are
+recorded. Once the response has been sent they are explained (``EXPLAIN QUERY
+PLAN`` on SQLite, ``EXPLAIN`` on PostgreSQL, with ``ANALYZE`` for SELECTs when
+``SLOW_QUERY_EXPLAIN_ANALYZE`` is on) and saved as ``SlowQueryLog`` rows. The
+EXPLAINs still run in the worker, one per slow query, so the worker is busy a
+little longer but the client does not wait for them. Only the newest
+``SLOW_QUERY_LOG_SIZE`` rows are kept; browse them in the admin.
+
+With ``SLOW_QUERY_MS`` unset or 0 the middleware is not loaded at all.
+"""
+
+import logging
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from functools import partial
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+
+from .models import SlowQueryLog
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = Path(__file__).resolve().parent
+THIS_FILE = Path(__file__).resolve()
+
+# Set while the EXPLAIN of a slow query runs, so it is not captured itself
+_state = threading.local()
+
+
+def find_caller(view):
+    """
+    'schedules/utils.py:52 in check_schedule_conflicts' for the innermost frame
+    of this app, or None if there is none or it is not running inside the view
+
+    Parameters:
+    - view: The resolved view function; frames outside it (middleware) are not callers
+    """
+    if view is None:
+        return None
+    view_code = view.__code__
+    caller = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code is view_code:
+            return caller
+        filename = Path(frame.f_code.co_filename)
+        if (caller is None and filename != THIS_FILE and APP_DIR in filename.parents
+                and 'migrations' not in filename.parts):
+            relative = filename.relative_to(APP_DIR.parent)
+            caller = f"{relative.as_posix()}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def explain(connection, sql, params):
+    """Query plan of a statement as text, or an empty string if it cannot be explained"""
+    is_select = sql.lstrip().upper().startswith(('SELECT', 'WITH'))
+    if connection.vendor == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    elif connection.vendor == 'postgresql':
+        # ANALYZE runs the statement again; never do that for writes
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) ' if settings.SLOW_QUERY_EXPLAIN_ANALYZE and is_select else 'EXPLAIN '
+    else:
+        return ''
+
+    _state.explaining = True
+    try:
+        # A savepoint keeps a failing EXPLAIN from breaking the request's transaction
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+    except DatabaseError as e:
+        return f"EXPLAIN failed: {e}"
+    finally:
+        _state.explaining = False
+
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        return '\n'.join(str(row[-1]) for row in rows)
+    return '\n'.join(str(row[0]) for row in rows)
+
+
+class SlowQueryRecorder:
+    """execute_wrapper collecting the slow queries of one request"""
+
+    def __init__(self, request, connection, threshold_ms):
+        self.request = request
+        self.connection = connection
+        self.threshold_ms = threshold_ms
+        self.entries = []
+        # (entry, sql, params) to explain once the response is sent
+        self.unexplained = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_state, 'explaining', False):
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= self.threshold_ms:
+            self.record(sql, params, many, duration_ms)
+        return result
+
+    def record(self, sql, params, many, duration_ms):
+        match = getattr(self.request, 'resolver_match', None)
+        caller = find_caller(match.func if match is not None else None)
+        if caller is None:
+            return
+
+        view = ''
+        if match is not None:
+            view = f"{match._func_path} ({match.view_name})" if match.view_name else match._func_path
+
+        entry = SlowQueryLog(
+            duration_ms=round(duration_ms, 3),
+            database=self.connection.alias,
+            sql=sql,
+            params='' if params is None else repr(params)[:2000],
+            method=self.request.method,
+            path=self.request.get_full_path()[:255],
+            view=view[:255],
+            caller=caller[:255],
+            plan='',
+        )
+        self.entries.append(entry)
+        if not many:
+            self.unexplained.append((entry, sql, params))
+        logger.warning("Slow query (%.1f ms) from %s in %s: %s", duration_ms, caller, view, sql)
+
+    def explain_entries(self):
+        for entry, sql, params in self.unexplained:
+            entry.plan = explain(self.connection, sql, params)
+        self.unexplained = []
+
+
+def save_slow_queries(entries):
+    """Store the entries and trim the log to the newest SLOW_QUERY_LOG_SIZE rows"""
+    try:
+        logs = SlowQueryLog.objects.using(DEFAULT_DB_ALIAS)
+        logs.bulk_create(entries)
+        size = settings.SLOW_QUERY_LOG_SIZE
+        oldest_kept = list(logs.order_by('-id').values_list('id', flat=True)[size - 1:size])
+        if oldest_kept:
+            logs.filter(id__lt=oldest_kept[0]).delete()
+    except DatabaseError:
+        logger.exception("Could not save %d slow queries", len(entries))
+
+
+class SlowQueryMiddleware:
+    """Capture slow queries of the schedules app during each request"""
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_MS:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorders = [
+            SlowQueryRecorder(request, connections[alias], settings.SLOW_QUERY_MS) for alias in connections
+        ]
+        with ExitStack() as stack:
+            for recorder in recorders:
+                stack.enter_context(recorder.connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        # Explained and saved when the server closes the response: after the
+        # view's transactions are over, so a rolled back request (e.g. a 409
+        # conflict) still keeps its slow queries, and after the client has it
+        recorders = [recorder for recorder in recorders if recorder.entries]
+        if recorders:
+            response._resource_closers.append(partial(self.save, recorders))
+        return response
+
+    @staticmethod
+    def save(recorders):
+        for recorder in recorders:
+            recorder.explain_entries()
+        save_slow_queries([entry for recorder in recorders for entry in recorder.entries])
@@ -0,0 +1,226 @@
+"""
+Incremental sync feed of courses, sections, rooms, faculty and departments.
+
+Clients keep a local copy of these tables and poll ``changes(since)`` with the
+cursor of their previous poll. Created and updated rows are found through the
+``updated_at`` index of each table; deleted rows through the tombstones that
+the delete signals leave behind (see ``signals.py``). A cursor is the time the
+poll started in microseconds; the next poll looks back ``OVERLAP`` before it,
+so rows saved by transactions that were still running at that moment are not
+missed. Rows may therefore arrive twice and should be applied as upserts.
+
+A poll returns at most ``limit`` rows, feed by feed in (updated_at, pk) order
+and then the tombstones. When it stops short, ``has_more`` is set and the
+cursor also holds where it stopped; the client polls again at once with it.
+The cursor returned by the last page is the time the first page started, so
+rows written while the pages were read are not missed either.
+
+That only holds if a row's ``updated_at`` is at most ``OVERLAP`` older than the
+commit that makes it visible. Bulk writers whose transactions run longer
+(registrar imports, semester clones) stamp their rows once up front and call
+``restamp`` with that stamp as their last statement before the commit.
+
+Deleting a room, course or semester can cascade to thousands of sections.
+Their deletes run inside ``batch_tombstones``, which inserts the tombstones
+they leave with one bulk INSERT at the end, in the same transaction.
+"""
+
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ClassSection, Course, Department, Faculty, Room, Tombstone
+
+# Feed name -> model, in the order clients should apply them
+MODELS = {
+    'departments': Department,
+    'courses': Course,
+    'rooms': Room,
+    'faculty': Faculty,
+    'sections': ClassSection,
+}
+MODEL_NAMES = {model: name for name, model in MODELS.items()}
+# What a poll reads, in order: each feed by updated_at, then the tombstones
+SOURCES = [(name, model, 'updated_at') for name, model in MODELS.items()] + [(None, Tombstone, 'deleted_at')]
+
+# Longest a write transaction is expected to stay open
+OVERLAP = timedelta(seconds=5)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+TOMBSTONE_BATCH_SIZE = 1000
+
+# Tombstones left inside batch_tombstones, waiting for its end
+_pending = threading.local()
+
+DEFAULT_LIMIT = 1000
+
+# Where a poll cut off by its limit stopped: the source it was reading and the
+# (timestamp, pk) of the last row it returned from it, if any
+Position = namedtuple('Position', 'started since source moment pk')
+
+
+class CursorExpired(Exception):
+    """The cursor is older than the tombstones that are kept"""
+
+
+def microseconds(moment):
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+def from_microseconds(value):
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+def encode_cursor(moment):
+    return str(microseconds(moment))
+
+
+def decode_cursor(cursor):
+    """Datetime of a cursor, ValueError if it is not one"""
+    if not cursor.isdigit():
+        raise ValueError(f"Invalid cursor {cursor!r}")
+    return from_microseconds(cursor)
+
+
+def encode_position(position):
+    """Cursor of the next page: started.since.source[.moment.pk], in microseconds"""
+    parts = [microseconds(position.started), microseconds(position.since), position.source]
+    if position.moment is not None:
+        parts += [microseconds(position.moment), position.pk]
+    return '.'.join(map(str, parts))
+
+
+def decode_position(cursor, now):
+    """Position of a cursor, starting a new poll at now for a plain one; ValueError if it is not one"""
+    parts = cursor.split('.')
+    if len(parts) not in (1, 3, 5) or not all(part.isdigit() for part in parts):
+        raise ValueError(f"Invalid cursor {cursor!r}")
+    if len(parts) == 1:
+        return Position(now, decode_cursor(cursor), 0, None, None)
+    started, since, source = from_microseconds(parts[0]), from_microseconds(parts[1]), int(parts[2])
+    if source >= len(SOURCES):
+        raise ValueError(f"Invalid cursor {cursor!r}")
+    moment, pk = (from_microseconds(parts[3]), int(parts[4])) if len(parts) == 5 else (None, None)
+    return Position(started, since, source, moment, pk)
+
+
+def retention():
+    return timedelta(days=settings.SYNC_TOMBSTONE_DAYS)
+
+
+def current_cursor():
+    return encode_cursor(timezone.now())
+
+
+def changes(cursor, limit=DEFAULT_LIMIT):
+    """
+    Rows of the synced models changed since a cursor
+
+    Parameters:
+    - cursor: Cursor returned by a previous call or by current_cursor()
+    - limit: Most rows (created, updated and deleted together) to return
+
+    Returns:
+    - Dict with the next cursor, whether there are more changes to fetch with
+      it right away ('has_more') and, per feed name, the 'created' and 'updated'
+      rows (as dicts of their columns, foreign keys as IDs) and the 'deleted' IDs;
+      raises CursorExpired if deletions since the cursor may have been pruned
+    """
+    now = timezone.now()
+    position = decode_position(cursor, now)
+    if position.since < now - retention():
+        raise CursorExpired(f"Cursor is older than {settings.SYNC_TOMBSTONE_DAYS} days")
+    since = position.since - OVERLAP
+
+    result = {'cursor': encode_cursor(position.started), 'has_more': False}
+    result.update((name, {'created': [], 'updated': [], 'deleted': []}) for name in MODELS)
+    remaining = limit
+    for source in range(position.source, len(SOURCES)):
+        name, model, key = SOURCES[source]
+        moment, pk = (position.moment, position.pk) if source == position.source else (None, None)
+
+        rows = model.objects.filter(**{f'{key}__gt': since})
+        if moment is not None:
+            rows = rows.filter(Q(**{f'{key}__gt': moment}) | Q(**{key: moment, 'pk__gt': pk}))
+        fields = [field.name for field in model._meta.concrete_fields]
+        # One row past the limit tells whether this source has more
+        rows = list(rows.order_by(key, 'pk').values(*fields)[:remaining + 1])
+        more = len(rows) > remaining
+        rows = rows[:remaining]
+
+        for row in rows:
+            if model is Tombstone:
+                result[row['model']]['deleted'].append(row['object_id'])
+            else:
+                result[name]['created' if row['created_at'] > since else 'updated'].append(row)
+        remaining -= len(rows)
+
+        if more:
+            if rows:
+                moment, pk = rows[-1][key], rows[-1]['id']
+            next_position = Position(position.started, position.since, source, moment, pk)
+            result.update(cursor=encode_position(next_position), has_more=True)
+            break
+    return result
+
+
+def restamp(cursor, models, stamp):
+    """
+    Move the timestamps a bulk write gave its rows to now, right before it commits
+
+    Parameters:
+    - cursor: Cursor of the bulk write's transaction
+    - models: Synced models the bulk write stamped
+    - stamp: The datetime it stamped created and updated rows with
+    """
+    quote = connection.ops.quote_name
+    now = timezone.now()
+    for model in models:
+        created, updated = (quote(model._meta.get_field(name).column) for name in ('created_at', 'updated_at'))
+        field = model._meta.get_field('updated_at')
+        old, new = (field.get_db_prep_value(moment, connection) for moment in (stamp, now))
+        cursor.execute(
+            f"UPDATE {quote(model._meta.db_table)} SET {updated} = %s, "
+            f"{created} = CASE WHEN {created} = %s THEN %s ELSE {created} END WHERE {updated} = %s",
+            [new, old, new, old]
+        )
+
+
+@contextmanager
+def batch_tombstones(using=None):
+    """Insert the tombstones left inside the block together at its end, in its transaction"""
+    if getattr(_pending, 'tombstones', None) is not None:
+        # An outer block inserts them
+        yield
+        return
+
+    _pending.tombstones = []
+    try:
+        with transaction.atomic(using=using, savepoint=False):
+            yield
+            Tombstone.objects.bulk_create(_pending.tombstones, batch_size=TOMBSTONE_BATCH_SIZE)
+    finally:
+        _pending.tombstones = None
+
+
+def record_deletion(instance):
+    """Leave a tombstone for a deleted row of a synced model"""
+    tombstone = Tombstone(model=MODEL_NAMES[type(instance)], object_id=instance.pk)
+    pending = getattr(_pending, 'tombstones', None)
+    if pending is None:
+        tombstone.save()
+    else:
+        pending.append(tombstone)
+
+
+def prune_tombstones():
+    """Delete the tombstones older than SYNC_TOMBSTONE_DAYS, returning how many"""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - retention() - OVERLAP).delete()
+    return deleted
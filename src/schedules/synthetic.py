@@ -0,0 +1,287 @@
+"""
+Synthetic campus data for load tests and benchmarks.
+
+Rooms, faculty, courses and sections are generated in memory with a seeded
+random generator and written with bulk_create in batches, so production-sized
+datasets (tens of thousands of sections) can be reproduced locally in seconds.
+"""
+
+import math
+import random
+
+from django.db import transaction
+
+from .booking import overlap_enforced
+from .cache import API_GENERATION, bump_generation
+from .models import ClassMeeting, ClassSection, Course, Department, Faculty, Room, Semester
+from .search import GENERATION as SEARCH_GENERATION
+from .utils import format_schedule
+
+DEPARTMENTS = [
+    ('Computer Science', 'CMSC'),
+    ('Mathematics', 'MATH'),
+    ('Physics', 'PHYS'),
+    ('Biology', 'BIO'),
+    ('Chemistry', 'CHEM'),
+    ('Statistics', 'STAT'),
+    ('English', 'ENG'),
+    ('History', 'HIST'),
+]
+
+BUILDINGS = ['SCI', 'AS', 'CAS', 'LIB']
+FLOORS = 5
+
+FIRST_NAMES = [
+    'Erik', 'Ryan', 'Kyle', 'Jace', 'Darmae', 'Maria', 'Jose', 'Ana', 'Paolo', 'Bea',
+    'Carlo', 'Liza', 'Miguel', 'Rina', 'Nico', 'Clara', 'Andres', 'Joy', 'Marco', 'Tess',
+]
+LAST_NAMES = [
+    'Santos', 'Reyes', 'Cruz', 'Bautista', 'Garcia', 'Mendoza', 'Torres', 'Flores', 'Ramos', 'Aquino',
+    'Villanueva', 'Castillo', 'Navarro', 'Dela Cruz', 'Alicaya', 'Dulaca', 'Noel', 'Roldan', 'Tan', 'Lee',
+]
+
+# Campus day in 30-minute slots from 7:00 AM to 7:00 PM
+DAY_START = 7 * 60
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 24
+
+# (days, length in slots, start every n slots) of a meeting pattern
+LECTURE_PATTERNS = [
+    (['M', 'TH'], 2, 1),
+    (['M', 'TH'], 3, 1),
+    (['T', 'F'], 2, 1),
+    (['T', 'F'], 3, 1),
+    (['W'], 4, 2),
+]
+# Laboratories meet once a week in 3-hour blocks starting at 7, 10, 1 or 4
+LABORATORY_PATTERNS = [([day], 6, 6) for day in ['M', 'T', 'W', 'TH', 'F']]
+LABS_PER_LECTURE = 2
+
+
+def _weekly_slots(patterns):
+    return sum(len(days) * length for days, length, _ in patterns) / len(patterns)
+
+
+# Rooms are split between laboratories and lecture rooms by weekly demand
+LABORATORY_SHARE = (
+    LABS_PER_LECTURE * _weekly_slots(LABORATORY_PATTERNS)
+    / (LABS_PER_LECTURE * _weekly_slots(LABORATORY_PATTERNS) + _weekly_slots(LECTURE_PATTERNS))
+)
+
+# Attempts at finding a free slot before a section is placed anyway
+PLACEMENT_ATTEMPTS = 12
+
+# Natural keys looked up per query, kept below SQLite's parameter limit
+LOOKUP_CHUNK = 500
+
+
+def _block(start_slot, length):
+    return ((1 << length) - 1) << start_slot
+
+
+def _minute_block(start, end):
+    """Block of the campus-day slots a meeting from start to end (minutes after midnight) touches"""
+    first = max(0, (start - DAY_START) // SLOT_MINUTES)
+    last = min(SLOTS_PER_DAY, -(-(end - DAY_START) // SLOT_MINUTES))
+    return _block(first, last - first) if last > first else 0
+
+
+def _get_or_bulk_create(model, key, objects, batch_size):
+    """Create the objects whose natural key does not exist yet, return {key: instance}"""
+    keys = [key(obj) for obj in objects]
+    existing = {}
+    for chunk_start in range(0, len(keys), LOOKUP_CHUNK):
+        chunk = keys[chunk_start:chunk_start + LOOKUP_CHUNK]
+        for obj in _filter_by_keys(model, chunk):
+            existing[key(obj)] = obj
+
+    missing = [obj for obj in objects if key(obj) not in existing]
+    model.objects.bulk_create(missing, batch_size=batch_size)
+    existing.update((key(obj), obj) for obj in missing)
+    return existing
+
+
+def _filter_by_keys(model, keys):
+    if model is Room:
+        return Room.objects.filter(room__in=[room for room, _ in keys])
+    if model is Faculty:
+        return Faculty.objects.filter(email__in=keys)
+    return Course.objects.filter(course_code__in=keys)
+
+
+class CampusGenerator:
+    """Generate a reproducible synthetic campus for a given seed"""
+
+    def __init__(self, rooms, faculty, sections, seed=0, batch_size=1000):
+        self.room_count = rooms
+        self.faculty_count = faculty
+        self.section_count = sections
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        self.conflicts = 0
+        self.existing = 0
+
+    def generate(self, semester=None):
+        """
+        Write the campus into the given semester (the active one by default)
+
+        Returns a summary dictionary with the number of rows written; sections
+        already in the semester under the same course and name are skipped,
+        counted apart as existing and never placed, so they cause no conflicts.
+        """
+        with transaction.atomic():
+            semester = semester or Semester.objects.active()
+            departments = self.create_departments()
+            rooms = self.create_rooms()
+            faculty = self.create_faculty(departments)
+            courses = self.create_courses()
+            sections = self.create_sections(semester, courses, rooms, faculty)
+        # bulk_create sends no signals
+        bump_generation(SEARCH_GENERATION)
+        bump_generation(API_GENERATION)
+
+        return {
+            'semester': semester.name,
+            'departments': len(departments),
+            'rooms': len(rooms),
+            'faculty': len(faculty),
+            'courses': len(courses),
+            'sections': sections,
+            'existing': self.existing,
+            'conflicts': self.conflicts,
+        }
+
+    def create_departments(self):
+        return [Department.objects.get_or_create(name=name)[0] for name, _ in DEPARTMENTS]
+
+    def create_rooms(self):
+        objects = []
+        for index in range(self.room_count):
+            building = BUILDINGS[index % len(BUILDINGS)]
+            floor = (index // len(BUILDINGS)) % FLOORS + 1
+            number = index // (len(BUILDINGS) * FLOORS) + 1
+            objects.append(Room(room=f"{building} {floor}{number:02d}", floor=str(floor)))
+
+        rooms = _get_or_bulk_create(Room, lambda room: (room.room, room.floor), objects, self.batch_size)
+        return [rooms[(room.room, room.floor)] for room in objects]
+
+    def create_faculty(self, departments):
+        objects = []
+        for index in range(self.faculty_count):
+            first = self.random.choice(FIRST_NAMES)
+            last = self.random.choice(LAST_NAMES)
+            local_part = f"{first}.{last}.{index}".lower().replace(' ', '')
+            objects.append(Faculty(
+                name=f"{last}, {first}",
+                email=f"{local_part}@up.edu.ph",
+                department=departments[index % len(departments)],
+            ))
+
+        faculty = _get_or_bulk_create(Faculty, lambda member: member.email, objects, self.batch_size)
+        return [faculty[member.email] for member in objects]
+
+    def create_courses(self):
+        # One lecture section plus its laboratories per course block
+        course_count = max(1, math.ceil(self.section_count / (1 + LABS_PER_LECTURE)))
+        objects = []
+        for index in range(course_count):
+            _, prefix = DEPARTMENTS[index % len(DEPARTMENTS)]
+            objects.append(Course(course_code=f"{prefix} {10 + index // len(DEPARTMENTS)}"))
+
+        courses = _get_or_bulk_create(Course, lambda course: course.course_code, objects, self.batch_size)
+        return [courses[course.course_code] for course in objects]
+
+    def create_sections(self, semester, courses, rooms, faculty):
+        """Generate and write the sections, returns the number actually inserted"""
+        lab_room_count = max(1, int(len(rooms) * LABORATORY_SHARE))
+        lab_rooms = rooms[:lab_room_count]
+        lecture_rooms = rooms[lab_room_count:] or rooms
+
+        # Bitmask of occupied slots per (room or faculty, day), starting from
+        # the sections already in the semester (e.g. a smaller campus of the same seed)
+        room_usage = {}
+        faculty_usage = {}
+        existing = ClassMeeting.objects.filter(semester=semester).values_list(
+            'room_id', 'faculty_id', 'day', 'start_minute', 'end_minute'
+        )
+        for room_id, faculty_id, day, start, end in existing:
+            block = _minute_block(start, end)
+            room_usage[(room_id, day)] = room_usage.get((room_id, day), 0) | block
+            if faculty_id:
+                faculty_usage[(faculty_id, day)] = faculty_usage.get((faculty_id, day), 0) | block
+        in_semester = ClassSection.objects.filter(semester=semester)
+        existing_names = set(in_semester.values_list('course_id', 'section'))
+        sections = []
+        course_index = 0
+
+        while len(sections) + self.existing < self.section_count:
+            course = courses[course_index % len(courses)]
+            letter = chr(ord('A') + (course_index // len(courses)) % 26)
+            course_index += 1
+
+            batch = [(letter, ClassSection.LECTURE)]
+            batch += [(f"{letter}{lab}", ClassSection.LABORATORY) for lab in range(1, LABS_PER_LECTURE + 1)]
+
+            for name, section_type in batch[:self.section_count - len(sections) - self.existing]:
+                if (course.id, name) in existing_names:
+                    self.existing += 1
+                    continue
+                if section_type == ClassSection.LABORATORY:
+                    patterns, candidate_rooms = LABORATORY_PATTERNS, lab_rooms
+                else:
+                    patterns, candidate_rooms = LECTURE_PATTERNS, lecture_rooms
+
+                room, member, days, start_slot, length = self.place(
+                    patterns, candidate_rooms, faculty, room_usage, faculty_usage
+                )
+                start = DAY_START + start_slot * SLOT_MINUTES
+                end = start + length * SLOT_MINUTES
+                sections.append(ClassSection(
+                    semester=semester,
+                    course=course,
+                    section=name,
+                    type=section_type,
+                    room=room,
+                    faculty=member,
+                    schedule=format_schedule(days, start, end),
+                ))
+
+        before = in_semester.count()
+        ClassSection.objects.bulk_create(sections, batch_size=self.batch_size, ignore_conflicts=True)
+        # ignore_conflicts leaves the primary keys unset and does not say which
+        # rows it skipped, so count the semester again and read the new sections back
+        inserted = in_semester.count() - before
+        ClassMeeting.objects.create_for_sections(
+            in_semester.filter(meetings__isnull=True), batch_size=self.batch_size
+        )
+        return inserted
+
+    def place(self, patterns, rooms, faculty, room_usage, faculty_usage):
+        """Pick a room, faculty member and time, avoiding double bookings where possible"""
+        for _ in range(PLACEMENT_ATTEMPTS):
+            days, length, step = self.random.choice(patterns)
+            start_slot = self.random.randrange(0, SLOTS_PER_DAY - length + 1, step)
+            block = _block(start_slot, length)
+            room = self.random.choice(rooms)
+            if any(room_usage.get((room.id, day), 0) & block for day in days):
+                continue
+
+            member = self.random.choice(faculty) if faculty else None
+            if member and any(faculty_usage.get((member.id, day), 0) & block for day in days):
+                # A section without a faculty assignment is realistic (TBA)
+                member = None
+
+            for day in days:
+                room_usage[(room.id, day)] = room_usage.get((room.id, day), 0) | block
+                if member:
+                    faculty_usage[(member.id, day)] = faculty_usage.get((member.id, day), 0) | block
+            return room, member, days, start_slot, length
+
+        # The campus is full: double-book the last candidate, unless the
+        # database rejects overlapping meetings
+        if overlap_enforced():
+            raise ValueError(
+                f"No free room found in {PLACEMENT_ATTEMPTS} attempts; add rooms for a conflict-free campus"
+            )
+        self.conflicts += 1
+        return room, None, days, start_slot, length
@@ -0,0 +1,157 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..models import AdminUser, ClassSection, Course, Department, Faculty, Room, Semester
+
+
+@override_settings(CAMPUS_DAYS="M T W TH F", CAMPUS_DAY_START="7:00 AM", CAMPUS_DAY_END="7:00 PM")
+class RoomUtilizationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.url = reverse('room-utilization')
+        self.semester = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.semester.activate()
+        self.course = Course.objects.create(course_code="CMSC 126")
+        self.lab = Room.objects.create(room="SCI 402", floor="4")
+        self.lecture_hall = Room.objects.create(room="SCI 401", floor="4")
+        self.empty = Room.objects.create(room="AS 101", floor="1")
+        # 2 hours on M and TH, and 3 on W
+        self.add_section("A", self.lecture_hall, "M TH | 9:00 AM - 11:00 AM")
+        self.add_section("B", self.lab, "W | 1:00 PM - 4:00 PM")
+
+    def add_section(self, name, room, schedule):
+        return ClassSection.objects.create(course=self.course, section=name, type="Lecture", room=room, schedule=schedule)
+
+    def test_room_floor_and_campus_usage(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+
+        self.assertEqual(data['campus_hours'], {
+            'days': ['M', 'T', 'W', 'TH', 'F'], 'start': '7:00 AM', 'end': '7:00 PM', 'weekly_hours_per_room': 60.0
+        })
+        rooms = {room['room']: room for room in data['rooms']}
+        self.assertEqual(rooms['SCI 401']['booked_hours'], 4.0)
+        self.assertEqual(rooms['SCI 401']['utilization'], round(4 / 60, 4))
+        self.assertEqual(rooms['SCI 401']['by_day']['M'], {'booked_hours': 2.0, 'utilization': round(2 / 12, 4)})
+        self.assertEqual(rooms['AS 101']['booked_hours'], 0.0)
+
+        floor_4, = [floor for floor in data['floors'] if floor['floor'] == "4"]
+        self.assertEqual((floor_4['rooms'], floor_4['booked_hours']), (2, 7.0))
+        self.assertEqual(floor_4['by_day']['W']['utilization'], round(3 / 24, 4))
+        self.assertEqual(data['campus']['booked_hours'], 7.0)
+        self.assertEqual(data['campus']['utilization'], round(7 / 180, 4))
+
+    def test_most_and_least_used(self):
+        data = self.client.get(self.url, {'limit': 1}).json()
+        self.assertEqual([room['room'] for room in data['most_used']], ["SCI 401"])
+        self.assertEqual([room['room'] for room in data['least_used']], ["AS 101"])
+
+    def test_time_outside_campus_hours_is_not_counted(self):
+        self.add_section("C", self.empty, "S | 9:00 AM - 12:00 PM")
+        self.add_section("D", self.empty, "F | 6:00 PM - 9:00 PM")
+        rooms = {room['room']: room for room in self.client.get(self.url).json()['rooms']}
+        self.assertEqual(rooms['AS 101']['booked_hours'], 1.0)
+
+    def test_cached_until_sections_change(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            # Only the active semester is looked up
+            self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_section("C", self.empty, "T | 7:00 AM - 8:00 AM")
+        rooms = {room['room']: room for room in self.client.get(self.url).json()['rooms']}
+        self.assertEqual(rooms['AS 101']['booked_hours'], 1.0)
+
+    def test_other_semester(self):
+        other = Semester.objects.create(name="2nd Semester AY 2025-2026")
+        data = self.client.get(self.url, {'semester': other.id}).json()
+        self.assertEqual(data['semester']['id'], other.id)
+        self.assertEqual(data['campus']['booked_hours'], 0.0)
+
+    def test_invalid_limit(self):
+        self.assertEqual(self.client.get(self.url, {'limit': 'all'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(FACULTY_OVERLOAD_HOURS=6)
+class TeachingLoadTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.url = reverse('teaching-load')
+        self.semester = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.semester.activate()
+        self.cs = Department.objects.create(name="Computer Science")
+        self.math = Department.objects.create(name="Mathematics")
+        self.doe = Faculty.objects.create(name="John Doe", email="jdoe@up.edu.ph", department=self.cs)
+        self.cruz = Faculty.objects.create(name="Ana Cruz", email="acruz@up.edu.ph", department=self.cs)
+        self.reyes = Faculty.objects.create(name="Ben Reyes", email="breyes@up.edu.ph", department=self.math)
+        self.room = Room.objects.create(room="SCI 402", floor="4")
+        self.course = Course.objects.create(course_code="CMSC 126")
+        # Doe: 3 lecture hours and 6 laboratory hours
+        self.add_section("A", ClassSection.LECTURE, "M TH | 9:00 AM - 10:30 AM", self.doe)
+        self.add_section("A1", ClassSection.LABORATORY, "T | 7:00 AM - 10:00 AM", self.doe)
+        self.add_section("A2", ClassSection.LABORATORY, "W | 7:00 AM - 10:00 AM", self.doe)
+        # Reyes: 2 lecture hours
+        self.add_section("B", ClassSection.LECTURE, "T F | 1:00 PM - 2:00 PM", self.reyes)
+
+    def add_section(self, name, section_type, schedule, faculty):
+        return ClassSection.objects.create(
+            course=self.course, section=name, type=section_type, room=self.room, schedule=schedule, faculty=faculty
+        )
+
+    def faculty_loads(self, data):
+        return {
+            member['name']: member for department in data['departments'] for member in department['faculty']
+        }
+
+    def test_load_per_faculty_member(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        loads = self.faculty_loads(response.json())
+
+        doe = loads["John Doe"]
+        self.assertEqual((doe['sections'], doe['contact_hours'], doe['overloaded']), (3, 9.0, True))
+        self.assertEqual(doe['lecture'], {'sections': 1, 'contact_hours': 3.0})
+        self.assertEqual(doe['laboratory'], {'sections': 2, 'contact_hours': 6.0})
+        self.assertEqual((loads["Ben Reyes"]['contact_hours'], loads["Ben Reyes"]['overloaded']), (2.0, False))
+        # Faculty without sections are listed too
+        self.assertEqual((loads["Ana Cruz"]['sections'], loads["Ana Cruz"]['contact_hours']), (0, 0.0))
+
+    def test_grouped_by_department(self):
+        departments = self.client.get(self.url).json()['departments']
+        self.assertEqual([department['name'] for department in departments], ["Computer Science", "Mathematics"])
+        cs = departments[0]
+        self.assertEqual((cs['faculty_count'], cs['sections'], cs['contact_hours'], cs['overloaded']), (2, 3, 9.0, 1))
+        self.assertEqual([member['name'] for member in cs['faculty']], ["Ana Cruz", "John Doe"])
+
+    def test_department_admin_only_sees_their_department(self):
+        admin = AdminUser.objects.create(
+            name="Chair", email="chair@up.edu.ph", user_id="chair", password="secret", department=self.math
+        )
+        data = self.client.get(self.url, {'admin_id': admin.id, 'department': self.cs.id}).json()
+        self.assertEqual(list(self.faculty_loads(data)), ["Ben Reyes"])
+
+        admin.is_superuser = True
+        admin.save()
+        data = self.client.get(self.url, {'admin_id': admin.id, 'department': self.cs.id}).json()
+        self.assertEqual(set(self.faculty_loads(data)), {"John Doe", "Ana Cruz"})
+
+    def test_other_semesters_are_not_counted(self):
+        other = Semester.objects.create(name="2nd Semester AY 2025-2026")
+        ClassSection.objects.create(
+            course=self.course, section="Z", room=self.room, schedule="S | 7:00 AM - 12:00 PM",
+            faculty=self.reyes, semester=other
+        )
+        loads = self.faculty_loads(self.client.get(self.url).json())
+        self.assertEqual(loads["Ben Reyes"]['contact_hours'], 2.0)
+
+    def test_invalid_department(self):
+        self.assertEqual(self.client.get(self.url, {'department': 'CS'}).status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,47 @@
+from django.test import SimpleTestCase, TestCase
+
+from ..benchmarks import compare_results, percentile, run_benchmarks
+
+
+class PercentileTestCase(SimpleTestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.50), 50)
+        self.assertEqual(percentile(values, 0.95), 95)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.99), 7)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_compare_results(self):
+        before = {'operations': {'course_list': {'p50_ms': 10.0, 'p95_ms': 20.0, 'queries_p50': 4}}}
+        after = {'operations': {'course_list': {'p50_ms': 5.0, 'p95_ms': 30.0, 'queries_p50': 4}}}
+
+        changes = compare_results(before, after)['course_list']
+        self.assertEqual(changes['p50_ms']['change_pct'], -50.0)
+        self.assertEqual(changes['p95_ms']['change_pct'], 50.0)
+        self.assertEqual(changes['queries_p50']['change_pct'], 0.0)
+
+
+class BenchmarkTestCase(TestCase):
+    def test_run_benchmarks(self):
+        results = run_benchmarks(rooms=10, faculty=10, sections=30, iterations=2)
+
+        self.assertEqual(results['dataset']['sections'], 30)
+        self.assertEqual(set(results['operations']), {
+            'check_schedule_conflicts',
+            'conflict_check_view',
+            'course_list',
+            'room_sections_by_day',
+            'section_create',
+            'section_update',
+        })
+        for result in results['operations'].values():
+            self.assertEqual(result['iterations'], 2)
+            self.assertGreater(result['queries_p50'], 0)
+
+        operations = results['operations']
+        self.assertNotIn('status_codes', operations['check_schedule_conflicts'])
+        self.assertEqual(operations['course_list']['status_codes'], {'200': 2})
+        # Writes go to free slots, so they are not answered with 409
+        self.assertEqual(operations['section_create']['status_codes'], {'201': 2})
+        self.assertEqual(operations['section_update']['status_codes'], {'200': 2})
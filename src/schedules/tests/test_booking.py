@@ -0,0 +1,191 @@
+from unittest import mock, skipUnless
+
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..booking import ScheduleConflict, is_overlap_violation, write_section
+from ..models import ClassSection, Course, Department, Faculty, Room, Semester
+from ..semesters import clone_semester
+from ..serializers import ClassSectionCreateSerializer
+
+
+def overlap_violation(constraint='meeting_room_no_overlap'):
+    """IntegrityError as Django raises it for a violated PostgreSQL exclusion constraint"""
+    cause = Exception('conflicting key value violates exclusion constraint')
+    cause.diag = mock.Mock(constraint_name=constraint)
+    error = IntegrityError(*cause.args)
+    error.__cause__ = cause
+    return error
+
+
+class WriteSectionTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.semester = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.semester.activate()
+        department = Department.objects.create(name="Computer Science")
+        self.faculty = Faculty.objects.create(name="John Doe", email="jdoe@up.edu.ph", department=department)
+        self.room = Room.objects.create(room="SCI 402", floor="4")
+        self.other_room = Room.objects.create(room="SCI 404", floor="4")
+
+    def book(self, section, room, schedule, faculty=None):
+        return ClassSection.objects.create(
+            course=Course.objects.get_or_create(course_code="CMSC 126")[0], section=section, type="Lecture",
+            room=room, schedule=schedule, faculty=faculty
+        )
+
+    def test_section_booked_after_the_check_is_a_conflict(self):
+        validate = ClassSectionCreateSerializer.validate
+
+        def validate_then_lose_the_race(serializer, data):
+            data = validate(serializer, data)
+            # Another admin books the room between the check and the write
+            self.book("B", self.room, "M | 11:00 AM - 12:00 PM")
+            return data
+
+        with mock.patch.object(ClassSectionCreateSerializer, 'validate', validate_then_lose_the_race):
+            response = self.client.post(reverse('classsection-list'), {
+                'course_code': 'CMSC 11',
+                'section': 'A',
+                'type': 'Lecture',
+                'room_id': self.room.id,
+                'day': 'M TH',
+                'time': '11:30 AM - 12:30 PM',
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['detail'], "Faculty schedule conflict detected")
+        self.assertEqual(
+            [(c['type'], c['course'], c['section'], c['conflict_day']) for c in response.data['conflicts']],
+            [("room", "CMSC 126", "B", "M")]
+        )
+        # Nothing of the losing request is kept
+        self.assertFalse(Course.objects.filter(course_code="CMSC 11").exists())
+
+    def test_time_must_end_after_it_starts(self):
+        section = self.book("A", self.room, "M | 11:00 AM - 12:00 PM")
+        data = {'course_code': 'CMSC 11', 'section': 'A', 'room_id': self.room.id, 'day': 'T'}
+
+        for time in ('2:00 PM - 1:00 PM', '1:00 PM - 1:00 PM', 'noon'):
+            response = self.client.post(reverse('classsection-list'), {**data, 'time': time}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, time)
+            self.assertIn('time', response.data)
+            response = self.client.patch(
+                reverse('classsection-detail', args=[section.id]), {'time': time}, format='json'
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, time)
+        self.assertEqual(ClassSection.objects.count(), 1)
+
+    def test_update_into_a_booked_slot_is_a_conflict(self):
+        self.book("A", self.room, "M | 11:00 AM - 12:00 PM", self.faculty)
+        section = self.book("B", self.other_room, "T | 11:00 AM - 12:00 PM", self.faculty)
+
+        response = self.client.patch(reverse('classsection-detail', args=[section.id]), {
+            'day': 'M',
+            'time': '11:30 AM - 12:30 PM',
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual([c['type'] for c in response.data['conflicts']], ["faculty"])
+        section.refresh_from_db()
+        self.assertEqual(section.schedule, "T | 11:00 AM - 12:00 PM")
+
+    def test_fallback_checks_again_before_writing(self):
+        self.book("A", self.room, "W | 1:00 PM - 2:00 PM")
+        write = mock.Mock()
+
+        with self.assertRaises(ScheduleConflict) as raised:
+            write_section(write, lambda: [{"type": "room"}], room_id=self.room.id)
+
+        write.assert_not_called()
+        self.assertEqual(raised.exception.conflicts, [{"type": "room"}])
+
+    @skipUnless(connection.vendor == 'sqlite', "SQLite ignores SELECT ... FOR UPDATE")
+    def test_sqlite_takes_the_write_lock_before_checking(self):
+        with CaptureQueriesContext(connection) as queries:
+            write_section(mock.Mock(), lambda: [], room_id=self.room.id, faculty_id=self.faculty.id)
+
+        statements = [query['sql'] for query in queries if 'SAVEPOINT' not in query['sql']]
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith('UPDATE'))
+        self.assertNotIn('FOR UPDATE', statements[0])
+
+    def test_constraint_violation_is_reported_as_conflicts(self):
+        def write():
+            raise overlap_violation()
+
+        with mock.patch('schedules.booking.overlap_enforced', return_value=True):
+            with self.assertRaises(ScheduleConflict) as raised:
+                write_section(write, lambda: [{"type": "room"}], room_id=self.room.id)
+
+        self.assertEqual(raised.exception.conflicts, [{"type": "room"}])
+
+    def test_other_integrity_errors_pass_through(self):
+        def write():
+            raise IntegrityError('UNIQUE constraint failed')
+
+        with self.assertRaises(IntegrityError):
+            write_section(write, lambda: [], room_id=self.room.id)
+        self.assertFalse(is_overlap_violation(IntegrityError('UNIQUE constraint failed')))
+        self.assertTrue(is_overlap_violation(overlap_violation('meeting_faculty_no_overlap')))
+
+    def test_clone_with_conflicts_is_rolled_back_when_enforced(self):
+        self.book("A", self.room, "F | 7:00 AM - 8:00 AM")
+        self.book("B", self.other_room, "F | 7:30 AM - 8:30 AM")
+        target = Semester.objects.create(name="2nd Semester AY 2025-2026")
+
+        with mock.patch('schedules.semesters.overlap_enforced', return_value=True):
+            with self.assertRaises(ScheduleConflict) as raised:
+                clone_semester(self.semester, target, room_map={self.other_room.id: self.room.id})
+
+        self.assertEqual([c['type'] for c in raised.exception.conflicts], ["room"])
+        self.assertFalse(ClassSection.objects.filter(semester=target).exists())
+
+
+class ScheduleConflictViewTestCase(TestCase):
+    def test_reports_room_conflicts(self):
+        Semester.objects.create(name="1st Semester AY 2025-2026").activate()
+        room = Room.objects.create(room="SCI 402", floor="4")
+        ClassSection.objects.create(
+            course=Course.objects.create(course_code="CMSC 126"), section="A", type="Lecture",
+            room=room, schedule="M TH | 11:00 AM - 12:00 PM"
+        )
+
+        response = APIClient().post(reverse('check-conflicts'), {
+            'day': 'TH',
+            'time': '11:30 AM - 12:30 PM',
+            'room': room.id,
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['conflicts'][0]['room'], "SCI 402")
+
+    def test_agrees_with_the_meetings(self):
+        Semester.objects.create(name="1st Semester AY 2025-2026").activate()
+        room = Room.objects.create(room="SCI 402", floor="4")
+        faculty = Faculty.objects.create(
+            name="John Doe", email="jdoe@up.edu.ph", department=Department.objects.create(name="Computer Science")
+        )
+        ClassSection.objects.create(
+            course=Course.objects.create(course_code="CMSC 126"), section="A", type="Lecture",
+            room=room, schedule="TH | 11:00 AM - 12:00 PM", faculty=faculty
+        )
+
+        def check(**data):
+            return APIClient().post(reverse('check-conflicts'), {
+                'time': '11:30 AM - 12:30 PM', 'room': room.id, **data
+            }, format='json')
+
+        # 'T' is a day of its own, not a prefix of 'TH'
+        self.assertEqual(check(day='T').status_code, status.HTTP_200_OK)
+        response = check(day='Thursday', faculty_id=faculty.id)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        # Reported once as a faculty and once as a room conflict
+        self.assertEqual([conflict['type'] for conflict in response.data['conflicts']], ["faculty", "room"])
+        self.assertEqual(check(day='X').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(check(day='TH', time='noon').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(check(day='TH', time='2:00 PM - 1:00 PM').status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,111 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..models import Course, ClassSection, Department, Faculty, Room, Semester
+from ..semesters import clone_semester
+from ..utils import audit_semester_conflicts
+
+
+class CloneSemesterTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.source = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.source.activate()
+        self.target = Semester.objects.create(name="1st Semester AY 2026-2027")
+
+        department = Department.objects.create(name="Computer Science")
+        self.faculty = Faculty.objects.create(name="John Doe", email="jdoe@up.edu.ph", department=department)
+        self.course = Course.objects.create(course_code="CMSC 126")
+        self.room_a = Room.objects.create(room="SCI 402", floor="4")
+        self.room_b = Room.objects.create(room="SCI 404", floor="4")
+
+        ClassSection.objects.create(
+            semester=self.source, course=self.course, section="A", type="Lecture",
+            room=self.room_a, schedule="M TH | 11:00 AM - 12:00 PM", faculty=self.faculty
+        )
+        ClassSection.objects.create(
+            semester=self.source, course=self.course, section="A1", type="Laboratory",
+            room=self.room_b, schedule="T | 9:00 AM - 12:00 PM", faculty=self.faculty
+        )
+
+    def test_clone_copies_sections(self):
+        cloned, conflicts = clone_semester(self.source, self.target)
+
+        self.assertEqual(cloned, 2)
+        self.assertEqual(conflicts, [])
+        copies = ClassSection.objects.filter(semester=self.target)
+        self.assertEqual(
+            sorted(copies.values_list('section', 'room_id', 'faculty_id')),
+            [("A", self.room_a.id, self.faculty.id), ("A1", self.room_b.id, self.faculty.id)]
+        )
+        # The source term is untouched
+        self.assertEqual(ClassSection.objects.filter(semester=self.source).count(), 2)
+
+    def test_clone_drops_faculty_and_swaps_rooms(self):
+        clone_semester(
+            self.source, self.target, drop_faculty=True,
+            room_map={self.room_a.id: self.room_b.id, self.room_b.id: self.room_a.id}
+        )
+
+        copies = ClassSection.objects.filter(semester=self.target)
+        self.assertEqual(
+            sorted(copies.values_list('section', 'room_id', 'faculty_id')),
+            [("A", self.room_b.id, None), ("A1", self.room_a.id, None)]
+        )
+
+    def test_clone_skips_existing_sections(self):
+        ClassSection.objects.create(
+            semester=self.target, course=self.course, section="A", type="Lecture",
+            room=self.room_b, schedule="M TH | 11:00 AM - 12:00 PM"
+        )
+
+        cloned, conflicts = clone_semester(self.source, self.target)
+
+        self.assertEqual(cloned, 1)
+        # The existing section A and the copied lab overlap neither room nor faculty
+        self.assertEqual(conflicts, [])
+        self.assertEqual(ClassSection.objects.filter(semester=self.target).count(), 2)
+
+    def test_audit_reports_each_conflicting_pair_once(self):
+        # bulk_create writes no meetings, so the overlap is not rejected on PostgreSQL
+        ClassSection.objects.bulk_create([ClassSection(
+            semester=self.source, course=self.course, section="B", type="Lecture",
+            room=self.room_a, schedule="M TH | 11:30 AM - 1:00 PM", faculty=self.faculty
+        )])
+
+        conflicts = audit_semester_conflicts(self.source)
+
+        self.assertEqual(sorted(c['type'] for c in conflicts), ["faculty", "room"])
+
+    def test_clone_endpoint(self):
+        url = reverse('semester-clone', args=[self.source.id])
+        response = self.client.post(url, {
+            'name': '2nd Semester AY 2025-2026',
+            'drop_faculty': True,
+            'activate': True,
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['cloned_sections'], 2)
+        self.assertEqual(Semester.objects.active().name, '2nd Semester AY 2025-2026')
+
+    def test_clone_endpoint_requires_target(self):
+        response = self.client.post(reverse('semester-clone', args=[self.source.id]), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_clone_command(self):
+        out = StringIO()
+        call_command(
+            'clone_semester', str(self.source.id), 'Midyear 2026',
+            '--room-map', 'SCI 402=SCI 404', stdout=out
+        )
+
+        self.assertIn('Cloned 2 sections', out.getvalue())
+        target = Semester.objects.get(name='Midyear 2026')
+        self.assertEqual(ClassSection.objects.filter(semester=target, room=self.room_b).count(), 2)
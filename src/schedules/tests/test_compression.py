@@ -0,0 +1,119 @@
+import gzip
+import json
+
+import brotli
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from ..compression import compress_response, negotiate
+from ..models import Room
+from .test_throttling import throttle_settings
+
+
+class NegotiateTestCase(SimpleTestCase):
+    def test_preferences(self):
+        self.assertEqual(negotiate('gzip, deflate, br'), 'br')
+        self.assertEqual(negotiate('gzip, br;q=0.5'), 'gzip')
+        self.assertEqual(negotiate('gzip'), 'gzip')
+        self.assertEqual(negotiate('*'), 'br')
+        self.assertEqual(negotiate('br;q=0, *'), 'gzip')
+
+    def test_identity(self):
+        self.assertIsNone(negotiate(''))
+        self.assertIsNone(negotiate('deflate'))
+        self.assertIsNone(negotiate('gzip;q=0'))
+        self.assertIsNone(negotiate('gzip;q=oops'))
+
+
+@override_settings(API_COMPRESSION_MIN_SIZE=100)
+class CompressResponseTestCase(SimpleTestCase):
+    content = json.dumps([{'room': f"SCI {number}", 'floor': '4'} for number in range(50)]).encode()
+
+    def test_round_trips(self):
+        response = HttpResponse(self.content)
+        response['ETag'] = '"3"'
+        self.assertTrue(compress_response(response, 'br'))
+        self.assertEqual(brotli.decompress(response.content), self.content)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['ETag'], 'W/"3"')
+
+        response = HttpResponse(self.content)
+        self.assertTrue(compress_response(response, 'gzip'))
+        self.assertEqual(gzip.decompress(response.content), self.content)
+
+    def test_small_responses_are_left_alone(self):
+        response = HttpResponse(b'[]')
+        self.assertFalse(compress_response(response, 'br'))
+        self.assertEqual(response.content, b'[]')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_streaming_responses_are_left_alone(self):
+        response = StreamingHttpResponse(iter([self.content]))
+        self.assertFalse(compress_response(response, 'br'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+@override_settings(API_COMPRESSION_MIN_SIZE=100, API_RESPONSE_CACHE_SECONDS=60)
+class ResponseCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        for number in range(20):
+            Room.objects.create(room=f"SCI {400 + number}", floor="4")
+
+    def get_rooms(self, encoding='br'):
+        return self.client.get(reverse('room-list'), HTTP_ACCEPT_ENCODING=encoding)
+
+    def test_hit_is_served_compressed_without_queries(self):
+        first = self.get_rooms()
+        self.assertEqual(first['Content-Encoding'], 'br')
+        self.assertNotIn('X-Response-Cache', first)
+
+        with self.assertNumQueries(0):
+            second = self.get_rooms()
+        self.assertEqual(second['X-Response-Cache'], 'hit')
+        self.assertEqual(second['Content-Encoding'], 'br')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(json.loads(brotli.decompress(second.content))['count'], 20)
+
+    def test_encodings_are_cached_separately(self):
+        self.get_rooms('br')
+        response = self.get_rooms('gzip')
+        self.assertNotIn('X-Response-Cache', response)
+        self.assertEqual(json.loads(gzip.decompress(response.content))['count'], 20)
+        response = self.get_rooms('')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.json()['count'], 20)
+
+    def test_writes_invalidate(self):
+        self.get_rooms()
+        with self.captureOnCommitCallbacks(execute=True):
+            Room.objects.create(room="AS 101", floor="1")
+
+        response = self.get_rooms()
+        self.assertNotIn('X-Response-Cache', response)
+        self.assertEqual(json.loads(brotli.decompress(response.content))['count'], 21)
+
+    def test_detail_is_not_cached(self):
+        url = reverse('room-detail', args=["SCI 400"])
+        self.client.get(url)
+        self.assertNotIn('X-Response-Cache', self.client.get(url))
+
+    @throttle_settings(read='2/minute')
+    def test_hits_are_throttled(self):
+        self.get_rooms()
+        self.assertEqual(self.get_rooms()['X-Response-Cache'], 'hit')
+
+        response = self.get_rooms()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+    @override_settings(API_RESPONSE_CACHE_SECONDS=0)
+    def test_disabled(self):
+        self.get_rooms()
+        self.assertNotIn('X-Response-Cache', self.get_rooms())
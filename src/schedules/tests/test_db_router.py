@@ -0,0 +1,99 @@
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, RequestFactory, override_settings
+from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from main.db_router import (
+    PrimaryReplicaRouter,
+    ReplicaPinningMiddleware,
+    _replica_reads,
+    replica_reads,
+)
+from ..mixins import ReplicaReadMixin
+from ..models import Course
+
+
+class ReplicaProbeViewSet(ReplicaReadMixin, viewsets.ViewSet):
+    """Reports whether the current action was allowed to read from a replica"""
+
+    def list(self, request):
+        return Response({"replica": _replica_reads.get()})
+
+    def create(self, request):
+        return Response({"replica": _replica_reads.get()})
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class PrimaryReplicaRouterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_use_primary_unless_opted_in(self):
+        self.assertEqual(self.router.db_for_read(Course), 'default')
+
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Course), 'replica1')
+
+        self.assertEqual(self.router.db_for_read(Course), 'default')
+
+    def test_writes_always_use_primary(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_write(Course), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Course), 'default')
+
+    def test_replicas_are_not_migrated(self):
+        self.assertTrue(self.router.allow_migrate('default', 'schedules'))
+        self.assertFalse(self.router.allow_migrate('replica1', 'schedules'))
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class PrimaryReplicaTransactionTestCase(TestCase):
+    def test_reads_inside_transaction_use_primary(self):
+        # TestCase wraps every test in a transaction
+        with replica_reads():
+            self.assertEqual(PrimaryReplicaRouter().db_for_read(Course), 'default')
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaReadMixinTestCase(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = ReplicaProbeViewSet.as_view({'get': 'list', 'post': 'create'})
+
+    def test_read_actions_opt_in(self):
+        response = self.view(self.factory.get('/probe/'))
+        self.assertTrue(response.data['replica'])
+
+    def test_write_actions_stay_on_primary(self):
+        response = self.view(self.factory.post('/probe/'))
+        self.assertFalse(response.data['replica'])
+
+    def test_pinned_client_reads_from_primary(self):
+        request = self.factory.get('/probe/')
+        request.COOKIES['db_primary_pin'] = '1'
+        response = self.view(request)
+        self.assertFalse(response.data['replica'])
+
+
+class ReplicaPinningMiddlewareTestCase(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = ReplicaPinningMiddleware(lambda request: HttpResponse())
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_write_pins_client_to_primary(self):
+        response = self.middleware(self.factory.post('/api/schedules/courses/'))
+        self.assertIn('db_primary_pin', response.cookies)
+
+        response = self.middleware(self.factory.get('/api/schedules/courses/'))
+        self.assertNotIn('db_primary_pin', response.cookies)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_pin_without_replicas(self):
+        response = self.middleware(self.factory.post('/api/schedules/courses/'))
+        self.assertNotIn('db_primary_pin', response.cookies)
@@ -0,0 +1,161 @@
+import asyncio
+import json
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import ClassSection, Course, Department, Faculty, Room, Semester
+from .. import events
+
+
+class RecordingBroker:
+    """Broker keeping every published event, for tests"""
+    published = []
+
+    def publish(self, event):
+        self.published.append(event)
+
+
+@override_settings(SCHEDULE_EVENTS_BROKER='schedules.tests.test_events.RecordingBroker')
+class SectionEventsTestCase(TestCase):
+    def setUp(self):
+        events.reset_broker()
+        RecordingBroker.published = []
+        self.addCleanup(events.reset_broker)
+        self.semester = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.semester.activate()
+        self.department = Department.objects.create(name="Computer Science")
+        self.faculty = Faculty.objects.create(name="John Doe", email="jdoe@up.edu.ph", department=self.department)
+        self.room = Room.objects.create(room="SCI 402", floor="4")
+        self.other_room = Room.objects.create(room="AS 101", floor="1")
+        self.course = Course.objects.create(course_code="CMSC 126")
+
+    def create_section(self):
+        return ClassSection.objects.create(
+            course=self.course, section="A", type="Lecture",
+            room=self.room, schedule="M TH | 11:00 AM - 12:00 PM", faculty=self.faculty
+        )
+
+    def test_events_are_published_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            section = self.create_section()
+        self.assertEqual(RecordingBroker.published, [])
+
+        for callback in callbacks:
+            callback()
+        event, = RecordingBroker.published
+        self.assertEqual(event['type'], events.CREATED)
+        self.assertEqual(event['id'], section.id)
+        self.assertEqual(event['course'], "CMSC 126")
+        self.assertEqual((event['room'], event['floor']), (self.room.id, "4"))
+        self.assertEqual((event['faculty'], event['department']), (self.faculty.id, self.department.id))
+
+    def test_moved_section_names_its_previous_room(self):
+        self.create_section()
+        section = ClassSection.objects.get()
+        section.room = self.other_room
+        with self.captureOnCommitCallbacks(execute=True):
+            section.save()
+
+        event, = RecordingBroker.published
+        self.assertEqual(event['type'], events.UPDATED)
+        self.assertEqual((event['room'], event['floor']), (self.other_room.id, "1"))
+        self.assertEqual((event['previous_room'], event['previous_floor']), (self.room.id, "4"))
+        self.assertNotIn('previous_faculty', event)
+        # Displays of both rooms are told
+        self.assertTrue(events.matches(event, {'room': str(self.room.id)}))
+        self.assertTrue(events.matches(event, {'floor': '1'}))
+
+    def test_deleted_section(self):
+        section = self.create_section()
+        section_id = section.id
+        with self.captureOnCommitCallbacks(execute=True):
+            section.delete()
+
+        event, = RecordingBroker.published
+        self.assertEqual((event['type'], event['id']), (events.DELETED, section_id))
+
+    def test_cascaded_deletes_publish_one_reload(self):
+        self.create_section()
+        ClassSection.objects.create(
+            course=self.course, section="B", type="Lecture",
+            room=self.room, schedule="T F | 11:00 AM - 12:00 PM"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.delete()
+
+        self.assertEqual(RecordingBroker.published, [events.reload_event()])
+
+
+class MatchesTestCase(SimpleTestCase):
+    event = {
+        'type': events.UPDATED, 'id': 1, 'room': 3, 'room_name': 'SCI 402', 'floor': '4',
+        'faculty': 7, 'department': 2,
+    }
+
+    def test_filters(self):
+        self.assertTrue(events.matches(self.event, {}))
+        self.assertTrue(events.matches(self.event, {'room': '3', 'floor': '4'}))
+        self.assertTrue(events.matches(self.event, {'room': 'SCI 402'}))
+        self.assertTrue(events.matches(self.event, {'faculty': '7', 'department': '2'}))
+        self.assertFalse(events.matches(self.event, {'room': '4'}))
+        self.assertFalse(events.matches(self.event, {'room': 'SCI 404'}))
+        self.assertFalse(events.matches(self.event, {'room': '3', 'department': '5'}))
+
+    def test_unassigned_faculty_never_matches(self):
+        event = {**self.event, 'faculty': None, 'department': None}
+        self.assertFalse(events.matches(event, {'faculty': 'None'}))
+
+    def test_reload_matches_every_filter(self):
+        self.assertTrue(events.matches(events.reload_event(1), {'room': '99'}))
+
+    def test_slow_subscriber_is_dropped(self):
+        async def overflow():
+            broker = events.LocalBroker()
+            subscription = broker.subscribe()
+            for number in range(events.QUEUE_SIZE + 1):
+                broker.publish({'type': events.CREATED, 'id': number})
+            await asyncio.sleep(0)
+            self.assertEqual(broker.subscribers, set())
+            with self.assertRaises(events.Closed):
+                await subscription.get()
+
+        asyncio.run(overflow())
+
+
+@override_settings(SCHEDULE_EVENTS_BROKER='schedules.events.LocalBroker', SCHEDULE_EVENTS_KEEPALIVE=1)
+class EventStreamTestCase(SimpleTestCase):
+    def setUp(self):
+        events.reset_broker()
+        self.addCleanup(events.reset_broker)
+
+    async def test_stream_sends_matching_events(self):
+        response = await self.async_client.get(reverse('section-events'), {'room': 'SCI 402'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        content = response.streaming_content
+        try:
+            self.assertEqual(await anext(content), b"retry: 5000\n\n")
+            events.publish({'type': events.CREATED, 'id': 1, 'room': 2, 'room_name': 'AS 101'})
+            events.publish({'type': events.CREATED, 'id': 2, 'room': 1, 'room_name': 'SCI 402'})
+
+            message = (await anext(content)).decode()
+            self.assertIn("event: section.created\n", message)
+            self.assertEqual(json.loads(message.split("data: ")[1])['id'], 2)
+            self.assertEqual(await anext(content), b": keepalive\n\n")
+        finally:
+            await content.aclose()
+
+    async def test_closed_stream_unsubscribes(self):
+        stream = events.stream({}, keepalive=1)
+        await anext(stream)
+        self.assertEqual(len(events.get_broker().subscribers), 1)
+        await stream.aclose()
+        self.assertEqual(events.get_broker().subscribers, set())
+
+    async def test_invalid_filter(self):
+        response = await self.async_client.get(reverse('section-events'), {'faculty': 'Doe'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_not_served_over_wsgi(self):
+        response = self.client.get(reverse('section-events'))
+        self.assertEqual(response.status_code, 501)
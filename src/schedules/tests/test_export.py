@@ -0,0 +1,95 @@
+import csv
+import io
+import tempfile
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..export import COLUMNS, export_rows
+from ..models import ClassSection, Course, Department, Faculty, Room, Semester
+
+SHEET_NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+def read_xlsx(content):
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+    return [
+        [cell.findtext('s:is/s:t', namespaces=SHEET_NS) for cell in row.findall('s:c', SHEET_NS)]
+        for row in sheet.findall('s:sheetData/s:row', SHEET_NS)
+    ]
+
+
+class ExportSectionsTestCase(TestCase):
+    def setUp(self):
+        self.semester = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.semester.activate()
+        department = Department.objects.create(name="Computer Science")
+        faculty = Faculty.objects.create(name="Doe, John", email="jdoe@up.edu.ph", department=department)
+        room = Room.objects.create(room="SCI 402", floor="4")
+        ClassSection.objects.create(
+            course=Course.objects.create(course_code="CMSC 126"), section="A", type="Lecture",
+            room=room, schedule="M TH | 11:00 AM - 12:30 PM", faculty=faculty
+        )
+        ClassSection.objects.create(
+            course=Course.objects.create(course_code="CMSC 11"), section="B <1>", type="Laboratory",
+            room=room, schedule="W | 1:00 PM - 4:00 PM"
+        )
+        other = Semester.objects.create(name="2nd Semester AY 2025-2026")
+        ClassSection.objects.create(
+            course=Course.objects.get(course_code="CMSC 11"), section="Z", type="Lecture",
+            room=room, schedule="F | 7:00 AM - 8:00 AM", semester=other
+        )
+
+    def test_rows(self):
+        self.assertEqual(list(export_rows()), [
+            ["1st Semester AY 2025-2026", "CMSC 11", "B <1>", "Laboratory", "W", "1:00 PM", "4:00 PM",
+             "W | 1:00 PM - 4:00 PM", "SCI 402", "4", "", "", ""],
+            ["1st Semester AY 2025-2026", "CMSC 126", "A", "Lecture", "M TH", "11:00 AM", "12:30 PM",
+             "M TH | 11:00 AM - 12:30 PM", "SCI 402", "4", "Doe, John", "jdoe@up.edu.ph", "Computer Science"],
+        ])
+
+    def test_rows_take_one_query_in_chunks(self):
+        with CaptureQueriesContext(connection) as queries:
+            rows = list(export_rows(self.semester, chunk_size=1))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(len(queries), 1)
+
+    def test_csv(self):
+        response = self.client.get('/api/schedules/export/sections.csv', HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="sections-1st-semester-ay-2025-2026.csv"', response['Content-Disposition'])
+
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0], COLUMNS)
+        self.assertEqual([row[1:3] for row in rows[1:]], [["CMSC 11", "B <1>"], ["CMSC 126", "A"]])
+        self.assertEqual(rows[2][10], "Doe, John")
+
+    def test_xlsx(self):
+        other = Semester.objects.get(name="2nd Semester AY 2025-2026")
+        response = self.client.get(f'/api/schedules/export/sections.xlsx?semester={other.id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        rows = read_xlsx(b''.join(response.streaming_content))
+        self.assertEqual(rows[0], COLUMNS)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][:3], ["2nd Semester AY 2025-2026", "CMSC 11", "Z"])
+
+    def test_unknown_file_type(self):
+        self.assertEqual(self.client.get('/api/schedules/export/sections.pdf').status_code, 404)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'sections.xlsx'
+            call_command('export_sections', format='xlsx', output=str(path), stderr=io.StringIO())
+            rows = read_xlsx(path.read_bytes())
+        self.assertEqual([row[2] for row in rows[1:]], ["B <1>", "A"])
@@ -0,0 +1,97 @@
+import datetime
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..ical import escape, fold
+from ..models import ClassSection, Course, Department, Faculty, Room, Semester
+
+
+class ICalendarFormatTestCase(SimpleTestCase):
+    def test_escape(self):
+        self.assertEqual(escape('Doe, John; PhD\nRoom\\1'), 'Doe\\, John\\; PhD\\nRoom\\\\1')
+
+    def test_fold(self):
+        line = 'DESCRIPTION:' + 'é' * 80
+        folded = fold(line)
+        chunks = folded.split('\r\n')[:-1]
+        self.assertTrue(all(len(chunk.encode()) <= 75 for chunk in chunks))
+        self.assertTrue(all(chunk.startswith(' ') for chunk in chunks[1:]))
+        self.assertEqual(''.join(chunk[1:] if i else chunk for i, chunk in enumerate(chunks)), line)
+
+
+class CalendarFeedTestCase(TestCase):
+    def setUp(self):
+        self.semester = Semester.objects.create(
+            name="1st Semester AY 2025-2026",
+            start_date=datetime.date(2025, 8, 13),  # a Wednesday
+            end_date=datetime.date(2025, 12, 12),
+        )
+        self.semester.activate()
+        department = Department.objects.create(name="Computer Science")
+        self.faculty = Faculty.objects.create(name="Doe, John", email="jdoe@up.edu.ph", department=department)
+        self.room = Room.objects.create(room="SCI 402", floor="4")
+        self.section = ClassSection.objects.create(
+            course=Course.objects.create(course_code="CMSC 126"), section="A", type="Lecture",
+            room=self.room, schedule="M TH | 11:00 AM - 12:30 PM", faculty=self.faculty
+        )
+
+    def feed(self, path, **headers):
+        response = self.client.get(path, **headers)
+        content = b''.join(response.streaming_content).decode() if response.status_code == 200 else ''
+        return response, content
+
+    def test_faculty_feed(self):
+        response, content = self.feed(f'/api/schedules/faculty/{self.faculty.id}/schedules.ics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertIn('filename="faculty-doe-john.ics"', response['Content-Disposition'])
+        self.assertTrue(content.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(content.endswith('END:VCALENDAR\r\n'))
+        self.assertIn('TZID:Asia/Manila\r\n', content)
+        self.assertIn('TZOFFSETTO:+0800\r\n', content)
+        # First meeting: the Thursday after the Wednesday start
+        self.assertIn('DTSTART;TZID=Asia/Manila:20250814T110000\r\n', content)
+        self.assertIn('DTEND;TZID=Asia/Manila:20250814T123000\r\n', content)
+        self.assertIn('RRULE:FREQ=WEEKLY;BYDAY=MO,TH;UNTIL=20251212T155959Z\r\n', content)
+        self.assertIn('SUMMARY:CMSC 126 A (Lecture)\r\n', content)
+        self.assertIn('LOCATION:SCI 402\r\n', content)
+        self.assertIn('DESCRIPTION:Faculty: Doe\\, John\r\n', content)
+
+    def test_room_feed(self):
+        response, content = self.feed('/api/schedules/rooms/SCI 402/sections.ics')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content.count('BEGIN:VEVENT'), 1)
+
+        # The JSON endpoints are unchanged
+        response = self.client.get('/api/schedules/rooms/SCI 402/sections/')
+        self.assertEqual(response.json()[0]['section'], 'A')
+
+    def test_etag_and_not_modified(self):
+        path = f'/api/schedules/faculty/{self.faculty.id}/schedules.ics'
+        response, _ = self.feed(path)
+        etag = response['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response, _ = self.feed(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        # Faculty, semester and one aggregate; no section is loaded
+        self.assertEqual(len(queries), 3)
+
+        self.section.schedule = "T F | 11:00 AM - 12:30 PM"
+        self.section.save()
+        response, content = self.feed(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('BYDAY=TU,FR', content)
+
+    def test_other_semester(self):
+        other = Semester.objects.create(name="2nd Semester AY 2025-2026")
+        response, content = self.feed(f'/api/schedules/faculty/{self.faculty.id}/schedules.ics?semester={other.id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('BEGIN:VEVENT', content)
+        response = self.client.get(f'/api/schedules/faculty/{self.faculty.id}/schedules.ics?semester=999')
+        self.assertEqual(response.status_code, 404)
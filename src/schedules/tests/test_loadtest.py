@@ -0,0 +1,104 @@
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from ..loadtest import (
+    LoadClient, LoadReplay, discover_targets, load_recording, parse_mix, save_recording, summarize_results,
+    synthetic_mix
+)
+from ..models import Semester
+from ..synthetic import CampusGenerator
+
+TARGETS = {
+    'courses': [1, 2],
+    'rooms': [(1, 'CL 1'), (2, 'Room 201')],
+    'faculty': [1, 2, 3],
+    'sections': [10, 11],
+}
+
+
+class LoadMixTestCase(SimpleTestCase):
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('browse_courses=40, section_edit=0'), {'browse_courses': 40, 'section_edit': 0})
+        with self.assertRaises(ValueError):
+            parse_mix('browse=10')
+        with self.assertRaises(ValueError):
+            parse_mix('section_edit=0')
+
+    def test_synthetic_mix_is_reproducible(self):
+        requests = synthetic_mix(TARGETS, 200, seed=3)
+
+        self.assertEqual(requests, synthetic_mix(TARGETS, 200, seed=3))
+        self.assertEqual(
+            {request['kind'] for request in requests},
+            {'browse_courses', 'poll_room_schedule', 'conflict_probe', 'section_edit'}
+        )
+        self.assertIn('/rooms/Room%20201/sections/by-day/', ''.join(request['path'] for request in requests))
+
+    def test_recording_round_trip(self):
+        requests = synthetic_mix(TARGETS, 20, seed=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'mix.jsonl')
+            save_recording(requests, path)
+            self.assertEqual(load_recording(path), requests)
+
+            with open(path, 'w') as f:
+                f.write(json.dumps({'method': 'GET', 'path': '/api/schedules/rooms/?page=2'}) + '\n')
+            self.assertEqual(load_recording(path)[0]['kind'], 'GET /api/schedules/rooms/')
+
+    def test_summarize_results(self):
+        results = [
+            ('section_edit', 200, 0.010),
+            ('section_edit', 409, 0.020),
+            ('section_edit', 500, 0.030),
+            ('section_edit', None, 0.040),
+            ('browse_courses', 429, 0.001),
+        ]
+        summary = summarize_results(results, elapsed=0.5, concurrency=2)
+
+        self.assertEqual(summary['requests'], 5)
+        self.assertEqual(summary['throughput_rps'], 10.0)
+        self.assertEqual(summary['error_rate'], 0.4)
+        self.assertEqual(summary['conflict_rate'], 0.2)
+        self.assertEqual(summary['throttled_rate'], 0.2)
+        self.assertEqual(summary['status_codes'], {'200': 1, '409': 1, '429': 1, '500': 1, 'None': 1})
+        self.assertEqual(summary['kinds']['section_edit']['p50_ms'], 20.0)
+        self.assertEqual(summary['kinds']['section_edit']['conflict_rate'], 0.25)
+
+
+class LoadReplayTestCase(LiveServerTestCase):
+    def setUp(self):
+        cache.clear()
+        Semester.objects.create(name="1st Semester AY 2025-2026").activate()
+        CampusGenerator(rooms=6, faculty=6, sections=20, seed=1).generate()
+
+    def test_replay_against_live_server(self):
+        client = LoadClient(self.live_server_url)
+        with redirect_stdout(io.StringIO()):
+            requests = synthetic_mix(discover_targets(client), 40, seed=2)
+            summary = LoadReplay(client, requests, concurrency=4).run()
+
+        self.assertEqual(summary['requests'], 40)
+        self.assertEqual(summary['error_rate'], 0.0)
+        self.assertEqual(sum(summary['status_codes'].values()), 40)
+        self.assertEqual(set(summary['kinds']), {request['kind'] for request in requests})
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            record = os.path.join(directory, 'mix.jsonl')
+            output = os.path.join(directory, 'results.json')
+            with redirect_stdout(io.StringIO()):
+                call_command(
+                    'replay_load', url=self.live_server_url, requests=12, concurrency=2,
+                    record=record, output=output, stdout=io.StringIO()
+                )
+
+            self.assertEqual(len(load_recording(record)), 12)
+            with open(output) as f:
+                self.assertEqual(json.load(f)['requests'], 12)
@@ -0,0 +1,64 @@
+from django.test import TestCase
+
+from ..models import ClassMeeting, ClassSection, Course, Department, Faculty, Room, Semester
+from ..semesters import clone_semester
+from ..synthetic import CampusGenerator
+
+
+class ClassMeetingTestCase(TestCase):
+    def setUp(self):
+        self.semester = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.semester.activate()
+        department = Department.objects.create(name="Computer Science")
+        self.faculty = Faculty.objects.create(name="John Doe", email="jdoe@up.edu.ph", department=department)
+        self.room = Room.objects.create(room="SCI 402", floor="4")
+        self.other_room = Room.objects.create(room="SCI 404", floor="4")
+        self.section = ClassSection.objects.create(
+            course=Course.objects.create(course_code="CMSC 126"), section="A", type="Lecture",
+            room=self.room, schedule="M TH | 11:00 AM - 12:30 PM", faculty=self.faculty
+        )
+
+    def meetings(self, section):
+        return list(section.meetings.order_by('day').values_list('day', 'start_minute', 'end_minute', 'room_id'))
+
+    def test_save_creates_meetings(self):
+        self.assertEqual(self.meetings(self.section), [('M', 660, 750, self.room.id), ('TH', 660, 750, self.room.id)])
+        meeting = self.section.meetings.first()
+        self.assertEqual((meeting.semester_id, meeting.faculty_id), (self.semester.id, self.faculty.id))
+
+    def test_save_rebuilds_meetings(self):
+        self.section.schedule = "F | 1:00 PM - 4:00 PM"
+        self.section.room = self.other_room
+        self.section.save()
+        self.assertEqual(self.meetings(self.section), [('F', 780, 960, self.other_room.id)])
+
+        # Fields the meetings do not copy leave them alone
+        self.section.type = "Laboratory"
+        self.section.save(update_fields=['type'])
+        self.assertEqual(ClassMeeting.objects.count(), 1)
+
+        self.section.schedule = "not a schedule"
+        self.section.save()
+        self.assertEqual(self.meetings(self.section), [])
+
+    def test_meetings_follow_faculty_and_section_deletes(self):
+        self.faculty.delete()
+        self.assertEqual(set(ClassMeeting.objects.values_list('faculty_id', flat=True)), {None})
+
+        self.section.delete()
+        self.assertFalse(ClassMeeting.objects.exists())
+
+    def test_clone_copies_meetings(self):
+        target = Semester.objects.create(name="2nd Semester AY 2025-2026")
+        clone_semester(self.semester, target, drop_faculty=True, room_map={self.room.id: self.other_room.id})
+        clone_semester(self.semester, target)
+
+        copy = ClassSection.objects.get(semester=target)
+        self.assertEqual(self.meetings(copy), [('M', 660, 750, self.other_room.id), ('TH', 660, 750, self.other_room.id)])
+        self.assertEqual(set(copy.meetings.values_list('semester_id', 'faculty_id')), {(target.id, None)})
+
+    def test_bulk_generated_sections_have_meetings(self):
+        CampusGenerator(rooms=4, faculty=4, sections=12, seed=1).generate()
+
+        for section in ClassSection.objects.exclude(pk=self.section.pk):
+            self.assertEqual(section.meetings.count(), len(section.schedule.split('|')[0].split()))
@@ -0,0 +1,48 @@
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from main.metrics import pool_stats
+
+
+class FakePool:
+    def get_stats(self):
+        return {
+            'pool_min': 2,
+            'pool_max': 10,
+            'pool_size': 6,
+            'pool_available': 1,
+            'requests_waiting': 3,
+            'requests_num': 40,
+            'requests_wait_ms': 200,
+        }
+
+
+class PoolStatsTestCase(SimpleTestCase):
+    def test_pool_stats_summary(self):
+        stats = pool_stats(FakePool())
+        self.assertEqual(stats['in_use'], 5)
+        self.assertEqual(stats['waiting'], 3)
+        self.assertEqual(stats['wait_ms_total'], 200)
+        self.assertEqual(stats['wait_ms_avg'], 5)
+        # Counters psycopg_pool has not incremented yet are reported as zero
+        self.assertEqual(stats['requests_errors'], 0)
+
+
+class MetricsEndpointTestCase(TestCase):
+    def test_metrics_reports_database_connections(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@up.edu.ph', 'secret'))
+        response = self.client.get('/metrics/')
+        self.assertEqual(response.status_code, 200)
+
+        default = response.json()['databases']['default']
+        self.assertTrue(default['health_checks'])
+        self.assertIsNone(default['pool'])
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_only_superusers_and_token_holders(self):
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+        self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.client.force_login(User.objects.create_user('staff', 'staff@up.edu.ph', 'secret', is_staff=True))
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+
+        self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
@@ -0,0 +1,69 @@
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+from django.contrib.auth.models import User
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import TestCase, override_settings
+
+from main.profiling import ProfilingMiddleware
+from ..models import Course, Semester
+
+
+@override_settings(REQUEST_PROFILING=True)
+class ProfilingMiddlewareTestCase(TestCase):
+    def setUp(self):
+        Semester.objects.create(name="1st Semester AY 2025-2026").activate()
+        Course.objects.create(course_code='CMSC 128')
+        self.superuser = User.objects.create_superuser('root', 'root@up.edu.ph', 'secret')
+        self.staff = User.objects.create_user('staff', 'staff@up.edu.ph', 'secret', is_staff=True)
+
+    def get(self, path):
+        with redirect_stdout(io.StringIO()):
+            return self.client.get(path)
+
+    def test_text_report_for_superusers(self):
+        self.client.force_login(self.superuser)
+        response = self.get('/api/schedules/courses/?profile=1')
+
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        report = response.content.decode()
+        self.assertIn('GET /api/schedules/courses/?profile=1 -> 200', report)
+        self.assertIn('schedules_course', report)
+        self.assertIn('cumulative', report)
+
+    def test_json_report(self):
+        self.client.force_login(self.superuser)
+        report = self.get('/api/schedules/courses/?profile=json').json()
+
+        self.assertEqual(report['status'], 200)
+        self.assertGreater(report['sql_count'], 0)
+        self.assertEqual(report['sql_count'], len(report['queries']))
+        self.assertTrue(any('schedules_course' in query['sql'] for query in report['queries']))
+
+    def test_store_keeps_the_response(self):
+        self.client.force_login(self.superuser)
+        with tempfile.TemporaryDirectory() as directory, self.settings(REQUEST_PROFILING_DIR=directory):
+            response = self.get('/api/schedules/courses/?profile=store')
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()[0]['course_code'], 'CMSC 128')
+            name = response['X-Profile-Report']
+            self.assertEqual(
+                sorted(os.listdir(directory)),
+                [f'{name}.json', f'{name}.prof', f'{name}.txt']
+            )
+
+    def test_ignored_for_other_users(self):
+        response = self.get('/api/schedules/courses/?profile=1')
+        self.assertEqual(response.json()[0]['course_code'], 'CMSC 128')
+
+        self.client.force_login(self.staff)
+        response = self.get('/api/schedules/courses/?profile=1')
+        self.assertEqual(response.json()[0]['course_code'], 'CMSC 128')
+
+    def test_not_loaded_when_disabled(self):
+        with self.settings(REQUEST_PROFILING=False):
+            with self.assertRaises(MiddlewareNotUsed):
+                ProfilingMiddleware(lambda request: None)
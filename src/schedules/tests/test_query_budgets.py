@@ -0,0 +1,241 @@
+"""
+Query-count budgets for every route in schedules/urls.py.
+
+Each endpoint is called against a small and a larger synthetic campus. A test
+fails when an endpoint's query count grows with the number of rows (an N+1
+query) or exceeds the budget declared below. When an endpoint legitimately
+needs another query, raise its budget here in the same change and say why.
+The routes are read from the URL resolver, so a new route fails the test
+until it has a budget or is listed in UNBUDGETED_ROUTES with a reason.
+
+Query counts include the SAVEPOINT and RELEASE statements of atomic blocks.
+"""
+
+import io
+from contextlib import redirect_stdout
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, resolve
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ..models import AdminUser, ClassSection, Course, Department, Faculty, Room, Semester
+from ..synthetic import CampusGenerator
+from .. import sync
+
+# Maximum number of queries per endpoint, independent of the dataset size
+QUERY_BUDGETS = {
+    'api-root': 0,
+    'course-list': 2,
+    'course-detail': 2,
+    # The delete leaves a tombstone for the sync feed
+    'course-delete-section': 6,
+    'classsection-list': 2,
+    'classsection-list-filtered': 2,
+    'classsection-detail': 1,
+    # The semester; the conflict check, then the lock and the check again
+    # (see booking.py); the course, created if new, and the room and faculty;
+    # the section and its meetings; two savepoints
+    'classsection-create': 14,
+    # The section; the conflict check, the lock and the check again; the
+    # section, its meetings replaced (delete and insert); one savepoint
+    'classsection-update': 9,
+    'department-list': 2,
+    'department-detail': 1,
+    'faculty-list': 1,
+    'faculty-list-admin-scope': 2,
+    'faculty-detail': 2,
+    'faculty-schedules': 2,
+    # The faculty member, the semester, the feed's ETag in one aggregate, then the sections
+    'faculty-schedules-ics': 4,
+    'adminuser-list': 2,
+    'adminuser-detail': 1,
+    'adminuser-authenticate': 1,
+    'room-list': 2,
+    'room-detail': 1,
+    'room-sections': 2,
+    # The room, the semester, the feed's ETag in one aggregate, then the sections
+    'room-sections-ics': 4,
+    'room-sections-by-day': 2,
+    # Meetings on the days, section types per room, the course's rooms, then every room
+    'room-recommend': 4,
+    'semester-list': 2,
+    'semester-detail': 1,
+    'semester-activate': 5,
+    # The copies are stamped again just before the commit, for the sync feed
+    'semester-clone': 13,
+    # Faculty and room conflicts in one query over the meetings
+    'check-conflicts': 1,
+    'new-semester': 9,
+    # Rebuilding the search index takes one query per model
+    'search': 3,
+    # The semester, then every section in one query however many chunks it is read in
+    'export-sections-csv': 2,
+    'export-sections-xlsx': 2,
+    # One query per synced model and one for the tombstones
+    'changes': 6,
+    # The semester, booked minutes per room and day in one grouped query, then the rooms
+    'room-utilization': 3,
+    # The admin, the semester, then every faculty member's meetings in one grouped query
+    'teaching-load': 3,
+}
+
+# Routes under api/schedules/ that are not called here, and why
+UNBUDGETED_ROUTES = {
+    'section-events': "the event stream never ends and issues no queries; see test_events.py",
+}
+
+
+def route_names(patterns, prefix=''):
+    """{name: route} of the URL patterns, resolvers included"""
+    names = {}
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            names.update(route_names(pattern.url_patterns, route))
+        else:
+            # Format suffix variants (e.g. the .ics feeds) share their route's name
+            names.setdefault(pattern.name, route)
+    return names
+
+
+def schedules_routes():
+    """Names of the routes under api/schedules/, from the URL resolver"""
+    routes = route_names(get_resolver().url_patterns)
+    return {name for name, route in routes.items() if route.startswith('api/schedules/')}
+
+
+class QueryBudgetTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        Semester.objects.create(name="1st Semester AY 2025-2026").activate()
+
+    def endpoints(self):
+        """(method, path, data) for every route, using rows that exist in both datasets"""
+        course = Course.objects.order_by('id').first()
+        section = ClassSection.objects.for_semester().order_by('id').first()
+        room = Room.objects.order_by('id').first()
+        faculty = Faculty.objects.order_by('id').first()
+        department = Department.objects.order_by('id').first()
+        admin = AdminUser.objects.get(user_id='chair')
+        semester = Semester.objects.active()
+        prefix = '/api/schedules'
+
+        return {
+            'api-root': ('get', f'{prefix}/', None),
+            'course-list': ('get', f'{prefix}/courses/', None),
+            'course-detail': ('get', f'{prefix}/courses/{course.id}/', None),
+            'course-delete-section': ('delete', f'{prefix}/courses/{section.course_id}/sections/{section.section}/', None),
+            'classsection-list': ('get', f'{prefix}/sections/', None),
+            'classsection-list-filtered': ('get', f'{prefix}/sections/?course=CMSC&type=Lecture&day=M'
+                                                  f'&time_from=7:00&time_to=19:00&floor={room.floor}', None),
+            'classsection-detail': ('get', f'{prefix}/sections/{section.id}/', None),
+            'classsection-create': ('post', f'{prefix}/sections/', {
+                'course_code': 'BUDGET 101',
+                'section': 'A',
+                'type': 'Lecture',
+                'room_id': room.id,
+                'day': 'M TH',
+                'time': '7:00 PM - 8:00 PM',
+                'faculty_id': faculty.id,
+            }),
+            'classsection-update': ('patch', f'{prefix}/sections/{section.id}/', {
+                'day': 'S',
+                'time': '7:00 AM - 8:00 AM',
+            }),
+            'department-list': ('get', f'{prefix}/departments/', None),
+            'department-detail': ('get', f'{prefix}/departments/{department.id}/', None),
+            'faculty-list': ('get', f'{prefix}/faculty/', None),
+            'faculty-list-admin-scope': ('get', f'{prefix}/faculty/?admin_id={admin.id}', None),
+            'faculty-detail': ('get', f'{prefix}/faculty/{faculty.id}/', None),
+            'faculty-schedules': ('get', f'{prefix}/faculty/{faculty.id}/schedules/', None),
+            'faculty-schedules-ics': ('get', f'{prefix}/faculty/{faculty.id}/schedules.ics', None),
+            'adminuser-list': ('get', f'{prefix}/admins/', None),
+            'adminuser-detail': ('get', f'{prefix}/admins/{admin.id}/', None),
+            'adminuser-authenticate': ('post', f'{prefix}/admins/authenticate/', {
+                'user_id': 'chair',
+                'password': 'secret',
+            }),
+            'room-list': ('get', f'{prefix}/rooms/', None),
+            'room-detail': ('get', f'{prefix}/rooms/{room.room}/', None),
+            'room-sections': ('get', f'{prefix}/rooms/{room.room}/sections/', None),
+            'room-sections-ics': ('get', f'{prefix}/rooms/{room.room}/sections.ics', None),
+            'room-sections-by-day': ('get', f'{prefix}/rooms/{room.room}/sections/by-day/?day=M', None),
+            'room-recommend': ('get', f'{prefix}/rooms/recommend/?day=M TH&time=7:00 PM - 8:00 PM&type=Lecture'
+                                      f'&course={course.course_code}', None),
+            'semester-list': ('get', f'{prefix}/semesters/', None),
+            'semester-detail': ('get', f'{prefix}/semesters/{semester.id}/', None),
+            'semester-activate': ('post', f'{prefix}/semesters/{semester.id}/activate/', None),
+            'semester-clone': ('post', f'{prefix}/semesters/{semester.id}/clone/', {'name': 'Clone Target'}),
+            'check-conflicts': ('post', f'{prefix}/conflicts/check/', {
+                'day': 'M',
+                'time': '8:00 PM - 9:00 PM',
+                'room': room.id,
+                'faculty_id': faculty.id,
+            }),
+            'new-semester': ('post', f'{prefix}/new-semester/', {'name': 'Next Semester'}),
+            'search': ('get', f'{prefix}/search/?q=cmsc', None),
+            'export-sections-csv': ('get', f'{prefix}/export/sections.csv', None),
+            'export-sections-xlsx': ('get', f'{prefix}/export/sections.xlsx?semester={semester.id}', None),
+            'changes': ('get', f'{prefix}/changes/?since={sync.encode_cursor(timezone.now() - timedelta(days=1))}', None),
+            'room-utilization': ('get', f'{prefix}/analytics/rooms/', None),
+            'teaching-load': ('get', f'{prefix}/analytics/faculty-load/?admin_id={admin.id}', None),
+        }
+
+    def count_queries(self):
+        """Call every endpoint, rolling back its changes, and return {name: query count}"""
+        counts = {}
+        for name, (method, path, data) in self.endpoints().items():
+            savepoint = transaction.savepoint()
+            with redirect_stdout(io.StringIO()), CaptureQueriesContext(connection) as queries:
+                response = getattr(self.client, method)(path, data, format='json')
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            transaction.savepoint_rollback(savepoint)
+
+            self.assertLess(response.status_code, 400, f"{name} returned {response.status_code}")
+            counts[name] = len(queries)
+        return counts
+
+    def test_every_route_has_a_budget(self):
+        CampusGenerator(rooms=4, faculty=4, sections=12, seed=1).generate()
+        self.create_admin()
+
+        endpoints = self.endpoints()
+        self.assertEqual(set(endpoints), set(QUERY_BUDGETS))
+
+        called = {resolve(urlsplit(path).path).url_name for _, path, _ in endpoints.values()}
+        routes = schedules_routes()
+        self.assertIn('classsection-list', routes)
+        self.assertEqual(routes - set(UNBUDGETED_ROUTES), called, "Routes without a query budget")
+        self.assertFalse(called & set(UNBUDGETED_ROUTES))
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        CampusGenerator(rooms=4, faculty=4, sections=12, seed=1).generate()
+        self.create_admin()
+        small = self.count_queries()
+
+        # Same seed: the larger campus keeps every row of the small one
+        CampusGenerator(rooms=16, faculty=16, sections=90, seed=1).generate()
+        large = self.count_queries()
+
+        for name, budget in QUERY_BUDGETS.items():
+            with self.subTest(endpoint=name):
+                self.assertEqual(
+                    large[name], small[name],
+                    f"{name} issues {small[name]} queries for the small campus but {large[name]} for the large one"
+                )
+                self.assertLessEqual(small[name], budget, f"{name} exceeds its budget of {budget} queries")
+
+    def create_admin(self):
+        AdminUser.objects.create(
+            name='Department Chair',
+            email='chair@up.edu.ph',
+            user_id='chair',
+            password='secret',
+            department=Department.objects.order_by('id').first()
+        )
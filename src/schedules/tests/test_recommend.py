@@ -0,0 +1,104 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..models import ClassSection, Course, Room, Semester
+from ..recommend import building_of, fit
+
+DAY = (7 * 60, 19 * 60)
+
+
+class FitTestCase(SimpleTestCase):
+    def test_overlap(self):
+        self.assertIsNone(fit([(540, 630)], 600, 660, *DAY))
+        self.assertIsNone(fit([(600, 660)], 600, 660, *DAY))
+
+    def test_adjacent_bookings(self):
+        self.assertEqual(fit([(480, 540), (600, 660)], 540, 600, *DAY), (2, 0))
+
+    def test_short_gaps_are_wasted(self):
+        # 30 minutes after the 9:00 class and 30 before the day starts
+        self.assertEqual(fit([(480, 540)], 570, 630, *DAY), (0, 30))
+        self.assertEqual(fit([], 450, 510, *DAY), (0, 30))
+        self.assertEqual(fit([], 600, 660, *DAY), (0, 0))
+
+    def test_building_of(self):
+        self.assertEqual(building_of("SCI 402"), "SCI")
+        self.assertEqual(building_of("as101"), "AS")
+        self.assertEqual(building_of("402"), "")
+
+
+@override_settings(CAMPUS_DAY_START="7:00 AM", CAMPUS_DAY_END="7:00 PM")
+class RecommendRoomsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('room-recommend')
+        self.semester = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.semester.activate()
+        self.course = Course.objects.create(course_code="CMSC 126")
+        self.other_course = Course.objects.create(course_code="MATH 21")
+        self.lab = Room.objects.create(room="SCI 402", floor="4")
+        self.lecture_room = Room.objects.create(room="SCI 301", floor="3")
+        self.far_room = Room.objects.create(room="AS 301", floor="3")
+        self.busy_room = Room.objects.create(room="AS 101", floor="1")
+
+        self.add_section(self.other_course, "L1", ClassSection.LABORATORY, self.lab, "T | 1:00 PM - 4:00 PM")
+        self.add_section(self.course, "A", ClassSection.LECTURE, self.lecture_room, "T F | 1:00 PM - 2:00 PM")
+        self.add_section(self.other_course, "B", ClassSection.LECTURE, self.busy_room, "M TH | 9:00 AM - 10:00 AM")
+
+    def add_section(self, course, name, section_type, room, schedule):
+        return ClassSection.objects.create(course=course, section=name, type=section_type, room=room, schedule=schedule)
+
+    def recommend(self, **params):
+        response = self.client.get(self.url, {'day': 'M TH', 'time': '9:00 AM - 10:00 AM', **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return response.json()['rooms']
+
+    def test_only_free_rooms(self):
+        rooms = self.recommend()
+        self.assertNotIn("AS 101", [room['room'] for room in rooms])
+        self.assertEqual(len(rooms), 3)
+
+    def test_type_inferred_from_use(self):
+        rooms = self.recommend(type='Laboratory')
+        self.assertEqual(rooms[0]['room'], "SCI 402")
+        self.assertEqual((rooms[0]['type'], rooms[0]['type_match']), ("Laboratory", True))
+        # Never used: neither a match nor a mismatch
+        far_room, = [room for room in rooms if room['room'] == "AS 301"]
+        self.assertIsNone(far_room['type_match'])
+
+    def test_course_building_and_floor_preferred(self):
+        rooms = self.recommend(type='Lecture', course='CMSC 126')
+        self.assertEqual([room['room'] for room in rooms], ["SCI 301", "AS 301", "SCI 402"])
+        self.assertTrue(rooms[0]['same_building'] and rooms[0]['same_floor'])
+
+    def test_requested_floor_preferred(self):
+        rooms = self.recommend(floor='3')
+        self.assertEqual({room['room'] for room in rooms[:2]}, {"SCI 301", "AS 301"})
+
+    def test_less_fragmentation_preferred(self):
+        # Right after the 9:00 class in AS 101, or leaving a 30-minute hole in an empty room
+        Room.objects.create(room="AS 102", floor="1")
+        rooms = self.recommend(time='10:00 AM - 11:00 AM')
+        self.assertEqual(rooms[0]['room'], "AS 101")
+        self.assertEqual(rooms[0]['adjacent_sides'], 1)
+
+        rooms = {room['room']: room for room in self.recommend(time='7:30 AM - 8:30 AM')}
+        self.assertEqual(rooms["AS 102"]['wasted_minutes'], 30)
+        self.assertEqual(rooms["AS 101"]['wasted_minutes'], 60)
+
+    def test_no_query_per_room(self):
+        for number in range(10):
+            Room.objects.create(room=f"EXTRA {number}", floor="2")
+        with self.assertNumQueries(4):
+            self.recommend(type='Lecture', course='CMSC 126')
+
+    def test_invalid_requests(self):
+        for params in (
+            {}, {'day': 'M'}, {'day': 'X', 'time': '9:00 AM - 10:00 AM'},
+            {'day': 'M', 'time': '10:00 AM - 9:00 AM'},
+            {'day': 'M', 'time': '9:00 AM - 10:00 AM', 'type': 'Seminar'},
+            {'day': 'M', 'time': '9:00 AM - 10:00 AM', 'limit': '0'},
+        ):
+            self.assertEqual(self.client.get(self.url, params).status_code, status.HTTP_400_BAD_REQUEST, params)
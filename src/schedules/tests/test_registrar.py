@@ -0,0 +1,153 @@
+import csv
+import io
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from ..export import stream_export
+from ..models import ClassMeeting, ClassSection, Course, Department, Faculty, Room, Semester
+from ..registrar import RegistrarImport
+
+HEADER = "Course,Section,Type,Schedule,Room,Floor,Faculty,Faculty Email,Department\n"
+
+
+class RegistrarImportTestCase(TestCase):
+    def setUp(self):
+        self.semester = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.semester.activate()
+        self.department = Department.objects.create(name="Computer Science")
+        self.faculty = Faculty.objects.create(name="Doe, John", email="jdoe@up.edu.ph", department=self.department)
+        self.room = Room.objects.create(room="SCI 402", floor="4")
+        self.existing = ClassSection.objects.create(
+            course=Course.objects.create(course_code="CMSC 126"), section="A", type="Lecture",
+            room=self.room, schedule="M TH | 11:00 AM - 12:00 PM", faculty=self.faculty
+        )
+
+    def run_import(self, rows, **kwargs):
+        return RegistrarImport(self.semester).run(io.StringIO(HEADER + rows), **kwargs)
+
+    def test_upserts_by_natural_keys(self):
+        result = self.run_import(
+            'cmsc 11,A,lecture,T F | 1:00 PM - 2:30 PM,SCI 402,4,"Doe, John A.",jdoe@up.edu.ph,Mathematics\n'
+            'CMSC 11,B,Laboratory,W | 8:00 AM - 11:00 AM,SCI 301,3,"Cruz, Ana",acruz@up.edu.ph,Physics\n'
+            'CMSC 11,C,Laboratory,F | 8:00 AM - 11:00 AM,SCI 302,3,,acruz@up.edu.ph,\n'
+            'CMSC 126,A,Lecture,M TH | 2:00 PM - 3:00 PM,SCI 402,4,,,\n'
+        )
+
+        self.assertEqual(result.errors, [])
+        self.assertEqual(result.counts, {
+            'rows': 4, 'skipped': 0,
+            'departments_created': 2, 'rooms_created': 2, 'faculty_created': 1, 'faculty_updated': 1,
+            'courses_created': 1, 'sections_created': 3, 'sections_updated': 1,
+        })
+
+        self.faculty.refresh_from_db()
+        self.assertEqual((self.faculty.name, self.faculty.department.name), ("Doe, John A.", "Mathematics"))
+        self.assertEqual(Faculty.objects.get(email="acruz@up.edu.ph").department.name, "Physics")
+
+        section = ClassSection.objects.get(course__course_code="CMSC 11", section="A")
+        self.assertEqual((section.type, section.room, section.faculty), ("Lecture", self.room, self.faculty))
+        self.assertEqual(section.schedule, "T F | 1:00 PM - 2:30 PM")
+        self.assertEqual(sorted(section.meetings.values_list('day', 'start_minute', 'end_minute')),
+                         [('F', 780, 870), ('T', 780, 870)])
+
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.schedule, "M TH | 2:00 PM - 3:00 PM")
+        self.assertIsNone(self.existing.faculty)
+        self.assertEqual(sorted(self.existing.meetings.values_list('day', 'start_minute')), [('M', 840), ('TH', 840)])
+
+    def test_bad_rows_are_reported_and_skipped(self):
+        result = self.run_import(
+            'CMSC 11,A,Lecture,M | 7:00 AM - 8:00 AM,SCI 402,4,,,\n'
+            'CMSC 11,A,Lecture,T | 7:00 AM - 8:00 AM,SCI 402,4,,,\n'
+            'CMSC 11,B,Seminar,M | 7:00 AM - 8:00 AM,SCI 403,4,,,\n'
+            'CMSC 11,C,Lecture,someday,SCI 403,4,,,\n'
+            'CMSC 11,D,Lecture,M | 9:00 AM - 8:00 AM,SCI 403,4,,,\n'
+            'CMSC 11,E,Lecture,W | 7:00 AM - 8:00 AM,SCI 403,4,,jdoe@gmail.com,\n'
+            'CMSC 11,F,Lecture,W | 7:00 AM - 8:00 AM,SCI 403,4,,nobody@up.edu.ph,\n'
+            ',G,Lecture,W | 7:00 AM - 8:00 AM,SCI 403,4,,,\n'
+            'CMSC 11,H,Lecture,F | 7:00 AM - 8:00 AM,SCI 404,4,,,\n'
+        )
+
+        self.assertEqual([line for line, _ in result.errors], [3, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(result.errors[0], (3, "Duplicate of line 2"))
+        self.assertIn('does not exist', dict(result.errors)[8])
+        self.assertEqual(result.counts['sections_created'], 2)
+        self.assertEqual(
+            set(ClassSection.objects.filter(course__course_code="CMSC 11").values_list('section', flat=True)),
+            {"A", "H"}
+        )
+        self.assertFalse(Room.objects.filter(room="SCI 403").exists())
+
+    def test_conflicts(self):
+        result = self.run_import(
+            # Overlaps the existing CMSC 126 A in the same room
+            'CMSC 11,A,Lecture,TH | 11:30 AM - 12:30 PM,SCI 402,4,,,\n'
+            # Overlaps line 4 in another room with the same faculty
+            'CMSC 11,B,Lecture,F | 1:00 PM - 2:00 PM,SCI 403,4,,jdoe@up.edu.ph,\n'
+            'CMSC 11,C,Lecture,F | 1:30 PM - 2:30 PM,SCI 404,4,,jdoe@up.edu.ph,\n'
+            # Right after line 3 in the same room
+            'CMSC 11,D,Lecture,F | 2:00 PM - 3:00 PM,SCI 403,4,,,\n'
+        )
+
+        self.assertEqual(result.errors, [
+            (2, "Room conflict on TH with CMSC 126 A"),
+            (4, "Faculty conflict on F with line 3"),
+        ])
+        self.assertEqual(result.counts['sections_created'], 2)
+
+    def test_rows_replacing_a_section_free_its_time(self):
+        result = self.run_import(
+            'CMSC 126,A,Lecture,W | 11:00 AM - 12:00 PM,SCI 402,4,,jdoe@up.edu.ph,\n'
+            'CMSC 11,A,Lecture,M TH | 11:00 AM - 12:00 PM,SCI 402,4,,jdoe@up.edu.ph,\n'
+        )
+        self.assertEqual(result.errors, [])
+        self.assertEqual(ClassMeeting.objects.filter(semester=self.semester, day='M').count(), 1)
+
+    def test_dry_run_keeps_nothing(self):
+        result = self.run_import('CMSC 11,A,Lecture,W | 7:00 AM - 8:00 AM,SCI 403,4,,,\n', dry_run=True)
+        self.assertEqual(result.counts['sections_created'], 1)
+        self.assertFalse(Course.objects.filter(course_code="CMSC 11").exists())
+        self.assertFalse(Room.objects.filter(room="SCI 403").exists())
+
+    def test_export_imports_into_another_semester(self):
+        exported = b''.join(stream_export('csv', self.semester)).decode('utf-8-sig')
+        target = Semester.objects.create(name="2nd Semester AY 2025-2026")
+
+        result = RegistrarImport(target).run(io.StringIO(exported))
+
+        self.assertEqual(result.errors, [])
+        copy = ClassSection.objects.get(semester=target)
+        self.assertEqual(
+            (copy.course, copy.section, copy.room, copy.schedule, copy.faculty),
+            (self.existing.course, "A", self.room, self.existing.schedule, self.faculty)
+        )
+
+    def test_missing_columns(self):
+        with self.assertRaisesMessage(ValueError, 'floor, schedule (or days, start and end)'):
+            RegistrarImport(self.semester).run(io.StringIO("Course,Section,Room\n"))
+
+
+class ImportRegistrarCommandTestCase(TestCase):
+    def test_command_writes_a_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path, report = Path(directory) / 'registrar.csv', Path(directory) / 'errors.csv'
+            path.write_text(
+                HEADER
+                + 'CMSC 11,A,Lecture,M | 7:00 AM - 8:00 AM,SCI 402,4,,,\n'
+                + 'CMSC 11,B,Lecture,M | 7:00 AM,SCI 402,4,,,\n'
+            )
+            stdout = io.StringIO()
+            call_command('import_registrar', str(path), semester="Summer 2026", report=str(report), stdout=stdout)
+
+            self.assertIn('Imported 1 of 2 rows into Summer 2026', stdout.getvalue())
+            with report.open() as lines:
+                self.assertEqual(list(csv.reader(lines))[1][0], '3')
+        self.assertEqual(ClassSection.objects.get(semester__name="Summer 2026").section, "A")
+
+    def test_missing_file(self):
+        with self.assertRaises(CommandError):
+            call_command('import_registrar', '/nonexistent/registrar.csv', stdout=io.StringIO())
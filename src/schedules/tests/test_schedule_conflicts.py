@@ -3,8 +3,8 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from ..models import Course, ClassSection, Department, Faculty
-from ..utils import check_faculty_schedule_conflicts
+from ..models import Course, ClassSection, Department, Faculty, Room
+from ..utils import check_schedule_conflicts
 
 
 class ScheduleConflictTestCase(TestCase):
@@ -13,15 +13,17 @@ class ScheduleConflictTestCase(TestCase):
         
         # Create test data
         self.department = Department.objects.create(name="Computer Science")
-        self.faculty = Faculty.objects.create(name="John Doe", department=self.department)
+        self.faculty = Faculty.objects.create(name="John Doe", email="jdoe@up.edu.ph", department=self.department)
         self.course = Course.objects.create(course_code="CS101")
+        self.room = Room.objects.create(room="Room 101", floor="1")
+        self.other_room = Room.objects.create(room="Room 102", floor="1")
         
         # Create a class section with schedule
         self.section = ClassSection.objects.create(
             course=self.course,
             section="A",
             type="Lecture",
-            room="Room 101",
+            room=self.room,
             schedule="M | 10:00 AM - 11:30 AM",
             faculty=self.faculty
         )
@@ -29,7 +31,7 @@ class ScheduleConflictTestCase(TestCase):
     def test_faculty_schedule_conflict_detection(self):
         """Test that faculty schedule conflicts are correctly detected"""
         # Should detect conflict with same time and same day
-        conflicts = check_faculty_schedule_conflicts(
+        conflicts = check_schedule_conflicts(
             day="M",
             time="10:00 AM - 11:30 AM",
             faculty_id=self.faculty.id
@@ -37,7 +39,7 @@ class ScheduleConflictTestCase(TestCase):
         self.assertEqual(len(conflicts), 1)
         
         # Should detect conflict with overlapping time
-        conflicts = check_faculty_schedule_conflicts(
+        conflicts = check_schedule_conflicts(
             day="M",
             time="10:30 AM - 12:00 PM",
             faculty_id=self.faculty.id
@@ -45,7 +47,7 @@ class ScheduleConflictTestCase(TestCase):
         self.assertEqual(len(conflicts), 1)
         
         # Should detect conflict with contained time
-        conflicts = check_faculty_schedule_conflicts(
+        conflicts = check_schedule_conflicts(
             day="M",
             time="10:15 AM - 11:15 AM",
             faculty_id=self.faculty.id
@@ -53,7 +55,7 @@ class ScheduleConflictTestCase(TestCase):
         self.assertEqual(len(conflicts), 1)
         
         # Should not detect conflict with different day
-        conflicts = check_faculty_schedule_conflicts(
+        conflicts = check_schedule_conflicts(
             day="T",
             time="10:00 AM - 11:30 AM",
             faculty_id=self.faculty.id
@@ -61,7 +63,7 @@ class ScheduleConflictTestCase(TestCase):
         self.assertEqual(len(conflicts), 0)
         
         # Should not detect conflict with non-overlapping time
-        conflicts = check_faculty_schedule_conflicts(
+        conflicts = check_schedule_conflicts(
             day="M",
             time="11:30 AM - 1:00 PM",
             faculty_id=self.faculty.id
@@ -75,7 +77,7 @@ class ScheduleConflictTestCase(TestCase):
             'course_code': 'CS102',
             'section': 'A',
             'type': 'Lecture',
-            'room': 'Room 102',
+            'room_id': self.other_room.id,
             'day': 'M',
             'time': '10:00 AM - 11:30 AM',
             'faculty_id': self.faculty.id
@@ -96,7 +98,7 @@ class ScheduleConflictTestCase(TestCase):
             course=self.course,
             section="B",
             type="Lecture",
-            room="Room 102",
+            room=self.other_room,
             schedule="T | 10:00 AM - 11:30 AM",
             faculty=self.faculty
         )
@@ -0,0 +1,104 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from ..models import Course, Department, Faculty, Room, Semester
+from ..cache import get_generation
+from ..search import GENERATION, Entry, SearchIndex, get_index, search
+from ..synthetic import CampusGenerator
+
+
+class SearchTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        department = Department.objects.create(name='Computer Science')
+        for code in ['CMSC 12', 'CMSC 128', 'CMSC 129', 'MATH 128', 'ACMSC 1']:
+            Course.objects.create(course_code=code)
+        Room.objects.create(room='SCI 408', floor='4')
+        Room.objects.create(room='AS 201', floor='2')
+        Faculty.objects.create(name='Juan Dela Cruz', email='jdcruz@up.edu.ph', department=department)
+        Faculty.objects.create(name='Maria Santos', email='msantos@up.edu.ph', department=department)
+
+    def labels(self, query, **kwargs):
+        return [result['label'] for result in search(query, **kwargs)]
+
+    def test_ranking(self):
+        results = search('cmsc 12')
+        self.assertEqual(results[0], {
+            'type': 'course', 'id': Course.objects.get(course_code='CMSC 12').id,
+            'label': 'CMSC 12', 'detail': '', 'match': 'exact'
+        })
+        self.assertEqual([result['label'] for result in results[1:3]], ['CMSC 128', 'CMSC 129'])
+
+        # Prefix matches come before substring matches
+        self.assertEqual(self.labels('cmsc'), ['CMSC 12', 'CMSC 128', 'CMSC 129', 'ACMSC 1'])
+        self.assertEqual(search('msc')[0]['match'], 'substring')
+
+    def test_prefix_without_spaces_and_words(self):
+        self.assertEqual(self.labels('cmsc12')[:3], ['CMSC 12', 'CMSC 128', 'CMSC 129'])
+        self.assertEqual(self.labels('cruz juan'), ['Juan Dela Cruz'])
+        self.assertEqual(self.labels('santos'), ['Maria Santos'])
+        self.assertEqual(self.labels('jdcruz@'), ['Juan Dela Cruz'])
+
+    def test_rooms_by_name_and_floor(self):
+        self.assertEqual(self.labels('sci'), ['SCI 408'])
+        self.assertEqual(search('4', types=['room']), [{
+            'type': 'room', 'id': Room.objects.get(room='SCI 408').id,
+            'label': 'SCI 408', 'detail': '4', 'match': 'exact'
+        }])
+
+    def test_type_filter_and_limit(self):
+        self.assertEqual(self.labels('128', types=['course']), ['CMSC 128', 'MATH 128'])
+        self.assertEqual(len(search('cmsc', limit=2)), 2)
+        self.assertEqual(search('zzz'), [])
+        self.assertEqual(search('  '), [])
+
+    def test_index_refreshes_on_writes(self):
+        index = get_index()
+        self.assertIs(get_index(), index)
+
+        Course.objects.create(course_code='CMSC 137')
+        self.assertEqual(self.labels('cmsc 137'), ['CMSC 137'])
+        self.assertIsNot(get_index(), index)
+
+        Room.objects.filter(room='AS 201').delete()
+        self.assertEqual(self.labels('as 201'), [])
+
+        with self.settings(SEARCH_INDEX_MAX_AGE=0):
+            index = get_index()
+            time.sleep(0.001)
+            self.assertIsNot(get_index(), index)
+
+    def test_index_is_invalidated_again_on_commit(self):
+        # An index rebuilt before the write commits still has the old rows
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(course_code='CMSC 137')
+            generation = get_generation(GENERATION)
+        self.assertNotEqual(get_generation(GENERATION), generation)
+
+    def test_endpoint(self):
+        response = self.client.get('/api/schedules/search/', {'q': 'Juan', 'type': 'faculty,room'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['detail'], 'jdcruz@up.edu.ph')
+
+        self.assertEqual(self.client.get('/api/schedules/search/').status_code, 400)
+        self.assertEqual(self.client.get('/api/schedules/search/', {'q': 'a', 'type': 'section'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/schedules/search/', {'q': 'a', 'limit': '0'}).status_code, 400)
+
+
+class SearchSpeedTestCase(TestCase):
+    def test_large_index_confirms_few_entries(self):
+        Semester.objects.create(name="1st Semester AY 2025-2026").activate()
+        CampusGenerator(rooms=2000, faculty=2000, sections=0, seed=1).generate()
+        index = SearchIndex.build()
+
+        for query in ['c', 'cm', 'cmsc', 'cmsc 1', 'sci', 'a', 'up.edu', 'faculty 1999']:
+            # No query, and only about as many entries checked one by one as are returned
+            with self.assertNumQueries(0), mock.patch.object(
+                Entry, 'matches', autospec=True, side_effect=Entry.matches
+            ) as matches:
+                results = index.search(query, limit=10)
+            self.assertLessEqual(len(results), 10, query)
+            self.assertLessEqual(matches.call_count, 20, query)
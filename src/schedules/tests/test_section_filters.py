@@ -0,0 +1,69 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from ..models import ClassSection, Course, Department, Faculty, Room, Semester
+
+
+class SectionFilterTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        Semester.objects.create(name="1st Semester AY 2025-2026").activate()
+
+        cs = Department.objects.create(name="Computer Science")
+        math = Department.objects.create(name="Mathematics")
+        self.doe = Faculty.objects.create(name="John Doe", email="jdoe@up.edu.ph", department=cs)
+        self.cruz = Faculty.objects.create(name="Ana Cruz", email="acruz@up.edu.ph", department=math)
+        self.sci402 = Room.objects.create(room="SCI 402", floor="4")
+        self.as201 = Room.objects.create(room="AS 201", floor="2")
+
+        def section(code, name, section_type, room, schedule, faculty):
+            course, _ = Course.objects.get_or_create(course_code=code)
+            return ClassSection.objects.create(
+                course=course, section=name, type=section_type, room=room, schedule=schedule, faculty=faculty
+            )
+
+        section("CMSC 126", "A", "Lecture", self.as201, "M TH | 11:00 AM - 12:00 PM", self.doe)
+        section("CMSC 126", "A1", "Laboratory", self.sci402, "F | 1:00 PM - 4:00 PM", self.doe)
+        section("CMSC 128", "B1", "Laboratory", self.sci402, "W | 7:00 AM - 10:00 AM", self.doe)
+        section("MATH 128", "A", "Lecture", self.as201, "T F | 2:30 PM - 4:00 PM", self.cruz)
+
+    def sections(self, **params):
+        response = self.client.get('/api/schedules/sections/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return sorted(
+            (ClassSection.objects.get(pk=result['id']).course.course_code, result['section'])
+            for result in response.json()['results']
+        )
+
+    def test_single_filters(self):
+        self.assertEqual(self.sections(course='cmsc'), [('CMSC 126', 'A'), ('CMSC 126', 'A1'), ('CMSC 128', 'B1')])
+        self.assertEqual(self.sections(course='CMSC 128'), [('CMSC 128', 'B1')])
+        self.assertEqual(self.sections(type='laboratory'), [('CMSC 126', 'A1'), ('CMSC 128', 'B1')])
+        self.assertEqual(self.sections(room='AS 201'), [('CMSC 126', 'A'), ('MATH 128', 'A')])
+        self.assertEqual(self.sections(room=self.sci402.id), [('CMSC 126', 'A1'), ('CMSC 128', 'B1')])
+        self.assertEqual(self.sections(floor='2'), [('CMSC 126', 'A'), ('MATH 128', 'A')])
+        self.assertEqual(self.sections(faculty=self.cruz.id), [('MATH 128', 'A')])
+        self.assertEqual(self.sections(department=self.doe.department_id), [
+            ('CMSC 126', 'A'), ('CMSC 126', 'A1'), ('CMSC 128', 'B1')
+        ])
+        self.assertEqual(self.sections(day='friday'), [('CMSC 126', 'A1'), ('MATH 128', 'A')])
+
+    def test_day_and_time_window(self):
+        self.assertEqual(self.sections(time_from='1:00 PM'), [('CMSC 126', 'A1'), ('MATH 128', 'A')])
+        self.assertEqual(self.sections(time_to='12:00'), [('CMSC 126', 'A'), ('CMSC 128', 'B1')])
+        self.assertEqual(self.sections(day='F', time_from='2:00 PM', time_to='4:00 PM'), [('MATH 128', 'A')])
+        # The window applies to the meeting on that day, not to any meeting
+        self.assertEqual(self.sections(day='M', time_from='1:00 PM'), [])
+
+    def test_combined_filters(self):
+        self.assertEqual(
+            self.sections(course='CMSC', type='Laboratory', day='F', faculty=self.doe.id, room='SCI 402'),
+            [('CMSC 126', 'A1')]
+        )
+
+    def test_invalid_filters(self):
+        response = self.client.get('/api/schedules/sections/', {
+            'type': 'Seminar', 'faculty': 'doe', 'day': 'Funday', 'time_from': 'noon'
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {'type', 'faculty', 'day', 'time_from'})
@@ -0,0 +1,96 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..models import Course, ClassSection, Department, Faculty, Room, Semester
+from ..utils import check_schedule_conflicts
+
+
+class SemesterTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.semester = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.semester.activate()
+
+        self.department = Department.objects.create(name="Computer Science")
+        self.faculty = Faculty.objects.create(name="John Doe", email="jdoe@up.edu.ph", department=self.department)
+        self.course = Course.objects.create(course_code="CMSC 126")
+        self.room = Room.objects.create(room="SCI 405", floor="4")
+
+        self.section = ClassSection.objects.create(
+            semester=self.semester,
+            course=self.course,
+            section="A",
+            type="Lecture",
+            room=self.room,
+            schedule="M TH | 11:00 AM - 12:00 PM",
+            faculty=self.faculty
+        )
+
+    def test_active_semester_is_unique(self):
+        other = Semester.objects.create(name="2nd Semester AY 2025-2026")
+        other.activate()
+
+        self.assertEqual(Semester.objects.active(), other)
+        self.assertEqual(Semester.objects.filter(is_active=True).count(), 1)
+
+    def test_new_section_goes_into_active_semester(self):
+        # Building a section touches no table; saving it picks the active semester
+        with self.assertNumQueries(0):
+            section = ClassSection(course=self.course, section="B", room=self.room, schedule="T F | 1:00 PM - 2:00 PM")
+        section.save()
+
+        self.assertEqual(section.semester, self.semester)
+
+    def test_new_semester_keeps_history(self):
+        response = self.client.post(reverse('new-semester'), {'name': '2nd Semester AY 2025-2026'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['previous_semester'], self.semester.id)
+
+        # The previous term's sections still exist but are no longer listed by default
+        self.assertTrue(ClassSection.objects.filter(id=self.section.id).exists())
+
+        response = self.client.get(reverse('classsection-list'))
+        self.assertEqual(response.data['count'], 0)
+
+        response = self.client.get(reverse('classsection-list'), {'semester': self.semester.id})
+        self.assertEqual(response.data['count'], 1)
+
+    def test_new_semester_without_name(self):
+        response = self.client.post(reverse('new-semester'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(Semester.objects.get(id=response.data['semester']['id']).is_active)
+
+    def test_conflicts_are_scoped_to_semester(self):
+        conflicts = check_schedule_conflicts(day="M", time="11:00 AM - 12:00 PM", room_id=self.room.id)
+        self.assertEqual(len(conflicts), 1)
+
+        Semester.objects.create(name="2nd Semester AY 2025-2026").activate()
+
+        conflicts = check_schedule_conflicts(day="M", time="11:00 AM - 12:00 PM", room_id=self.room.id)
+        self.assertEqual(len(conflicts), 0)
+
+    def test_course_lists_active_semester_sections(self):
+        next_semester = Semester.objects.create(name="2nd Semester AY 2025-2026")
+        next_semester.activate()
+
+        # The same section name can be reused in the new term
+        response = self.client.post(reverse('classsection-list'), {
+            'course_code': 'CMSC 126',
+            'section': 'A',
+            'type': 'Lecture',
+            'room_id': self.room.id,
+            'day': 'T F',
+            'time': '1:00 PM - 2:30 PM',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['semester'], next_semester.id)
+
+        response = self.client.get(reverse('course-detail', args=[self.course.id]))
+        self.assertEqual([s['schedule'] for s in response.data['sections']], ['T F | 1:00 PM - 2:30 PM'])
+
+    def test_active_semester_cannot_be_deleted(self):
+        response = self.client.delete(reverse('semester-detail', args=[self.semester.id]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,69 @@
+import io
+from contextlib import redirect_stdout
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import TestCase, override_settings
+
+from ..models import SlowQueryLog, Semester
+from ..slow_queries import SlowQueryMiddleware
+from ..synthetic import CampusGenerator
+
+
+# Every query counts as slow
+@override_settings(SLOW_QUERY_MS=0.0001, SLOW_QUERY_LOG_SIZE=500)
+class SlowQueryCaptureTestCase(TestCase):
+    def setUp(self):
+        Semester.objects.create(name="1st Semester AY 2025-2026").activate()
+        CampusGenerator(rooms=4, faculty=4, sections=12, seed=1).generate()
+
+    def check_conflicts(self):
+        with redirect_stdout(io.StringIO()), self.assertLogs('schedules.slow_queries', 'WARNING'):
+            return self.client.post('/api/schedules/conflicts/check/', {
+                'day': 'M',
+                'time': '8:00 PM - 9:00 PM',
+                'room': 1,
+                'faculty_id': 1,
+            }, content_type='application/json')
+
+    def test_captures_schedules_queries_with_plan(self):
+        self.check_conflicts()
+
+        logs = SlowQueryLog.objects.all()
+        self.assertTrue(logs)
+        for log in logs:
+            self.assertEqual(log.method, 'POST')
+            self.assertEqual(log.path, '/api/schedules/conflicts/check/')
+            self.assertEqual(log.view, 'schedules.views.ScheduleConflictView (check-conflicts)')
+            self.assertTrue(log.caller.startswith('schedules/'))
+            self.assertTrue(log.plan)
+            self.assertNotIn('EXPLAIN failed', log.plan)
+
+        callers = {log.caller.split(':')[0] for log in logs}
+        self.assertIn('schedules/utils.py', callers)
+        self.assertTrue(any('schedules_classmeeting' in log.sql for log in logs))
+
+    # The manifest only exists after collectstatic
+    @override_settings(STORAGES={'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}})
+    def test_queries_outside_schedules_views_are_not_captured(self):
+        # Every request runs through the app's own compression middleware
+        self.assertIn('schedules.compression.CompressionMiddleware', settings.MIDDLEWARE)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@up.edu.ph', 'secret'))
+
+        response = self.client.get('/admin/auth/user/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(SlowQueryLog.objects.exists())
+
+    def test_log_is_bounded(self):
+        with self.settings(SLOW_QUERY_LOG_SIZE=2):
+            for _ in range(3):
+                self.check_conflicts()
+
+        self.assertEqual(SlowQueryLog.objects.count(), 2)
+
+    def test_not_loaded_when_disabled(self):
+        with self.settings(SLOW_QUERY_MS=0):
+            with self.assertRaises(MiddlewareNotUsed):
+                SlowQueryMiddleware(lambda request: None)
@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase
+
+from main import startup
+from .. import search
+from ..benchmarks import import_profile, parse_importtime
+from ..models import Room
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2500 |     django.utils.version
+import time:      3000 |       5500 |   django
+import time:       400 |        400 | rest_framework.settings
+"""
+
+
+class WarmUpTestCase(TestCase):
+    def setUp(self):
+        # Connections stay open inside the test transaction
+        patcher = mock.patch('main.startup.close_connections')
+        self.close_connections = patcher.start()
+        self.addCleanup(patcher.stop)
+        search._index = None
+        self.addCleanup(setattr, search, '_index', None)
+
+    def test_builds_the_search_index(self):
+        Room.objects.create(room="SCI 402", floor="4")
+        timings = startup.warm_up()
+
+        self.assertEqual(set(timings), {'urls', 'search'})
+        self.assertIsNotNone(search._index)
+        with self.assertNumQueries(0):
+            self.assertEqual(search.search("SCI 402")[0]['label'], "SCI 402")
+        self.close_connections.assert_called_once()
+
+    def test_unmigrated_database_is_not_fatal(self):
+        with mock.patch.object(search.SearchIndex, 'build', side_effect=DatabaseError("no such table")), \
+                self.assertLogs('main.startup', 'WARNING'):
+            startup.warm_up()
+        self.close_connections.assert_called_once()
+
+
+class ImportProfileTestCase(SimpleTestCase):
+    def test_parse_importtime(self):
+        imports = parse_importtime(IMPORTTIME + "Search index not built at startup\n")
+        self.assertEqual(imports[0], ('_io', 120, 120))
+        self.assertEqual(len(imports), 4)
+
+    def test_profile_groups_by_package(self):
+        profile = import_profile(parse_importtime(IMPORTTIME), top=2)
+        self.assertEqual(profile['total_ms'], 5.52)
+        self.assertEqual(profile['packages'], [{'package': 'django', 'ms': 5.0}, {'package': 'rest_framework', 'ms': 0.4}])
+        self.assertEqual([module['module'] for module in profile['modules']], ['django', 'django.utils.version'])
@@ -0,0 +1,212 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..models import ClassSection, Course, Department, Faculty, Room, Semester, Tombstone
+from ..registrar import RegistrarImport
+from ..semesters import clone_semester
+from .. import sync
+
+
+class ChangesTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.semester = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.semester.activate()
+        self.department = Department.objects.create(name="Computer Science")
+        self.faculty = Faculty.objects.create(name="John Doe", email="jdoe@up.edu.ph", department=self.department)
+        self.room = Room.objects.create(room="SCI 402", floor="4")
+        self.course = Course.objects.create(course_code="CMSC 126")
+        self.section = ClassSection.objects.create(
+            course=self.course, section="A", type="Lecture",
+            room=self.room, schedule="M TH | 11:00 AM - 12:00 PM", faculty=self.faculty
+        )
+        self.url = reverse('changes')
+
+    def poll_after(self, moment):
+        """Poll with a cursor whose overlap window starts at moment"""
+        return self.client.get(self.url, {'since': sync.encode_cursor(moment - sync.OVERLAP)})
+
+    def test_without_since_returns_a_cursor(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), ['cursor'])
+        self.assertTrue(response.data['cursor'].isdigit())
+
+    def test_created_updated_and_deleted(self):
+        later = timezone.now() + timedelta(minutes=1)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            self.room.floor = "3"
+            self.room.save()
+            other = Course.objects.create(course_code="CMSC 127")
+            section_id = self.section.id
+            self.section.delete()
+
+        response = self.poll_after(later)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['rooms']['updated'][0]['floor'], "3")
+        self.assertEqual(response.data['rooms']['created'], [])
+        self.assertEqual([row['id'] for row in response.data['courses']['created']], [other.id])
+        self.assertEqual(response.data['sections']['deleted'], [section_id])
+        self.assertEqual(response.data['faculty'], {'created': [], 'updated': [], 'deleted': []})
+        self.assertEqual(response.data['departments'], {'created': [], 'updated': [], 'deleted': []})
+
+    def test_rows_are_flat_columns(self):
+        response = self.poll_after(timezone.now() - timedelta(minutes=1))
+
+        section = response.data['sections']['created'][0]
+        self.assertEqual(section['course'], self.course.id)
+        self.assertEqual(section['room'], self.room.id)
+        self.assertEqual(section['faculty'], self.faculty.id)
+        self.assertEqual(section['version'], 1)
+        self.assertEqual(response.data['departments']['created'][0]['name'], "Computer Science")
+
+    def test_cascaded_deletes_leave_tombstones(self):
+        room_id, section_id = self.room.id, self.section.id
+        self.room.delete()
+        self.assertEqual(
+            set(Tombstone.objects.values_list('model', 'object_id')),
+            {('rooms', room_id), ('sections', section_id)}
+        )
+
+    def test_cascaded_tombstones_are_inserted_together(self):
+        for number in range(20):
+            ClassSection.objects.create(
+                course=self.course, section=f"B{number}", type="Lecture",
+                room=self.room, schedule=f"T | {number % 12 + 1}:00 AM - {number % 12 + 1}:30 AM"
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            self.room.delete()
+
+        inserts = [query['sql'] for query in queries if query['sql'].startswith('INSERT INTO "schedules_tombstone"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Tombstone.objects.filter(model='sections').count(), 21)
+
+    def test_tombstones_of_a_failed_delete_are_dropped(self):
+        with mock.patch('django.db.models.deletion.Collector.delete', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self.room.delete()
+        # Later deletes outside a batch still leave their tombstone
+        section_id = self.section.id
+        self.section.delete()
+        self.assertEqual(list(Tombstone.objects.values_list('model', 'object_id')), [('sections', section_id)])
+
+    def test_unassigned_sections_of_deleted_faculty(self):
+        later = timezone.now() + timedelta(minutes=1)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            self.faculty.delete()
+
+        response = self.poll_after(later)
+
+        section, = response.data['sections']['updated']
+        self.assertEqual((section['id'], section['faculty'], section['version']), (self.section.id, None, 2))
+
+    def test_next_poll_with_returned_cursor(self):
+        cursor = self.poll_after(timezone.now() - timedelta(minutes=1)).data['cursor']
+        later = timezone.now() + timedelta(minutes=1)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            self.faculty.name = "Jane Doe"
+            self.faculty.save()
+
+        response = self.client.get(self.url, {'since': cursor})
+        # Still created as far as this cursor knows, since setUp ran within the overlap
+        faculty = response.data['faculty']
+        self.assertEqual([row['name'] for row in faculty['created'] + faculty['updated']], ["Jane Doe"])
+        self.assertGreater(int(response.data['cursor']), int(cursor))
+
+    def test_pages(self):
+        Course.objects.create(course_code="CMSC 127")
+        Course.objects.create(course_code="CMSC 128")
+        section_id = self.section.id
+        self.section.delete()
+
+        pages = [self.client.get(self.url, {
+            'since': sync.encode_cursor(timezone.now() - timedelta(minutes=1)), 'limit': 2
+        }).data]
+        while pages[-1]['has_more']:
+            self.assertLess(len(pages), 10)
+            pages.append(self.client.get(self.url, {'since': pages[-1]['cursor'], 'limit': 2}).data)
+
+        def collect(feed, kind):
+            return [row if kind == 'deleted' else row['id'] for page in pages for row in page[feed][kind]]
+
+        # Departments, courses, rooms, faculty, then the tombstone: 7 rows in pages of 2
+        self.assertEqual(len(pages), 4)
+        self.assertEqual(
+            collect('courses', 'created'),
+            list(Course.objects.order_by('updated_at', 'pk').values_list('id', flat=True))
+        )
+        self.assertEqual(collect('sections', 'deleted'), [section_id])
+        self.assertEqual(len(collect('departments', 'created') + collect('rooms', 'created')), 2)
+        # Once done, the cursor is when the first page was read
+        self.assertEqual(pages[-1]['cursor'], pages[0]['cursor'].split('.')[0])
+
+    def test_invalid_limit(self):
+        since = sync.current_cursor()
+        for limit in ('0', 'all', '5001'):
+            response = self.client.get(self.url, {'since': since, 'limit': limit})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, limit)
+
+    def poll_during_long_bulk_write(self, module, write):
+        """Poll while a bulk write that stamped its rows a minute ago is still uncommitted"""
+        cursor = sync.current_cursor()
+        with mock.patch(f'schedules.{module}.timezone') as stamp_clock:
+            stamp_clock.now.return_value = timezone.now() - timedelta(minutes=1)
+            write()
+        return self.client.get(self.url, {'since': cursor}).data
+
+    def test_registrar_import_is_stamped_at_commit(self):
+        rows = (
+            "Course,Section,Type,Schedule,Room,Floor,Faculty,Faculty Email,Department\n"
+            "CMSC 127,B,Lecture,T F | 1:00 PM - 2:00 PM,SCI 402,4,\"Doe, Jane\",jdoe@up.edu.ph,Computer Science\n"
+        )
+        data = self.poll_during_long_bulk_write(
+            'registrar', lambda: RegistrarImport(self.semester).run(StringIO(rows))
+        )
+
+        # setUp's rows are within the overlap too
+        self.assertIn("CMSC 127", [row['course_code'] for row in data['courses']['created']])
+        self.assertIn("B", [row['section'] for row in data['sections']['created']])
+        faculty = data['faculty']
+        self.assertEqual([row['name'] for row in faculty['created'] + faculty['updated']], ["Doe, Jane"])
+
+    def test_semester_clone_is_stamped_at_commit(self):
+        target = Semester.objects.create(name="2nd Semester AY 2025-2026")
+        data = self.poll_during_long_bulk_write('semesters', lambda: clone_semester(self.semester, target))
+
+        self.assertIn(target.id, [row['semester'] for row in data['sections']['created']])
+
+    @override_settings(SYNC_TOMBSTONE_DAYS=7)
+    def test_expired_cursor_is_gone(self):
+        response = self.poll_after(timezone.now() - timedelta(days=8))
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'since': '2025-06-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'since': '1.2.99'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(SYNC_TOMBSTONE_DAYS=7)
+    def test_prune_tombstones(self):
+        section_id = self.section.id
+        self.section.delete()
+        old = Tombstone.objects.create(model='courses', object_id=999)
+        Tombstone.objects.filter(pk=old.pk).update(deleted_at=timezone.now() - timedelta(days=8))
+
+        out = StringIO()
+        call_command('prune_tombstones', stdout=out)
+
+        self.assertIn("Deleted 1 tombstones", out.getvalue())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [section_id])
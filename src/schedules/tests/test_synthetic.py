@@ -0,0 +1,93 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..cache import API_GENERATION, get_generation
+from ..models import ClassSection, Faculty, Semester
+from ..search import GENERATION as SEARCH_GENERATION
+from ..synthetic import CampusGenerator
+from ..utils import audit_semester_conflicts, parse_schedule
+
+
+class CampusGeneratorTestCase(TestCase):
+    def test_generates_requested_campus(self):
+        summary = CampusGenerator(rooms=40, faculty=30, sections=120, seed=1).generate()
+
+        self.assertEqual(summary['sections'], 120)
+        self.assertEqual(ClassSection.objects.count(), 120)
+        self.assertEqual(Faculty.objects.count(), 30)
+        for faculty in Faculty.objects.all():
+            faculty.full_clean()
+
+        for schedule, section_type in ClassSection.objects.values_list('schedule', 'type'):
+            days, start, end = parse_schedule(schedule)
+            if section_type == ClassSection.LABORATORY:
+                self.assertEqual((len(days), end - start), (1, 180))
+
+    def test_campus_with_enough_rooms_is_conflict_free(self):
+        summary = CampusGenerator(rooms=40, faculty=30, sections=120, seed=1).generate()
+
+        self.assertEqual(summary['conflicts'], 0)
+        self.assertEqual(audit_semester_conflicts(), [])
+
+    def test_same_seed_same_campus(self):
+        first = Semester.objects.create(name="First")
+        second = Semester.objects.create(name="Second")
+
+        CampusGenerator(rooms=10, faculty=10, sections=30, seed=7).generate(first)
+        CampusGenerator(rooms=10, faculty=10, sections=30, seed=7).generate(second)
+
+        def campus(semester):
+            return list(
+                ClassSection.objects.filter(semester=semester)
+                .order_by('course__course_code', 'section')
+                .values_list('course__course_code', 'section', 'room_id', 'faculty_id', 'schedule')
+            )
+
+        self.assertEqual(campus(first), campus(second))
+
+    def test_skipped_sections_are_not_counted(self):
+        CampusGenerator(rooms=10, faculty=10, sections=30, seed=7).generate()
+        # The same courses and section names again: every section already exists
+        summary = CampusGenerator(rooms=10, faculty=10, sections=30, seed=8).generate()
+
+        self.assertEqual(summary['sections'], 0)
+        self.assertEqual(summary['existing'], 30)
+        # Existing sections are not placed again, so they cannot conflict with themselves
+        self.assertEqual(summary['conflicts'], 0)
+        self.assertEqual(ClassSection.objects.count(), 30)
+
+    def test_generate_campus_command(self):
+        out = StringIO()
+        call_command('generate_campus', rooms=5, faculty=5, sections=9, seed=3, semester='Load Test', stdout=out)
+
+        self.assertIn('Generated 9 sections', out.getvalue())
+        self.assertEqual(Semester.objects.active().name, 'Load Test')
+
+        out = StringIO()
+        call_command('generate_campus', rooms=5, faculty=5, sections=9, seed=3, semester='Load Test', stdout=out)
+        self.assertIn('Generated 0 sections', out.getvalue())
+        self.assertIn('9 sections already exist', out.getvalue())
+        self.assertNotIn('conflict', out.getvalue())
+
+
+class SetupTestDataTestCase(TestCase):
+    def test_setup_test_data(self):
+        generations = [get_generation(API_GENERATION), get_generation(SEARCH_GENERATION)]
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('setup_test_data', stdout=out)
+
+        self.assertIn('Successfully created test data', out.getvalue())
+        self.assertEqual(ClassSection.objects.count(), 9)
+        # Cached lists, reports and the search index do not outlive the bulk inserts
+        self.assertNotEqual(get_generation(API_GENERATION), generations[0])
+        self.assertNotEqual(get_generation(SEARCH_GENERATION), generations[1])
+
+    def test_seed_schedules(self):
+        generation = get_generation(API_GENERATION)
+        call_command('seed_schedules', stdout=StringIO())
+
+        self.assertTrue(ClassSection.objects.exists())
+        self.assertNotEqual(get_generation(API_GENERATION), generation)
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+
+from main.throttling import TokenBucketThrottle, parse_rate
+
+RATES = {'read': '10/minute', 'write': '5/minute', 'conflicts': '2/minute', 'export': None}
+
+
+def throttle_settings(**rates):
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_CLASSES': ['main.throttling.TokenBucketThrottle'],
+        'DEFAULT_THROTTLE_RATES': {**RATES, **rates},
+    })
+
+
+@throttle_settings()
+class TokenBucketThrottleTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.now = 1_700_000_000_000_000  # microseconds
+        patcher = mock.patch('main.throttling.time.time_ns', side_effect=lambda: self.now * 1000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def allow(self, method='get', **view):
+        request = getattr(APIRequestFactory(), method)('/', REMOTE_ADDR='10.0.0.1')
+        throttle = TokenBucketThrottle()
+        return throttle.allow_request(request, SimpleNamespace(**view)), throttle
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('300/minute'), (300, 60))
+        self.assertEqual(parse_rate('5/s'), (5, 1))
+        self.assertIsNone(parse_rate(None))
+
+    def test_bucket_empties_and_refills(self):
+        for _ in range(10):
+            self.assertTrue(self.allow()[0])
+        allowed, throttle = self.allow()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 6.0)
+
+        # One token comes back every 6 seconds
+        self.now += 6_000_000
+        self.assertTrue(self.allow()[0])
+        self.assertFalse(self.allow()[0])
+
+    def test_refused_requests_take_no_tokens(self):
+        for _ in range(10):
+            self.allow()
+        for _ in range(5):
+            self.assertFalse(self.allow()[0])
+        self.now += 6_000_000
+        self.assertTrue(self.allow()[0])
+
+    def test_idle_bucket_holds_at_most_its_capacity(self):
+        self.allow()
+        self.now += 3600 * 1_000_000
+        results = [self.allow()[0] for _ in range(11)]
+        self.assertEqual(results, [True] * 10 + [False])
+
+    def test_scopes_have_separate_buckets(self):
+        self.assertTrue(self.allow('post', throttle_scope='conflicts')[0])
+        self.assertTrue(self.allow('post', throttle_scope='conflicts')[0])
+        self.assertFalse(self.allow('post', throttle_scope='conflicts')[0])
+        self.assertTrue(self.allow()[0])
+        self.assertTrue(self.allow('post')[0])
+
+    def test_costs(self):
+        self.assertTrue(self.allow('post', action='clone', throttle_costs={'clone': 4})[0])
+        self.assertFalse(self.allow('post', action='clone', throttle_costs={'clone': 4})[0])
+        self.assertTrue(self.allow('post', throttle_cost=1)[0])
+
+    def test_scope_without_rate_is_not_throttled(self):
+        for _ in range(50):
+            self.assertTrue(self.allow(throttle_scope='export')[0])
+
+    def test_no_queries(self):
+        with self.assertNumQueries(0):
+            self.allow()
+
+
+@throttle_settings()
+class ThrottledEndpointTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+
+    def test_conflict_checks_do_not_use_up_reads(self):
+        url = reverse('check-conflicts')
+        data = {'day': 'M', 'time': '8:00 AM - 9:00 AM', 'room': 1}
+        for _ in range(2):
+            self.assertNotEqual(self.client.post(url, data, format='json').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(self.client.get(reverse('room-list')).status_code, status.HTTP_200_OK)
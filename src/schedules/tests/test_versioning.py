@@ -0,0 +1,158 @@
+import io
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..models import ClassSection, Course, Department, Faculty, Room, Semester, StaleVersion
+from ..registrar import RegistrarImport
+from ..semesters import clone_semester
+from ..serializers import ClassSectionUpdateSerializer
+
+
+class VersionedModelTestCase(TestCase):
+    def setUp(self):
+        self.room = Room.objects.create(room="SCI 402", floor="4")
+
+    def test_save_bumps_the_version(self):
+        self.assertEqual(self.room.version, 1)
+        self.room.floor = "3"
+        self.room.save()
+        self.assertEqual(self.room.version, 2)
+        self.assertEqual(Room.objects.get(pk=self.room.pk).version, 2)
+
+    def test_saving_a_stale_copy_raises(self):
+        stale = Room.objects.get(pk=self.room.pk)
+        self.room.floor = "3"
+        self.room.save()
+
+        stale.floor = "5"
+        with self.assertRaises(StaleVersion), transaction.atomic():
+            stale.save()
+        self.assertEqual(Room.objects.get(pk=self.room.pk).floor, "3")
+
+    def test_stale_check_is_part_of_the_update(self):
+        self.room.floor = "3"
+        with self.assertNumQueries(1):
+            self.room.save()
+
+
+class IfMatchTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.semester = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.semester.activate()
+        department = Department.objects.create(name="Computer Science")
+        self.faculty = Faculty.objects.create(name="John Doe", email="jdoe@up.edu.ph", department=department)
+        self.room = Room.objects.create(room="SCI 402", floor="4")
+        self.section = ClassSection.objects.create(
+            course=Course.objects.create(course_code="CMSC 126"), section="A", type="Lecture",
+            room=self.room, schedule="M TH | 11:00 AM - 12:00 PM", faculty=self.faculty
+        )
+        self.url = reverse('classsection-detail', args=[self.section.id])
+
+    def test_detail_has_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"1"')
+        self.assertEqual(response.data['version'], 1)
+
+    def test_list_has_no_etag(self):
+        response = self.client.get(reverse('classsection-list'))
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_matching_if_match_updates(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.patch(self.url, {'day': 'T F', 'time': '1:00 PM - 2:00 PM'}, format='json',
+                                     HTTP_IF_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"2"')
+        self.assertEqual(response.data['version'], 2)
+        self.assertEqual(ClassSection.objects.get(pk=self.section.pk).schedule, "T F | 1:00 PM - 2:00 PM")
+
+    def test_weak_if_match_from_a_compressed_response_updates(self):
+        response = self.client.patch(self.url, {'type': 'Laboratory'}, format='json', HTTP_IF_MATCH='W/"1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_stale_if_match_is_refused(self):
+        etag = self.client.get(self.url)['ETag']
+        self.section.type = "Laboratory"
+        self.section.save()
+
+        response = self.client.patch(self.url, {'day': 'T F', 'time': '1:00 PM - 2:00 PM'}, format='json',
+                                     HTTP_IF_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        section = ClassSection.objects.get(pk=self.section.pk)
+        self.assertEqual(section.schedule, "M TH | 11:00 AM - 12:00 PM")
+        self.assertEqual(section.version, 2)
+
+    def test_write_racing_the_update_is_refused(self):
+        validate = ClassSectionUpdateSerializer.validate
+
+        def validate_then_lose_the_race(serializer, data):
+            data = validate(serializer, data)
+            # Another admin saves the section after get_object() read version 1
+            ClassSection.objects.get(pk=self.section.pk).save()
+            return data
+
+        etag = self.client.get(self.url)['ETag']
+        with mock.patch.object(ClassSectionUpdateSerializer, 'validate', validate_then_lose_the_race):
+            response = self.client.patch(self.url, {'type': 'Laboratory'}, format='json', HTTP_IF_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        section = ClassSection.objects.get(pk=self.section.pk)
+        self.assertEqual((section.type, section.version), ("Lecture", 2))
+
+    def test_wildcard_and_missing_if_match_update(self):
+        response = self.client.patch(self.url, {'type': 'Laboratory'}, format='json', HTTP_IF_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.patch(self.url, {'type': 'Lecture'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"3"')
+
+    def test_room_and_faculty_are_versioned(self):
+        url = reverse('room-detail', args=[self.room.room])
+        response = self.client.patch(url, {'floor': '3'}, format='json', HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"2"')
+        response = self.client.patch(url, {'floor': '5'}, format='json', HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+        url = reverse('faculty-detail', args=[self.faculty.id])
+        self.assertEqual(self.client.get(url)['ETag'], '"1"')
+        response = self.client.patch(url, {'name': 'Jane Doe'}, format='json', HTTP_IF_MATCH='W/"0", "1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"2"')
+
+
+class BulkWriteVersionTestCase(TestCase):
+    def setUp(self):
+        self.semester = Semester.objects.create(name="1st Semester AY 2025-2026")
+        self.semester.activate()
+        self.room = Room.objects.create(room="SCI 402", floor="4")
+        self.section = ClassSection.objects.create(
+            course=Course.objects.create(course_code="CMSC 126"), section="A", type="Lecture",
+            room=self.room, schedule="M TH | 11:00 AM - 12:00 PM"
+        )
+
+    def test_clone_starts_copies_at_version_one(self):
+        self.section.save()
+        target = Semester.objects.create(name="2nd Semester AY 2025-2026")
+        clone_semester(self.semester, target)
+        self.assertEqual(ClassSection.objects.get(semester=target).version, 1)
+
+    def test_registrar_import_bumps_updated_sections(self):
+        result = RegistrarImport(self.semester).run(io.StringIO(
+            "Course,Section,Type,Schedule,Room,Floor\n"
+            "CMSC 126,A,Laboratory,T F | 1:00 PM - 2:00 PM,SCI 402,4\n"
+            "CMSC 127,A,Lecture,T F | 1:00 PM - 2:00 PM,SCI 404,4\n"
+        ))
+        self.assertEqual(result.errors, [])
+        self.assertEqual(ClassSection.objects.get(pk=self.section.pk).version, 2)
+        self.assertEqual(ClassSection.objects.get(course__course_code="CMSC 127").version, 1)
+        self.assertEqual(Room.objects.get(room="SCI 404").version, 1)
@@ -7,8 +7,15 @@ from .views import (
     FacultyViewSet, 
     AdminUserViewSet,
     RoomViewSet,
+    SemesterViewSet,
     ScheduleConflictView,
-    NewSemesterView
+    NewSemesterView,
+    SearchView,
+    ExportSectionsView,
+    ChangesView,
+    RoomUtilizationView,
+    TeachingLoadView,
+    section_events
 )
 
 router = DefaultRouter()
@@ -18,9 +25,16 @@ router.register(r'departments', DepartmentViewSet)
 router.register(r'faculty', FacultyViewSet)
 router.register(r'admins', AdminUserViewSet)
 router.register(r'rooms', RoomViewSet)
+router.register(r'semesters', SemesterViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
     path('conflicts/check/', ScheduleConflictView.as_view(), name='check-conflicts'),
     path('new-semester/', NewSemesterView.as_view(), name='new-semester'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('export/sections.<str:filetype>', ExportSectionsView.as_view(), name='export-sections'),
+    path('changes/', ChangesView.as_view(), name='changes'),
+    path('analytics/rooms/', RoomUtilizationView.as_view(), name='room-utilization'),
+    path('analytics/faculty-load/', TeachingLoadView.as_view(), name='teaching-load'),
+    path('events/sections/', section_events, name='section-events'),
 ] 
\ No newline at end of file
@@ -1,8 +1,9 @@
 from datetime import datetime
 import re
-from .models import ClassSection
+from django.db.models import F, Q
+from .models import ClassMeeting, ClassSection
 
-def check_schedule_conflicts(day, time, faculty_id=None, room_id=None, exclude_section_id=None):
+def check_schedule_conflicts(day, time, faculty_id=None, room_id=None, exclude_section_id=None, semester=None):
     """
     Helper function to check for faculty and room schedule conflicts
     Returns a list of conflicts or empty list if no conflicts exist
@@ -13,6 +14,7 @@ def check_schedule_conflicts(day, time, faculty_id=None, room_id=None, exclude_s
     - faculty_id: Optional ID of the faculty to check conflicts for
     - room_id: Optional ID of the room to check conflicts for
     - exclude_section_id: Optional ID of section to exclude from conflict check
+    - semester: Optional semester (or ID) to check within, defaults to the active semester
     
     Returns:
     - List of conflict dictionaries with type "faculty" or "room"
@@ -42,110 +44,193 @@ def check_schedule_conflicts(day, time, faculty_id=None, room_id=None, exclude_s
     except ValueError:
         return []
     
-    conflicts = []
-    
-    # Get all class sections (will filter further based on faculty or room)
-    sections_query = ClassSection.objects.all()
+    start = start_time.hour * 60 + start_time.minute
+    end = end_time.hour * 60 + end_time.minute
+    
+    # One indexed range query over the meetings of the semester replaces a
+    # text search per day; the same overlap rule as the database constraints
+    meetings = ClassMeeting.objects.filter(
+        day__in=input_days,
+        start_minute__lt=end,
+        end_minute__gt=start
+    ).select_related('section__course', 'section__room')
+    if semester is None:
+        meetings = meetings.filter(semester__is_active=True)
+    else:
+        meetings = meetings.filter(semester=semester)
     
     # Exclude the section being edited if provided
     if exclude_section_id:
-        sections_query = sections_query.exclude(id=exclude_section_id)
+        meetings = meetings.exclude(section_id=exclude_section_id)
     
-    # Check for faculty conflicts if faculty_id is provided
+    # (conflict type, meeting field, ID) to check, faculty before room
+    entities = []
     if faculty_id:
-        faculty_conflicts = check_entity_conflicts(
-            sections_query.filter(faculty_id=faculty_id),
-            input_days,
-            start_time,
-            end_time,
-            time_pattern,
-            "faculty"
-        )
-        conflicts.extend(faculty_conflicts)
-    
-    # Check for room conflicts if room_id is provided
+        entities.append(("faculty", 'faculty_id', faculty_id))
     if room_id:
-        room_conflicts = check_entity_conflicts(
-            sections_query.filter(room_id=room_id),
-            input_days,
-            start_time,
-            end_time,
-            time_pattern,
-            "room"
-        )
-        conflicts.extend(room_conflicts)
+        entities.append(("room", 'room_id', room_id))
+    if not entities:
+        return []
+    condition = Q()
+    for _, field, entity_id in entities:
+        condition |= Q(**{field: entity_id})
+    meetings = list(meetings.filter(condition))
+    
+    # Faculty conflicts first, then room conflicts, each in the order of the
+    # requested days and listing a section only once
+    day_order = {input_day: index for index, input_day in enumerate(input_days)}
+    meetings.sort(key=lambda meeting: (
+        day_order[meeting.day], meeting.section.course.course_code, meeting.section.section
+    ))
+    conflicts = []
+    for conflict_type, field, entity_id in entities:
+        seen = set()
+        for meeting in meetings:
+            if str(getattr(meeting, field)) != str(entity_id) or meeting.section_id in seen:
+                continue
+            seen.add(meeting.section_id)
+            section = meeting.section
+            conflicts.append({
+                "type": conflict_type,
+                "course": section.course.course_code,
+                "section": section.section,
+                "schedule": section.schedule,
+                "room": str(section.room) if section.room else None,
+                "conflict_day": meeting.day  # Added for clarity in error messages
+            })
     
     return conflicts
 
-def check_entity_conflicts(sections, input_days, start_time, end_time, time_pattern, conflict_type):
+SCHEDULE_TIME_PATTERN = re.compile(r"(\d+:\d+\s*[AP]M)\s*-\s*(\d+:\d+\s*[AP]M)")
+
+def parse_schedule(schedule):
     """
-    Helper function to check for conflicts in a filtered queryset
+    Parse a schedule string into its days and its time range in minutes after midnight
     
     Parameters:
-    - sections: QuerySet of ClassSection filtered by entity (faculty or room)
-    - input_days: List of day strings to check
-    - start_time: Start time as datetime object
-    - end_time: End time as datetime object
-    - time_pattern: Compiled regex pattern for time format
-    - conflict_type: String indicating the type of conflict ("faculty" or "room")
+    - schedule: String in format "M TH | 11:00 AM - 12:00 PM"
     
     Returns:
-    - List of conflict dictionaries
+    - Tuple of (list of day strings, start minute, end minute), or None if the string is malformed
     """
-    conflicts = []
+    if not schedule:
+        return None
     
-    # Check each individual day for conflicts
-    for input_day in input_days:
-        # Get sections that might contain this day
-        day_sections = sections.filter(schedule__contains=input_day)
-        
-        for section in day_sections:
-            # Parse the schedule string (format: "M TH | 11:00 AM - 12:00 PM")
-            section_parts = section.schedule.split('|')
-            if len(section_parts) != 2:
-                continue
-                
-            section_days, section_time = section_parts[0].strip(), section_parts[1].strip()
-            section_day_list = section_days.split()
-            
-            # Check if this specific day is included in section's schedule
-            if input_day not in section_day_list:
-                continue
-            
-            # Check time overlap
-            section_time_match = re.match(time_pattern, section_time)
-            if not section_time_match:
-                continue
-                
-            section_start_str, section_end_str = section_time_match.groups()
-            
-            try:
-                section_start = datetime.strptime(section_start_str.strip(), "%I:%M %p")
-                section_end = datetime.strptime(section_end_str.strip(), "%I:%M %p")
-            except ValueError:
-                continue
-            
-            # Check for time overlap
-            has_time_overlap = (
-                (start_time <= section_start < end_time) or
-                (start_time < section_end <= end_time) or
-                (section_start <= start_time < section_end) or
-                (section_start < end_time <= section_end)
-            )
-            
-            if has_time_overlap:
-                conflict = {
+    parts = schedule.split('|')
+    if len(parts) != 2:
+        return None
+    
+    days = parts[0].split()
+    time_match = SCHEDULE_TIME_PATTERN.match(parts[1].strip())
+    if not days or not time_match:
+        return None
+    
+    try:
+        start = datetime.strptime(time_match.group(1).strip(), "%I:%M %p")
+        end = datetime.strptime(time_match.group(2).strip(), "%I:%M %p")
+    except ValueError:
+        return None
+    
+    return days, start.hour * 60 + start.minute, end.hour * 60 + end.minute
+
+def audit_schedule_conflicts(sections):
+    """
+    Find every faculty and room conflict among a set of sections in one pass
+    
+    Instead of probing the database once per section, the sections are grouped
+    by (room or faculty, day), sorted by start time and swept once.
+    
+    Parameters:
+    - sections: Iterable of dicts with keys id, course_code, section, schedule, room_id, room and faculty_id
+    
+    Returns:
+    - List of conflict dictionaries, one per conflicting pair of sections
+    """
+    groups = {}
+    for section in sections:
+        parsed = parse_schedule(section['schedule'])
+        if parsed is None:
+            continue
+        days, start, end = parsed
+        for day in days:
+            if section['room_id']:
+                groups.setdefault(("room", section['room_id'], day), []).append((start, end, section))
+            if section['faculty_id']:
+                groups.setdefault(("faculty", section['faculty_id'], day), []).append((start, end, section))
+    
+    conflicts = []
+    seen = set()
+    for (conflict_type, _, day), meetings in groups.items():
+        meetings.sort(key=lambda meeting: meeting[0])
+        active = []
+        for start, end, section in meetings:
+            # Meetings that ended before this one starts can no longer overlap anything
+            active = [meeting for meeting in active if meeting[1] > start]
+            for _, _, other in active:
+                key = (conflict_type, min(section['id'], other['id']), max(section['id'], other['id']))
+                if key in seen:
+                    continue
+                seen.add(key)
+                conflicts.append({
                     "type": conflict_type,
-                    "course": section.course.course_code,
-                    "section": section.section,
-                    "schedule": section.schedule,
-                    "room": str(section.room) if section.room else None,
-                    "conflict_day": input_day  # Added for clarity in error messages
-                }
-                
-                # Only add unique conflicts
-                if not any(c["section"] == conflict["section"] and 
-                          c["course"] == conflict["course"] for c in conflicts):
-                    conflicts.append(conflict)
+                    "course": section['course_code'],
+                    "section": section['section'],
+                    "schedule": section['schedule'],
+                    "room": section['room'],
+                    "conflict_day": day,
+                    "conflicts_with": {
+                        "course": other['course_code'],
+                        "section": other['section'],
+                        "schedule": other['schedule'],
+                        "room": other['room'],
+                    }
+                })
+            active.append((start, end, section))
     
     return conflicts
+
+def audit_semester_conflicts(semester=None):
+    """Run the whole-term conflict audit for a semester (the active one by default) with a single query"""
+    sections = list(ClassSection.objects.for_semester(semester).values(
+        'id', 'section', 'schedule', 'room_id', 'faculty_id',
+        course_code=F('course__course_code'),
+        room_name=F('room__room'),
+    ).order_by())
+    for section in sections:
+        section['room'] = section.pop('room_name')
+    return audit_schedule_conflicts(sections)
+
+def format_time(minutes):
+    """Format minutes after midnight the way schedules store them, e.g. 780 -> '1:00 PM'"""
+    hour, minute = divmod(minutes, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+def format_schedule(days, start, end):
+    """Build a schedule string, e.g. (["M", "TH"], 660, 720) -> 'M TH | 11:00 AM - 12:00 PM'"""
+    return f"{' '.join(days)} | {format_time(start)} - {format_time(end)}"
+
+DAY_NAMES = {
+    'MONDAY': 'M',
+    'TUESDAY': 'T',
+    'WEDNESDAY': 'W',
+    'THURSDAY': 'TH',
+    'FRIDAY': 'F',
+    'SATURDAY': 'S',
+    'SUNDAY': 'SU',
+}
+
+def normalize_day(value):
+    """Day abbreviation used in schedules for an abbreviation or a full day name, None if unknown"""
+    day = value.strip().upper()
+    day = DAY_NAMES.get(day, day)
+    return day if day in DAY_NAMES.values() else None
+
+def parse_time_of_day(value):
+    """Minutes after midnight of '1:00 PM' or '13:00', None if the value is not a time"""
+    for time_format in ("%I:%M %p", "%I:%M%p", "%H:%M"):
+        try:
+            parsed = datetime.strptime(value.strip().upper(), time_format)
+        except ValueError:
+            continue
+        return parsed.hour * 60 + parsed.minute
+    return None
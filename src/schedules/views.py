@@ -3,12 +3,19 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action, api_view
 from django.shortcuts import get_object_or_404
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Prefetch
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
-from datetime import datetime
-import re
+from rest_framework.settings import api_settings
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from django.utils import timezone
+from django.utils.text import slugify
 
-from .models import Course, ClassSection, Department, Faculty, AdminUser, Room
+from .models import Course, ClassMeeting, ClassSection, Department, Faculty, AdminUser, Room, Semester
 from .serializers import (
     CourseSerializer,
     CourseDetailSerializer,
@@ -21,28 +28,134 @@ from .serializers import (
     AdminUserSerializer,
     AdminUserDetailSerializer,
     RoomSerializer,
-    RoomClassSectionSerializer
+    RoomClassSectionSerializer,
+    SemesterSerializer,
+    SemesterCloneSerializer
 )
-from .utils import check_schedule_conflicts
+from .utils import check_schedule_conflicts, format_schedule, normalize_day, parse_schedule, parse_time_of_day
+from .booking import ScheduleConflict, write_section
+from .mixins import ReplicaReadMixin, VersionedMixin
+from .ical import ICalendarRenderer, ics_response
+from .semesters import clone_semester
+from . import analytics, events, export, recommend, search, sync
 
-class CourseViewSet(viewsets.ModelViewSet):
+
+def get_requested_semester(request):
+    """Semester ID from the ?semester= query parameter, None for the active semester"""
+    semester = request.query_params.get('semester')
+    if not semester:
+        return None
+    if not semester.isdigit():
+        raise ValidationError({"semester": "Semester must be a semester ID"})
+    return int(semester)
+
+def get_admin_department(request):
+    """Department an ?admin_id= admin is limited to; None for superusers, unknown admins or no admin"""
+    # Get the admin user from the request
+    admin_id = request.query_params.get('admin_id')
+    if admin_id:
+        try:
+            admin = AdminUser.objects.get(id=admin_id)
+            # If admin is not a superuser, filter by department
+            if not admin.is_superuser and admin.department_id:
+                return admin.department_id
+        except AdminUser.DoesNotExist:
+            pass
+    return None
+
+def filter_sections(queryset, params):
+    """
+    Apply the /sections/ list filters, each of which maps to an indexed column:
+    course (code prefix), type, room (ID or name), floor, faculty (ID),
+    department (ID), day, and a time window (time_from, time_to) that the
+    section's meeting on that day must fall within
+    """
+    errors = {}
+
+    course = params.get('course', '').strip()
+    if course:
+        queryset = queryset.filter(course__course_code__startswith=course.upper())
+
+    section_type = params.get('type', '').strip()
+    if section_type:
+        types = {value.lower(): value for value, _ in ClassSection.SECTION_TYPE_CHOICES}
+        if section_type.lower() in types:
+            queryset = queryset.filter(type=types[section_type.lower()])
+        else:
+            errors['type'] = f"Type must be one of {', '.join(types.values())}"
+
+    room = params.get('room', '').strip()
+    if room:
+        queryset = queryset.filter(room_id=int(room)) if room.isdigit() else queryset.filter(room__room=room)
+
+    floor = params.get('floor', '').strip()
+    if floor:
+        queryset = queryset.filter(room__floor=floor)
+
+    for name, lookup in (('faculty', 'faculty_id'), ('department', 'faculty__department_id')):
+        value = params.get(name, '').strip()
+        if value:
+            if value.isdigit():
+                queryset = queryset.filter(**{lookup: int(value)})
+            else:
+                errors[name] = f"{name.capitalize()} must be an ID"
+
+    # Day and time window are matched against the same meeting
+    meetings = {}
+    day = params.get('day', '').strip()
+    if day:
+        meetings['day'] = normalize_day(day)
+        if meetings['day'] is None:
+            errors['day'] = "Day must be one of M, T, W, TH, F, S, SU or a full day name"
+    for name, lookup in (('time_from', 'start_minute__gte'), ('time_to', 'end_minute__lte')):
+        value = params.get(name, '').strip()
+        if value:
+            meetings[lookup] = parse_time_of_day(value)
+            if meetings[lookup] is None:
+                errors[name] = "Time must look like '1:00 PM' or '13:00'"
+
+    if errors:
+        raise ValidationError(errors)
+    if meetings:
+        queryset = queryset.filter(Exists(ClassMeeting.objects.filter(section=OuterRef('pk'), **meetings)))
+    return queryset
+
+# Calendar feeds are the same actions with a .ics suffix (or ?format=ics)
+ICS_RENDERER_CLASSES = [*api_settings.DEFAULT_RENDERER_CLASSES, ICalendarRenderer]
+
+def get_feed_semester(request):
+    """Semester of a calendar feed: ?semester=<id> or the active one"""
+    semester_id = get_requested_semester(request)
+    if semester_id is None:
+        return Semester.objects.active()
+    return get_object_or_404(Semester, pk=semester_id)
+
+class CourseViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing courses and their sections
     """
-    queryset = Course.objects.all().prefetch_related('sections')
+    # Served from the response cache (see compression.py)
+    cached_actions = ('list',)
+    queryset = Course.objects.all()
     serializer_class = CourseSerializer
     
+    def get_queryset(self):
+        # Only the sections of the requested (by default the active) semester are nested
+        semester = get_requested_semester(self.request)
+        return Course.objects.all().prefetch_related(Prefetch(
+            'sections',
+            queryset=ClassSection.objects.for_semester(semester).select_related('room', 'faculty')
+        ))
+    
     def list(self, request, *args, **kwargs):
         """Override list method to add extra logging and ensure related sections are included"""
         print(f"CourseViewSet.list called by {request.user}")
-        queryset = self.get_queryset()
-        print(f"Found {queryset.count()} courses")
         
-        # Trigger prefetch of related sections
-        for course in queryset:
-            print(f"Course: {course.course_code}, Sections: {course.sections.count()}")
+        # Courses and their sections are loaded with two queries regardless of size
+        courses = list(self.get_queryset())
+        print(f"Found {len(courses)} courses")
         
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = self.get_serializer(courses, many=True)
         return Response(serializer.data)
 
     def get_serializer_class(self):
@@ -56,7 +169,7 @@ class CourseViewSet(viewsets.ModelViewSet):
         print(f"Deleting section {section_name} from course {pk}")
         course = self.get_object()
         try:
-            section = course.sections.get(section=section_name)
+            section = course.sections.for_semester(get_requested_semester(request)).get(section=section_name)
             section.delete()
             return Response(status=status.HTTP_204_NO_CONTENT)
         except ClassSection.DoesNotExist:
@@ -65,10 +178,12 @@ class CourseViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-class RoomViewSet(viewsets.ModelViewSet):
+class RoomViewSet(VersionedMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing rooms
     """
+    # Served from the response cache (see compression.py)
+    cached_actions = ('list',)
     queryset = Room.objects.all()
     serializer_class = RoomSerializer
     lookup_field = 'room'  # Use room name instead of pk
@@ -91,11 +206,61 @@ class RoomViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
-    @action(detail=True, methods=['get'])
-    def sections(self, request, room=None):
-        """Get all class sections for a specific room"""
+    @action(detail=False, methods=['get'])
+    def recommend(self, request):
+        """
+        Free rooms for a new section, best fit first
+        GET ?day=M TH&time=9:00 AM - 10:30 AM[&type=Laboratory][&floor=4][&course=CMSC 126][&limit=10]
+        """
+        params = request.query_params
+        days = [normalize_day(day) for day in params.get('day', '').split()]
+        parsed = parse_schedule(f"{' '.join(days)} | {params.get('time', '')}") if days and None not in days else None
+        if parsed is None or parsed[1] >= parsed[2]:
+            return Response(
+                {"detail": "day and time are required, e.g. ?day=M TH&time=9:00 AM - 10:30 AM"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        section_type = params.get('type') or None
+        if section_type not in (None, ClassSection.LECTURE, ClassSection.LABORATORY):
+            return Response(
+                {"detail": f"Type must be {ClassSection.LECTURE} or {ClassSection.LABORATORY}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        limit = params.get('limit', '10')
+        if not limit.isdigit() or not 1 <= int(limit) <= 50:
+            return Response(
+                {"detail": "Limit must be a number from 1 to 50"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        days, start, end = parsed
+        rooms = recommend.recommend_rooms(
+            list(dict.fromkeys(days)), start, end,
+            section_type=section_type,
+            floor=params.get('floor') or None,
+            course_code=params.get('course') or None,
+            semester=get_requested_semester(request),
+            limit=int(limit),
+        )
+        return Response({
+            "schedule": format_schedule(days, start, end),
+            "type": section_type,
+            "rooms": rooms,
+        })
+
+    @action(detail=True, methods=['get'], renderer_classes=ICS_RENDERER_CLASSES)
+    def sections(self, request, room=None, format=None):
+        """Get all class sections for a specific room, or subscribe to them at sections.ics"""
         room_obj = self.get_object()
-        sections = room_obj.class_sections.all().select_related('course', 'faculty')
+        if request.accepted_renderer.format == 'ics':
+            semester = get_feed_semester(request)
+            return ics_response(
+                request, room_obj.class_sections.for_semester(semester), semester, room_obj,
+                name=f"{room_obj} ({semester})", filename=f"room-{room_obj}"
+            )
+        sections = room_obj.class_sections.for_semester(get_requested_semester(request)).select_related('course', 'faculty')
         serializer = RoomClassSectionSerializer(sections, many=True)
         return Response(serializer.data)
     
@@ -127,7 +292,7 @@ class RoomViewSet(viewsets.ModelViewSet):
             day = day_mapping[day]
         
         # Get all sections for this room
-        sections = room_obj.class_sections.all().select_related('course', 'faculty')
+        sections = room_obj.class_sections.for_semester(get_requested_semester(request)).select_related('course', 'faculty')
         
         # Filter sections by day
         filtered_sections = []
@@ -150,11 +315,21 @@ class RoomViewSet(viewsets.ModelViewSet):
             "sections": serializer.data
         })
 
-class ClassSectionViewSet(viewsets.ModelViewSet):
+class ClassSectionViewSet(VersionedMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing class sections
     """
-    queryset = ClassSection.objects.all().select_related('course', 'faculty')
+    # Served from the response cache (see compression.py)
+    cached_actions = ('list',)
+    # Writes check for conflicts while holding the room and faculty
+    throttle_costs = {'create': 2, 'update': 2, 'partial_update': 2}
+    queryset = ClassSection.objects.all().select_related('course', 'room', 'faculty')
+    
+    def get_queryset(self):
+        queryset = super().get_queryset().for_semester(get_requested_semester(self.request))
+        if self.action == 'list':
+            queryset = filter_sections(queryset, self.request.query_params)
+        return queryset
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -181,13 +356,28 @@ class ClassSectionViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            self.perform_create(serializer)
+            # Checked again while the room and faculty are held, since another
+            # admin may have booked them after the check above
+            write_section(
+                lambda: self.perform_create(serializer),
+                serializer.find_conflicts,
+                room_id=(serializer._conflict_check or {}).get('room_id'),
+                faculty_id=(serializer._conflict_check or {}).get('faculty_id')
+            )
             
             # Return the created instance using ClassSectionSerializer to include room_display
             instance = serializer.instance
             response_serializer = ClassSectionSerializer(instance)
             headers = self.get_success_headers(response_serializer.data)
             return Response(response_serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+        except ScheduleConflict as e:
+            return Response(
+                {
+                    "detail": "Faculty schedule conflict detected",
+                    "conflicts": e.conflicts
+                },
+                status=status.HTTP_409_CONFLICT
+            )
         except IntegrityError:
             course_code = request.data.get('course_code')
             section = request.data.get('section')
@@ -216,12 +406,27 @@ class ClassSectionViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            self.perform_update(serializer)
+            # Checked again while the room and faculty are held, since another
+            # admin may have booked them after the check above
+            write_section(
+                lambda: self.perform_update(serializer),
+                serializer.find_conflicts,
+                room_id=(serializer._conflict_check or {}).get('room_id'),
+                faculty_id=(serializer._conflict_check or {}).get('faculty_id')
+            )
             
             # Return the updated instance using ClassSectionSerializer to include room_display
             instance = serializer.instance
             response_serializer = ClassSectionSerializer(instance)
             return Response(response_serializer.data)
+        except ScheduleConflict as e:
+            return Response(
+                {
+                    "detail": "Faculty schedule conflict detected",
+                    "conflicts": e.conflicts
+                },
+                status=status.HTTP_409_CONFLICT
+            )
         except IntegrityError:
             course_code = request.data.get('course_code')
             section = request.data.get('section')
@@ -230,10 +435,12 @@ class ClassSectionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing academic departments
     """
+    # Served from the response cache (see compression.py)
+    cached_actions = ('list',)
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
     
@@ -254,26 +461,30 @@ class DepartmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-class FacultyViewSet(viewsets.ModelViewSet):
+class FacultyViewSet(VersionedMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing faculty members
     """
+    # Served from the response cache (see compression.py)
+    cached_actions = ('list',)
     queryset = Faculty.objects.all()
     serializer_class = FacultySerializer
     
     def get_queryset(self):
-        queryset = Faculty.objects.all()
+        queryset = Faculty.objects.all().select_related('department')
         
-        # Get the admin user from the request
-        admin_id = self.request.query_params.get('admin_id')
-        if admin_id:
-            try:
-                admin = AdminUser.objects.get(id=admin_id)
-                # If admin is not a superuser, filter by department
-                if not admin.is_superuser and admin.department:
-                    queryset = queryset.filter(department=admin.department)
-            except AdminUser.DoesNotExist:
-                pass
+        if self.action == 'retrieve':
+            # Nest only the sections of the requested (by default the active) semester
+            queryset = queryset.prefetch_related(Prefetch(
+                'class_sections',
+                queryset=ClassSection.objects.for_semester(
+                    get_requested_semester(self.request)
+                ).select_related('room', 'faculty')
+            ))
+        
+        department_id = get_admin_department(self.request)
+        if department_id:
+            queryset = queryset.filter(department_id=department_id)
         
         return queryset
     
@@ -284,17 +495,23 @@ class FacultyViewSet(viewsets.ModelViewSet):
     
     def list(self, request, *args, **kwargs):
         print(f"FacultyViewSet.list called by {request.user}")
-        queryset = self.get_queryset()
-        print(f"Found {queryset.count()} faculty members")
+        faculty = list(self.get_queryset())
+        print(f"Found {len(faculty)} faculty members")
         
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = self.get_serializer(faculty, many=True)
         return Response(serializer.data)
     
-    @action(detail=True)
-    def schedules(self, request, pk=None):
-        """Get all schedules for a faculty member"""
+    @action(detail=True, renderer_classes=ICS_RENDERER_CLASSES)
+    def schedules(self, request, pk=None, format=None):
+        """Get all schedules for a faculty member, or subscribe to them at schedules.ics"""
         faculty = self.get_object()
-        sections = faculty.class_sections.all().select_related('course')
+        if request.accepted_renderer.format == 'ics':
+            semester = get_feed_semester(request)
+            return ics_response(
+                request, faculty.class_sections.for_semester(semester), semester, faculty,
+                name=f"{faculty.name} ({semester})", filename=f"faculty-{faculty.name}"
+            )
+        sections = faculty.class_sections.for_semester(get_requested_semester(request)).select_related('course', 'room', 'faculty')
         serializer = ClassSectionSerializer(sections, many=True)
         return Response(serializer.data)
 
@@ -319,7 +536,7 @@ class AdminUserViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing admin users
     """
-    queryset = AdminUser.objects.all()
+    queryset = AdminUser.objects.all().select_related('department')
     serializer_class = AdminUserSerializer
     
     def get_serializer_class(self):
@@ -340,7 +557,7 @@ class AdminUserViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            admin = AdminUser.objects.get(user_id=user_id)
+            admin = AdminUser.objects.select_related('department').get(user_id=user_id)
             if admin.password == password:
                 # Return admin details without password
                 serializer = AdminUserSerializer(admin)
@@ -387,6 +604,8 @@ class ScheduleConflictView(APIView):
     """
     API view to check for schedule conflicts
     """
+    throttle_scope = 'conflicts'
+
     def post(self, request):
         day = request.data.get('day', '')
         time = request.data.get('time', '')
@@ -401,89 +620,31 @@ class ScheduleConflictView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Parse the time string to get start and end times
-        # Format: "11:00 AM - 12:00 PM"
-        time_pattern = r"(\d+:\d+\s*[AP]M)\s*-\s*(\d+:\d+\s*[AP]M)"
-        time_match = re.match(time_pattern, time)
+        days = [normalize_day(value) for value in str(day).split()]
+        if None in days:
+            return Response(
+                {"detail": f"Invalid day in {day!r}. Expected days such as 'M TH'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        if not time_match:
+        # Format: "11:00 AM - 12:00 PM", parsed as the sections' own schedules are
+        parsed = parse_schedule(f"{' '.join(days)} | {time}")
+        if parsed is None:
             return Response(
                 {"detail": "Invalid time format. Expected format: '11:00 AM - 12:00 PM'"},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        start_time_str, end_time_str = time_match.groups()
-        
-        # Convert to datetime objects for comparison
-        try:
-            start_time = datetime.strptime(start_time_str.strip(), "%I:%M %p")
-            end_time = datetime.strptime(end_time_str.strip(), "%I:%M %p")
-        except ValueError:
+        if parsed[1] >= parsed[2]:
             return Response(
-                {"detail": "Invalid time format"},
+                {"detail": "The end time must be after the start time"},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Check for conflicts in the database
-        conflicts = []
-        
-        # Check for faculty conflicts if faculty_id is provided
-        if faculty_id:
-            faculty_conflicts = check_schedule_conflicts(day, time, faculty_id, room, exclude_section_id)
-            conflicts.extend(faculty_conflicts)
-        
-        # Get all class sections with the same day, excluding the section being edited if provided
-        day_sections = ClassSection.objects.filter(schedule__contains=day)
-        
-        # Exclude the section being edited if provided
-        if exclude_section_id:
-            day_sections = day_sections.exclude(id=exclude_section_id)
-        
-        for section in day_sections:
-            # Parse the schedule string (format: "M TH | 11:00 AM - 12:00 PM")
-            section_parts = section.schedule.split('|')
-            if len(section_parts) != 2:
-                continue
-                
-            section_days, section_time = section_parts[0].strip(), section_parts[1].strip()
-            section_day_list = section_days.split()
-            
-            # Skip if the day doesn't match
-            if not any(d in day.split() for d in section_day_list):
-                continue
-            
-            # Check time overlap
-            section_time_match = re.match(time_pattern, section_time)
-            if not section_time_match:
-                continue
-                
-            section_start_str, section_end_str = section_time_match.groups()
-            
-            try:
-                section_start = datetime.strptime(section_start_str.strip(), "%I:%M %p")
-                section_end = datetime.strptime(section_end_str.strip(), "%I:%M %p")
-            except ValueError:
-                continue
-            
-            # Check for time overlap
-            has_time_overlap = (
-                (start_time <= section_start < end_time) or
-                (start_time < section_end <= end_time) or
-                (section_start <= start_time < section_end) or
-                (section_start < end_time <= section_end)
-            )
-            
-            if has_time_overlap and section.room == room:
-                # We already checked for faculty conflicts above, so we only need to check for room conflicts here
-                conflict = {
-                    "type": "room",
-                    "course": section.course.course_code,
-                    "section": section.section,
-                    "schedule": section.schedule,
-                    "room": section.room
-                }
-                if conflict not in conflicts:  # Avoid duplicates
-                    conflicts.append(conflict)
+        # Faculty and room conflicts from the meetings of the active semester,
+        # the same indexed check section writes run
+        conflicts = check_schedule_conflicts(
+            ' '.join(days), time, faculty_id or None, room, exclude_section_id
+        )
         
         if conflicts:
             return Response(
@@ -496,23 +657,108 @@ class ScheduleConflictView(APIView):
         
         return Response({"detail": "No conflicts found"}, status=status.HTTP_200_OK)
 
+class SemesterViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for managing semesters
+    """
+    queryset = Semester.objects.all()
+    serializer_class = SemesterSerializer
+    throttle_costs = {'clone': 20, 'destroy': 5}
+    
+    def destroy(self, request, *args, **kwargs):
+        if self.get_object().is_active:
+            return Response(
+                {"detail": "The active semester cannot be deleted"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return super().destroy(request, *args, **kwargs)
+    
+    @action(detail=True, methods=['post'])
+    def activate(self, request, pk=None):
+        """Make this semester the active one"""
+        semester = self.get_object()
+        semester.activate()
+        return Response(SemesterSerializer(semester).data)
+    
+    @action(detail=True, methods=['post'])
+    def clone(self, request, pk=None):
+        """Copy every section of this semester into another (or a new) semester"""
+        source = self.get_object()
+        serializer = SemesterCloneSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        options = serializer.validated_data
+        
+        with transaction.atomic():
+            target = options.get('target')
+            if target is None:
+                target, _ = Semester.objects.get_or_create(name=options['name'])
+            
+            if target.pk == source.pk:
+                return Response(
+                    {"detail": "Cannot clone a semester into itself"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            try:
+                cloned, conflicts = clone_semester(
+                    source,
+                    target,
+                    drop_faculty=options['drop_faculty'],
+                    room_map=options.get('room_map')
+                )
+            except ScheduleConflict as e:
+                transaction.set_rollback(True)
+                return Response(
+                    {"detail": str(e), "conflicts": e.conflicts},
+                    status=status.HTTP_409_CONFLICT
+                )
+            
+            if options['activate']:
+                target.activate()
+        
+        print(f"Cloned {cloned} sections from {source} into {target}")
+        
+        return Response(
+            {
+                "detail": f"Cloned {cloned} sections from {source} into {target}",
+                "cloned_sections": cloned,
+                "semester": SemesterSerializer(target).data,
+                "conflicts": conflicts
+            },
+            status=status.HTTP_201_CREATED
+        )
+
 class NewSemesterView(APIView):
     """
-    API view to reset data for a new semester
-    Deletes all class sections (schedules) but keeps rooms and courses
+    API view to start a new semester
+    Creates a semester and makes it the active one; sections of previous
+    semesters are kept as history and can be read with ?semester=<id>
     """
+    throttle_cost = 5
+
     def post(self, request):
+        data = request.data.copy()
+        if not data.get('name'):
+            data['name'] = f"Semester started {timezone.now():%Y-%m-%d %H:%M}"
+        
+        serializer = SemesterSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        
         try:
-            # Delete all class sections (this removes all schedules)
-            deleted_count = ClassSection.objects.all().count()
-            ClassSection.objects.all().delete()
+            with transaction.atomic():
+                previous = Semester.objects.filter(is_active=True).first()
+                semester = serializer.save()
+                semester.activate()
             
-            print(f"New semester reset: Deleted {deleted_count} class sections")
+            print(f"New semester started: {semester} (previous: {previous})")
             
             return Response(
                 {
-                    "detail": f"New semester started successfully. Deleted {deleted_count} schedules.",
-                    "deleted_schedules": deleted_count
+                    "detail": f"New semester {semester} started successfully.",
+                    "semester": SemesterSerializer(semester).data,
+                    "previous_semester": previous.id if previous else None,
+                    # Sections are no longer deleted; kept for existing clients
+                    "deleted_schedules": 0
                 },
                 status=status.HTTP_200_OK
             )
@@ -522,3 +768,158 @@ class NewSemesterView(APIView):
                 {"detail": "Failed to start new semester. Please try again."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class SearchView(APIView):
+    """
+    API view for autocomplete over courses, rooms and faculty
+    GET ?q=<text>[&type=course,room,faculty][&limit=10]
+    """
+    MAX_LIMIT = 50
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {"detail": "Query parameter q is required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        types = [value.strip() for value in request.query_params.get('type', '').split(',') if value.strip()]
+        unknown = [value for value in types if value not in search.TYPES]
+        if unknown:
+            return Response(
+                {"detail": f"Unknown type {', '.join(unknown)}. Use {', '.join(search.TYPES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        limit = request.query_params.get('limit', '10')
+        if not limit.isdigit() or not 1 <= int(limit) <= self.MAX_LIMIT:
+            return Response(
+                {"detail": f"Limit must be a number from 1 to {self.MAX_LIMIT}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response({
+            "query": query,
+            "results": search.search(query, types=types, limit=int(limit))
+        })
+
+class ChangesView(APIView):
+    """
+    API view for the incremental sync feed of courses, sections, rooms, faculty and departments
+    GET ?since=<cursor>[&limit=1000]; without since, only a cursor to start from is returned
+    """
+    MAX_LIMIT = 5000
+
+    # Served by the primary: a lagging replica would hide changes older than the cursor
+    def get(self, request):
+        since = request.query_params.get('since', '').strip()
+        if not since:
+            return Response({"cursor": sync.current_cursor()})
+
+        limit = request.query_params.get('limit', str(sync.DEFAULT_LIMIT))
+        if not limit.isdigit() or not 1 <= int(limit) <= self.MAX_LIMIT:
+            return Response(
+                {"detail": f"Limit must be a number from 1 to {self.MAX_LIMIT}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            return Response(sync.changes(since, limit=int(limit)))
+        except sync.CursorExpired as e:
+            return Response(
+                {"detail": f"{e}. Download the collections again and start over without since"},
+                status=status.HTTP_410_GONE
+            )
+        except ValueError:
+            return Response(
+                {"detail": "since must be a cursor returned by this endpoint"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+class RoomUtilizationView(APIView):
+    """
+    API view reporting how much of campus hours each room, floor and the campus is booked
+    GET ?semester=<id>[&limit=5]; limit is the number of most and least used rooms listed
+    """
+    MAX_LIMIT = 50
+
+    def get(self, request):
+        limit = request.query_params.get('limit', '5')
+        if not limit.isdigit() or int(limit) > self.MAX_LIMIT:
+            return Response(
+                {"detail": f"Limit must be a number from 0 to {self.MAX_LIMIT}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(analytics.room_utilization(get_feed_semester(request), limit=int(limit)))
+
+class TeachingLoadView(APIView):
+    """
+    API view reporting the weekly teaching load of every faculty member, grouped by department
+    GET ?semester=<id>[&department=<id>][&admin_id=<id>]; a department admin only sees their department
+    """
+
+    def get(self, request):
+        department_id = get_admin_department(request)
+        if department_id is None:
+            department = request.query_params.get('department')
+            if department and not department.isdigit():
+                return Response(
+                    {"detail": "Department must be a department ID"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            department_id = int(department) if department else None
+        return Response(analytics.teaching_load(get_feed_semester(request), department_id=department_id))
+
+class ExportSectionsView(APIView):
+    """
+    API view streaming every class section of a semester as a spreadsheet
+    GET export/sections.csv or export/sections.xlsx [?semester=<id>]
+    """
+    throttle_scope = 'export'
+
+    def perform_content_negotiation(self, request, force=False):
+        # The file type comes from the URL, so an Accept header like text/csv is no reason for a 406
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, filetype):
+        if filetype not in export.FORMATS:
+            raise Http404
+        semester = get_feed_semester(request)
+        response = StreamingHttpResponse(
+            export.stream_export(filetype, semester),
+            content_type=export.FORMATS[filetype]
+        )
+        response['Content-Disposition'] = f'attachment; filename="sections-{slugify(semester.name)}.{filetype}"'
+        return response
+
+@require_GET
+async def section_events(request):
+    """
+    Server-sent events of section changes, for displays that would otherwise poll
+    GET events/sections/[?room=<id or name>][&floor=<floor>][&faculty=<id>][&department=<id>]
+    """
+    if not isinstance(request, ASGIRequest):
+        # A never-ending response would tie up a WSGI worker for good
+        return JsonResponse(
+            {"detail": "Event streams are only served by the ASGI application (main.asgi)"},
+            status=status.HTTP_501_NOT_IMPLEMENTED
+        )
+
+    filters = {name: request.GET[name].strip() for name in events.FILTERS if request.GET.get(name, '').strip()}
+    invalid = [name for name in ('faculty', 'department') if name in filters and not filters[name].isdigit()]
+    if invalid:
+        return JsonResponse(
+            {name: f"{name.capitalize()} must be an ID" for name in invalid},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    response = StreamingHttpResponse(
+        events.stream(filters, settings.SCHEDULE_EVENTS_KEEPALIVE),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Keep proxies such as nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response